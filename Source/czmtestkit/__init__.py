@@ -6,6 +6,8 @@ Examples to implement the codes are provided in :ref:`Test Cases` section of the
 Following is the documentation for the scripts.
 
 """
+from .kernel import abqSession
+from .database import runDatabase
 
 class testModel:
 	"""
@@ -86,6 +88,24 @@ class testModel:
 	:param crackSeed: Mesh seed by side along the length in the cracked part
 	:type crackSeed: float
 
+	:param biasRatio: Ratio of the coarsest to the finest seed of graded seeding, 1 for uniform seeding. When larger than 1, the seed along the length grows from meshSeed[0] at the end of biasBand to biasRatio*meshSeed[0] at the end of the part and the seed through the substrate thickness from meshSeed[2] at the cohesive zone to biasRatio*meshSeed[2] (at most half the thickness) at the opposite face.
+	:type biasRatio: float
+
+	:param biasBand: Length ahead of the crack tip seeded uniformly with meshSeed[0] when graded, typically the expected crack growth
+	:type biasBand: float
+
+	:param dimension: '3D' for solid models or '2D' for models in the length-thickness plane with the width as out-of-plane thickness (see inpDeck.withBulkInp)
+	:type dimension: str
+
+	:param planeType: 'Strain' for plane strain or 'Stress' for plane stress elements of 2D models
+	:type planeType: str
+
+	:param symmetry: Model half the width with symmetry about the mid-width plane. Reaction forces are doubled by UvsRF, so results are those of the full specimen. Requires BC[1] = 0.
+	:type symmetry: boolean
+
+	:param meshInclude: Directory of mesh include files shared between runs (see inpDeck.withBulkInp), '' to write the mesh into the input file. With a directory, withBulk writes the input file with inpDeck.withBulkInp and runs it.
+	:type meshInclude: str
+
 	:param TabPosition: Location of tab for DCB and ADCB as a ratio to substrate thickness measured from the adhesive side.
 	:type TabPosition: float <= 1
 
@@ -114,6 +134,30 @@ class testModel:
 
 	:param nGpu: Number of cpus for abaqus simulations
 	:type nGpu: int
+
+	:param batchBC: List of displacement boundary conditions, one per cohesive element in a batched single element model (see abqPython.SinEle)
+	:type batchBC: List
+
+	:param batchMatPropCz: List of cohesive zone material properties, one per cohesive element in a batched single element model (see abqPython.SinEle)
+	:type batchMatPropCz: List
+
+	:param initialInc: Initial time increment as a fraction of stepTime
+	:type initialInc: float
+
+	:param maxInc: Maximum time increment as a fraction of stepTime
+	:type maxInc: float
+
+	:param outputInterval: Time interval of the history output as a fraction of stepTime
+	:type outputInterval: float
+
+	:param stopLoadFraction: Stop the job after peak once the load has dropped below this fraction of the peak load (0 disables, see czmtestkit.monitor)
+	:type stopLoadFraction: float
+
+	:param stopDisplacement: Stop the job once the load point displacement exceeds this value (0 disables)
+	:type stopDisplacement: float
+
+	:param wallTime: Stop the job after this many seconds (0 disables)
+	:type wallTime: float
 	"""
 
 	def __init__(self):
@@ -138,6 +182,12 @@ class testModel:
 		self.matPropCz = [1000000,1,1,1,1,1] # List of material properties of bthe cohesive zone
 		self.meshSeed = [1,1,1] # List of mesh seed by side along the 3 directions
 		self.crackSeed = 5 # Mesh seed size for crack
+		self.biasRatio = 1 # Ratio of the coarsest to the finest seed of graded seeding
+		self.biasBand = 0 # Length ahead of the crack tip seeded uniformly when graded
+		self.dimension = '3D' # '3D' solid or '2D' plane model
+		self.planeType = 'Strain' # Plane strain or plane stress elements of 2D models
+		self.symmetry = False # Half width model with symmetry about the mid-width plane
+		self.meshInclude = '' # Directory of shared mesh include files
 		self.TabPosition = 0.5 # Location of load for DCB and ADCB
 		self.name = 'Job' # Job name
 		self.uFactor = 1 # Multiplier for displacement in force displacement curve
@@ -146,16 +196,58 @@ class testModel:
 		self.fTough = 1 # Mixed mode fracture toughness
 		self.nCpu = 2 # Number of CPUS
 		self.nGpu = 0 # Number of GPUS
+		self.batchBC = [] # Boundary conditions of the batched single elements
+		self.batchMatPropCz = [] # Cohesive zone material properties of the batched single elements
+		self.initialInc = 0.001 # Initial time increment as a fraction of stepTime
+		self.maxInc = 0.01 # Maximum time increment as a fraction of stepTime
+		self.outputInterval = 0.01 # History output interval as a fraction of stepTime
+		self.stopLoadFraction = 0 # Stop after peak below this fraction of the peak load
+		self.stopDisplacement = 0 # Stop beyond this load point displacement
+		self.wallTime = 0 # Stop after this many seconds
+
+	def setMixity(self, angles):
+		"""
+		Fills batchBC with displacement boundary conditions of the magnitude of BC at the given mode mixity angles.
+
+		:param angles: angles in degrees between the loading direction and the opening direction (3) towards the shear direction (1). 0 is pure mode-1 and 90 is pure mode-2.
+		:type angles: List
+		"""
+		import math
+		Mag = sum([x**2 for x in self.BC])**0.5
+		self.batchBC = [[Mag*math.sin(math.radians(x)), 0, Mag*math.cos(math.radians(x))] for x in angles]
+
+	def forceScale(self):
+		"""
+		Factor from the reaction forces of the model to those of the full specimen, 2 for half width models (symmetry) and 1 otherwise.
+		"""
+		return 2 if self.symmetry else 1
+
+	def batchCases(self):
+		"""
+		Boundary conditions and cohesive zone material properties of the batched single elements. Lists shorter than the other are padded with BC or matPropCz.
+
+		:return BCs, Props: lists with one entry per element. Empty if the model is not batched.
+		:type BCs, Props: List
+		"""
+		n = max(len(self.batchBC), len(self.batchMatPropCz))
+		BCs = list(self.batchBC) + [self.BC]*(n - len(self.batchBC))
+		Props = list(self.batchMatPropCz) + [self.matPropCz]*(n - len(self.batchMatPropCz))
+		return BCs, Props
 
 	def addToDatabase(self, path=''):
 		"""
-		Adds dictionary of class instance to specified path
+		Adds dictionary of class instance to specified path. Paths with '.db' or '.sqlite' extension are added to an indexed run database (see czmtestkit.database), other paths are appended as a json line.
 
 		:param path: absolute or relative path
 		:type path: str
 		"""
 		if path == '':
 			path = self.name+'_in.json'
+		from .database import isDatabase, runDatabase
+		if isDatabase(path):
+			with runDatabase(path) as db:
+				db.add(self)
+			return
 		import json
 		with open(path, 'a') as file:
 			json.dump(self.__dict__, file)
@@ -164,30 +256,35 @@ class testModel:
 
 
 
-def abqFun(inpFile, func):
+def abqFun(inpFile, func, session=None):
 	"""
 	Run functions from abqPython module.
 
-	:param file: ASCII file name with extension containing a dictionary of instance attributes to pass to the function func. Last instance from the available instances will be used. Ensure that the entire dictionary of class attributes are on the same line
+	:param file: ASCII file name with extension containing a dictionary of instance attributes to pass to the function func or a run database ('.db' or '.sqlite'). Last instance from the available instances will be used. Ensure that the entire dictionary of class attributes are on the same line
 	:type file: str
 
 	:param func: function Name
 	:type func: str
+
+	:param session: running kernel session. If provided the function is run by the session instead of launching a new abaqus cae process.
+	:type session: czmtestkit.kernel.abqSession
 	"""
 	import os
 	import sys
 	import subprocess
+	if session is not None:
+		from .database import latestRecord
+		session.run(func, latestRecord(inpFile))
+		return
 	with open('abqScript.py', 'w') as file:
 		file.write("import sys\n")
 		file.write("import json\n")
 		file.write("sys.path.extend("+ str(sys.path) +")\n")
 		file.write("import czmtestkit.abqPython as ctkApy\n")
+		file.write("from czmtestkit.database import latestRecord\n")
 		line = "file = '" + inpFile + "' \n"
 		file.write(line)
-		file.write("with open(file, 'r') as file:\n")
-		file.write("	input = file.readlines()\n")
-		file.write("input = input[-1].strip()\n")
-		file.write("dict = json.loads(input)\n")
+		file.write("dict = latestRecord(file)\n")
 		file.write("Model = ctkApy.testModel()\n")
 		file.write("for key in dict: \n")
 		file.write("	if isinstance(dict[key], unicode):\n")
@@ -227,6 +324,27 @@ class testOutput:
     
     :param mseNormAnaPred: normalized mean square error for predicted dependent variable against analytical data
     :type mseNormAnaPred: list
+    
+    :param statsExpPred: streaming statistics (postprocessors.compare.runningStats.toDict) for predicted dependent variable against experimental data
+    :type statsExpPred: dict
+    
+    :param statsSimPred: streaming statistics for predicted dependent variable against simulation data
+    :type statsSimPred: dict
+    
+    :param statsAnaPred: streaming statistics for predicted dependent variable against analytical data
+    :type statsAnaPred: dict
+    
+    :param metricsSimAna: curve distance metrics (postprocessors.compare.curveMetrics) of the simulation against the analytical curve
+    :type metricsSimAna: dict
+    
+    :param metricsSimExp: curve distance metrics of the simulation against the experimental curve
+    :type metricsSimExp: dict
+    
+    :param metricsAnaExp: curve distance metrics of the analytical against the experimental curve
+    :type metricsAnaExp: dict
+
+    :param solverLog: summary of the solver log (increments, cutbacks, iterations, cpu and wall clock time, problem size, see czmtestkit.postprocessors.solverLog)
+    :type solverLog: dict
     """
     def __init__(self):
         self.name = ''
@@ -239,17 +357,29 @@ class testOutput:
         self.stdExpPred = []
         self.stdSimPred = []
         self.stdAnaPred = []
+        self.statsExpPred = {}
+        self.statsSimPred = {}
+        self.statsAnaPred = {}
+        self.metricsSimAna = {}
+        self.metricsSimExp = {}
+        self.metricsAnaExp = {}
+        self.solverLog = {}
     
     def addToDatabase(self,path=''):
         """
-        Adds dictionary of class instance to specified path
+        Adds dictionary of class instance to specified path. Paths with '.db' or '.sqlite' extension are added to an indexed run database (see czmtestkit.database), other paths are appended as a json line.
         
         :param path: absolute or relative path
         :type path: str
         """
         import json
+        from .database import isDatabase, runDatabase
         if path == '':
             path = self.name+'_out.json'
+        if isDatabase(path):
+            with runDatabase(path) as db:
+                db.addOutput(self)
+            return
         with open(path, 'a') as file:
             json.dump(self.__dict__, file)
             file.write("\n")
\ No newline at end of file
@@ -9,4 +9,6 @@
 from . import testModel
 from .preprocessors.abaqustools import *
 from .postprocessors.plot import cleanUp
-from .postprocessors.odbExtract import hisOutLoadPoint
\ No newline at end of file
+from .postprocessors.odbExtract import hisOutLoadPoint
+from .postprocessors.odbStore import exportOdb
+from .monitor import jobMonitor
@@ -0,0 +1,267 @@
+"""
+    czmtestkit.abqStandIn
+    =====================
+    :For use with: CZ environment
+
+    Pure python stand-in for the abqPython module.
+    Functions have the same names and arguments as in abqPython but write canned files instead of building and solving the model in abaqus cae.
+    Used to exercise kernel sessions, schedulers and postprocessing without an abaqus installation.
+
+"""
+from . import testModel
+from .postprocessors.plot import cleanUp
+
+
+
+
+def withBulk(Model):
+    """
+    :For use with: CZ environment
+
+    Stand-in for abqPython.withBulk. Writes a placeholder input file '<Model.name>.inp', or the input file of inpDeck.withBulkInp for models with shared mesh include files (Model.meshInclude), and the job files of solverFiles.
+
+    :param Model: testModel instance
+    :type Model: object
+    """
+    if Model.meshInclude:
+        from .preprocessors.inpDeck import withBulkInp
+        withBulkInp(Model)
+    else:
+        with open(Model.name+'.inp', 'w') as file:
+            file.write("*Heading\n")
+            file.write("** Stand-in input file for "+Model.type+" model "+Model.name+"\n")
+    solverFiles(Model)
+
+
+
+
+def SinEle(Model):
+    """
+    :For use with: CZ environment
+
+    Stand-in for abqPython.SinEle. Writes a placeholder input file '<Model.name>.inp'. Batched models are supported by hisOutLoadPoint.
+
+    :param Model: testModel instance
+    :type Model: object
+    """
+    withBulk(Model)
+
+
+
+
+def loadPointHistory(Model, nPoints=101):
+    """
+    :For use with: CZ environment
+
+    Canned bilinear load-displacement history at a single load point.
+    Displacement follows Model.BC, or each entry of Model.batchBC at the load point of instance 'ceInst-<i>' for batched single element models. The force rises linearly to Model.peakLoad at 40% of the step and softens linearly to zero at the end of the step. Half width models (Model.symmetry) carry half the force.
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :param nPoints: number of history points
+    :type nPoints: int
+
+    :return Time, Region, Output, Direction, Data: arguments of odbExtract.writeRaw
+    :type Time, Region, Output, Direction, Data: list
+    """
+    BCs, Props = Model.batchCases()
+    Regions = ['Node CEINST-'+str(k)+'.1' for k in range(len(BCs))]
+    if not BCs:
+        BCs = [Model.BC]
+        Regions = ['Node ASSEMBLY.1']
+    Time = [Model.stepTime*t/float(nPoints-1) for t in range(nPoints)]
+    Peak = Model.peakLoad/float(Model.forceScale())
+    Region = []
+    Output = []
+    Direction = []
+    Data = []
+    for Name, BC in zip(Regions, BCs):
+        BC = [float(x) for x in BC]
+        Mag = sum([x**2 for x in BC])**0.5
+        Dir = [x/Mag if Mag != 0 else 0.0 for x in BC]
+        for key in ['U', 'RF']:
+            for i in range(3):
+                Out = []
+                for t in range(nPoints):
+                    frac = t/float(nPoints-1)
+                    if key == 'U':
+                        value = BC[i]*frac
+                    elif frac <= 0.4:
+                        value = Peak*Dir[i]*frac/0.4
+                    else:
+                        value = Peak*Dir[i]*(1-frac)/0.6
+                    Out.append(value)
+                Region.append(Name)
+                Output.append(key)
+                Direction.append(str(i+1))
+                Data.append(Out)
+    return Time, Region, Output, Direction, Data
+
+
+
+
+def solverFiles(Model, nIncrements=20, cutbackEvery=6, nElements=1000):
+    """
+    :For use with: CZ environment
+
+    Writes canned status, message and data files ('<Model.name>.sta', '.msg' and '.dat') in the format of abaqus/standard for a job of nIncrements increments over Model.stepTime.
+    Every cutbackEvery-th increment needs a second attempt with half the time increment. Used to exercise postprocessors.solverLog.
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :param nIncrements: number of attempted increments before cutbacks
+    :type nIncrements: int
+
+    :param cutbackEvery: period of the cutbacks (0 for none)
+    :type cutbackEvery: int
+
+    :param nElements: number of elements printed in the problem size
+    :type nElements: int
+    """
+    Name = Model.name
+    sta = [' SUMMARY OF JOB INFORMATION:',
+        ' STEP  INC ATT SEVERE EQUIL TOTAL  TOTAL      STEP       INC OF       DOF    IF',
+        '               DISCON ITERS ITERS  TIME/      TIME/LPF    TIME/LPF    MONITOR RIKS',
+        '               ITERS               FREQ']
+    msg = ['', '                            S T E P       1     S T A T I C   A N A L Y S I S', '']
+    inc = Model.stepTime/float(nIncrements)
+    t = 0.0
+    k = 1
+    while t < Model.stepTime*(1 - 1e-9):
+        attempts = [(inc, True)]
+        if cutbackEvery and k % cutbackEvery == 0:
+            attempts = [(inc, False), (inc/2, True)]
+        for a, (dt, converged) in enumerate(attempts):
+            dt = min(dt, Model.stepTime - t)
+            equil = 2 + (k % 3) + (3 if not converged else 0)
+            msg.append(' INCREMENT     %d STARTS. ATTEMPT NUMBER  %d, TIME INCREMENT   %.3E' % (k, a+1, dt))
+            for i in range(equil):
+                msg.append('')
+                msg.append(' CONVERGENCE CHECKS FOR EQUILIBRIUM ITERATION     %d' % (i+1))
+                msg.append(' AVERAGE FORCE                          1.00      TIME AVG. FORCE           1.00')
+            if not converged:
+                msg.append(' ***WARNING: THE SOLUTION APPEARS TO BE DIVERGING. CONVERGENCE IS JUDGED UNLIKELY.')
+                msg.append(' ***NOTE: CONVERGENCE IS JUDGED UNLIKELY. INCREMENT WILL BE ATTEMPTED AGAIN WITH A TIME INCREMENT OF  %.3E' % (dt/2))
+                sta.append('   1 %5d %3dU    0 %5d %5d  %-10.3g %-10.3g %-10.4g' % (k, a+1, equil, equil, t, t, dt))
+                continue
+            t = t + dt
+            msg.append('')
+            msg.append('   ITERATION SUMMARY FOR THE INCREMENT:  %d TOTAL ITERATIONS, OF WHICH' % equil)
+            msg.append('   0 ARE SEVERE DISCONTINUITY ITERATIONS AND  %d ARE EQUILIBRIUM ITERATIONS.' % equil)
+            msg.append('')
+            msg.append('   TIME INCREMENT COMPLETED   %.3E,  FRACTION OF STEP COMPLETED  %.3f' % (dt, t/Model.stepTime))
+            msg.append('   STEP TIME COMPLETED        %.3E,  TOTAL TIME COMPLETED        %.3E' % (t, t))
+            sta.append('   1 %5d %3d     0 %5d %5d  %-10.3g %-10.3g %-10.4g' % (k, a+1, equil, equil, t, t, dt))
+        k = k + 1
+    sta.append(' THE ANALYSIS HAS COMPLETED SUCCESSFULLY')
+    times = ['', '', '           JOB TIME SUMMARY',
+        '             USER TIME (SEC)      =   %.4g' % (0.05*k*Model.nCpu),
+        '             SYSTEM TIME (SEC)    =   %.4g' % (0.005*k),
+        '             TOTAL CPU TIME (SEC) =   %.4g' % (0.05*k*Model.nCpu + 0.005*k),
+        '             WALLCLOCK TIME (SEC) =   %d' % max(int(0.05*k), 1)]
+    msg = msg + ['', ' THE ANALYSIS HAS BEEN COMPLETED'] + times
+    dat = ['', '                            P R O B L E M   S I Z E', '',
+        '          NUMBER OF ELEMENTS IS                                  %d' % nElements,
+        '          NUMBER OF NODES IS                                     %d' % (2*nElements + 2),
+        '          TOTAL NUMBER OF VARIABLES IN THE MODEL                 %d' % (6*nElements + 12),
+        '', '', '          THE ANALYSIS HAS BEEN COMPLETED'] + times
+    for ext, lines in [('.sta', sta), ('.msg', msg), ('.dat', dat)]:
+        with open(Name+ext, 'w') as file:
+            file.write('\n'.join(lines) + '\n')
+
+
+
+
+def hisOutLoadPoint(Model, nPoints=101):
+    """
+    :For use with: CZ environment
+
+    Stand-in for abqPython.hisOutLoadPoint. Writes the history of loadPointHistory to the odb store '<Model.name>.odbx' (see odbStore.syntheticOdb) and extracts it to '<Model.name>_Raw.npz' with odbExtract.hisOutLoadPoint, so the extraction runs the same code as in abaqus cae.
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :param nPoints: number of history points
+    :type nPoints: int
+    """
+    from .postprocessors.odbStore import syntheticOdb
+    from .postprocessors import odbExtract
+    syntheticOdb(Model, nPoints)
+    odbExtract.hisOutLoadPoint(Model)
+
+
+
+
+class simulatedJob:
+    """
+    :For use with: CZ environment
+
+    Stand-in for a running abaqus job, used to exercise monitor.jobMonitor without abaqus.
+    A background thread writes the increments of loadPointHistory over the given duration to '<Model.name>.sta' and to node print tables in '<Model.name>.dat'.
+    When the job ends or is terminated, the history of the increments reached is written to the odb store '<Model.name>.odbx' so that hisOutLoadPoint extracts the partial results.
+
+    Usage::
+
+        job = simulatedJob(t, duration=5)
+        job.submit()
+        jobMonitor.fromModel(t, poll=0.1, terminate=job.terminate).run()
+        job.waitForCompletion()
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :param duration: seconds to run through the whole step
+    :type duration: float
+
+    :param nPoints: number of increments
+    :type nPoints: int
+    """
+    def __init__(self, Model, duration=5, nPoints=101):
+        import threading
+        self.Model = Model
+        self.duration = duration
+        self.nPoints = nPoints
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._run)
+        self.increments = 0
+
+    def submit(self):
+        import os
+        for ext in ['.sta', '.dat', '_Stop.txt']:
+            if os.path.exists(self.Model.name+ext):
+                os.remove(self.Model.name+ext)
+        self.thread.start()
+
+    def terminate(self):
+        self.stop.set()
+
+    def waitForCompletion(self):
+        self.thread.join()
+
+    def _run(self):
+        import time
+        from .postprocessors.odbStore import syntheticOdb
+        Name = self.Model.name
+        Time, Region, Output, Direction, Data = loadPointHistory(self.Model, self.nPoints)
+        with open(Name+'.sta', 'w') as sta:
+            sta.write(' STEP  INC ATT SEVERE EQUIL TOTAL  TOTAL      STEP       INC OF\n')
+        for k in range(self.nPoints):
+            if self.stop.is_set():
+                break
+            with open(Name+'.dat', 'a') as dat:
+                dat.write('\n THE FOLLOWING TABLE IS PRINTED FOR NODES BELONGING TO NODE SET LOADPOINT\n\n')
+                dat.write('    NODE FOOT-       RF1          RF2          RF3          U1           U2           U3\n')
+                dat.write('         NOTE\n\n')
+                dat.write('      1     ' + '  '.join(['%12.4E' % Data[j][k] for j in [3, 4, 5, 0, 1, 2]]) + '\n')
+            with open(Name+'.sta', 'a') as sta:
+                sta.write('   1 %5d   1     0     1     1  %10.3E %10.3E %10.3E\n' % (k+1, Time[k], Time[k], Time[k]-Time[k-1] if k else 0.0))
+            self.increments = k+1
+            time.sleep(self.duration/float(self.nPoints))
+        syntheticOdb(self.Model, self.nPoints, nWritten=self.increments)
+        with open(Name+'.sta', 'a') as sta:
+            if self.increments == self.nPoints:
+                sta.write(' THE ANALYSIS HAS COMPLETED SUCCESSFULLY\n')
+            else:
+                sta.write(' THE ANALYSIS HAS NOT BEEN COMPLETED\n')
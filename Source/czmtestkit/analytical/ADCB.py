@@ -4,9 +4,7 @@ Created on Thu Sep 30 18:49:57 2021
 
 @author: Nanditha Mudunuru
 """
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Second moments of area
 def Inertia(b,h):
@@ -25,7 +23,14 @@ def energyRelease(Du, Dl, G13, GT, b, hu, hl, a):
     P = (2*b*GT/C)**0.5
     return P
 
-def run(input):
+def curves(input, nPoints=20):
+    """
+    Load-displacement curves before and after crack growth.
+    Attributes of input can be numpy arrays of shape (n, 1) to evaluate n specimens at once, the curves then have the shape (n, nPoints).
+
+    :return U_elastic, P_elastic, U_fracture, P_fracture: displacement and load along the elastic and the fracture part of the curve
+    :type U_elastic, P_elastic, U_fracture, P_fracture: numpy array
+    """
     # Geometry
     L = input.halfLength # Specimen half length
     B = input.width # Specimen width
@@ -53,22 +58,45 @@ def run(input):
     Du = E1*Iu
     Dl = E1*Il
     c0 = compliance(Du, Dl, G13, B, hu, hl, a0)
+    s = np.linspace(0, 1, nPoints, endpoint=True)
     ## Prefailure
-    P_elastic = np.linspace(0, input.maxLoadElastic, 20, endpoint=True)
+    P_elastic = input.maxLoadElastic*s
     U_elastic = c0*P_elastic
     ## Fracture
-    a = np.linspace(input.crackLenStart, input.crackLenStop, 20, endpoint=True)
+    a = input.crackLenStart + (input.crackLenStop - input.crackLenStart)*s
     c = compliance(Du, Dl, G13, B, hu, hl, a)
     P_fracture = energyRelease(Du, Dl, G13, gT, B, hu, hl, a)
     U_fracture = c*P_fracture
-    ## Ploting
-    plt.plot(U_elastic, P_elastic)
-    plt.plot(U_fracture, P_fracture)
-    plt.savefig(input.name+'.png')
-    plt.close()
+    return U_elastic, P_elastic, U_fracture, P_fracture
+
+def run(input, plot=True, save=True):
+    """
+    Load-displacement curves of a single specimen.
+
+    :param plot: save a plot of the curves to '<input.name>.png'
+    :type plot: boolean
+
+    :param save: save the curves to '<input.name>.csv'
+    :type save: boolean
+
+    :return Results: curves with the columns 'U_elastic', 'P_elastic', 'U_fracture' and 'P_fracture'
+    :type Results: pandas DataFrame
+    """
+    import pandas as pd
+    U_elastic, P_elastic, U_fracture, P_fracture = curves(input)
     Results = pd.DataFrame()
     Results['U_elastic'] = U_elastic.tolist()
     Results['P_elastic'] = P_elastic.tolist()
     Results['U_fracture'] = U_fracture.tolist()
     Results['P_fracture'] = P_fracture.tolist()
-    Results.to_csv(input.name+'.csv', index=False)
\ No newline at end of file
+    ## Ploting
+    if plot:
+        from ..postprocessors.plot import pyplot
+        plt = pyplot()
+        plt.plot(U_elastic, P_elastic)
+        plt.plot(U_fracture, P_fracture)
+        plt.savefig(input.name+'.png')
+        plt.close()
+    if save:
+        Results.to_csv(input.name+'.csv', index=False)
+    return Results
\ No newline at end of file
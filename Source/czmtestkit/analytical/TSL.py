@@ -0,0 +1,135 @@
+"""
+    czmtestkit.analytical.TSL
+    =========================
+    :For use with: CZ environment
+
+    Vectorized reference implementation of the bilinear traction separation law with Benzeggagh-Kenane mixed mode propagation from the TSL subroutine in IDF.for and FDF.for.
+    Separation histories are evaluated for many parameter sets at once, so parameter sets can be screened without running single element jobs.
+
+"""
+import numpy as np
+
+
+
+
+def macaulay(x):
+    """
+    Macaulay operator <x> = (x+|x|)/2
+    """
+    return 0.5*(x + np.abs(x))
+
+
+
+
+def tslHistory(separation, props):
+    """
+    Evaluates the traction separation law along separation histories.
+
+    Damage only depends on the largest mixed mode separation reached so far (damage threshold), so every step is evaluated with the state from the previous step as done by the user element at each increment.
+
+    :param separation: separation histories [shear 1, shear 2, normal] with shape (nSteps, 3) shared by all parameter sets or (nSets, nSteps, 3)
+    :type separation: numpy array
+
+    :param props: user element properties (testModel.matPropCz) [stiffness, normal strength, shear strength, mode-1 toughness, mode-2 toughness, B-K parameter] with shape (6,) or (nSets, 6)
+    :type props: numpy array
+
+    :return results: dictionary of arrays with shape (nSets, nSteps) or (nSets, nSteps, 3)
+
+        :'traction': traction vector
+
+        :'damage': damage variable (SVARS(1))
+
+        :'threshold': damage threshold (SVARS(2))
+
+        :'mixity': mode mixity ratio (SVARS(4))
+
+        :'energy': dissipated and stored energy per unit area, the work of the traction along the separation history
+
+    :type results: dict
+    """
+    props = np.atleast_2d(np.asarray(props, dtype=float))
+    separation = np.asarray(separation, dtype=float)
+    if separation.ndim == 2:
+        separation = np.broadcast_to(separation, (props.shape[0],) + separation.shape)
+    nSets, nSteps = separation.shape[0], separation.shape[1]
+    props = np.broadcast_to(props, (nSets, props.shape[1]))
+
+    stif = props[:, 0]
+    tauN = props[:, 1]
+    tauT = props[:, 2]
+    gNc = props[:, 3]
+    gTc = props[:, 4]
+    eta = props[:, 5]
+    # Cutoff displacements
+    delNo = tauN/stif
+    delTo = tauT/stif
+    delNf = 2*gNc/tauN
+    delTf = 2*gTc/tauT
+
+    traction = np.zeros((nSets, nSteps, 3))
+    damage = np.zeros((nSets, nSteps))
+    threshold = np.zeros((nSets, nSteps))
+    mixity = np.full((nSets, nSteps), np.nan)
+    d = np.zeros(nSets)
+    r = np.zeros(nSets)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for k in range(nSteps):
+            delta = separation[:, k, :]
+            # Displacement jump
+            delS = np.sqrt(delta[:, 0]**2 + delta[:, 1]**2)
+            delMc = macaulay(delta[:, 2])
+            jump = np.sqrt(delMc**2 + delS**2)
+            # Mixed mode properties
+            mRatio = delS/(delMc + delS)
+            gRatio = mRatio**2/(1 + 2*mRatio**2 - 2*mRatio)
+            beta = gRatio**eta
+            delOm = np.sqrt(delNo**2 + beta*(delTo**2 - delNo**2))
+            delFm = delNo*delNf/delOm + beta*(delTo*delTf - delNo*delNf)/delOm
+            # Damage, state is not updated without a displacement jump
+            active = np.any(delta != 0, axis=1)
+            r = np.where(active & (r <= jump), jump, r)
+            dNew = np.minimum(delFm*(r - delOm)/(r*(delFm - delOm)), 1)
+            d = np.where(active & (r >= delOm), dNew, d)
+            # Traction with penalty stiffness in compression
+            traction[:, k, :] = (1 - d)[:, None]*stif[:, None]*delta
+            traction[:, k, 2] = traction[:, k, 2] - d*stif*macaulay(-delta[:, 2])
+            damage[:, k] = d
+            threshold[:, k] = r
+            mixity[:, k] = np.where(active, gRatio, np.nan)
+    # Work of the traction along the history (trapezoidal rule)
+    increment = 0.5*(traction[:, 1:, :] + traction[:, :-1, :])*np.diff(separation, axis=1)
+    energy = np.concatenate([np.zeros((nSets, 1)), np.cumsum(increment.sum(axis=2), axis=1)], axis=1)
+    return {'traction': traction, 'damage': damage, 'threshold': threshold, 'mixity': mixity, 'energy': energy}
+
+
+
+
+def singleElement(Model, nSteps=101):
+    """
+    Response of the 'NonStdUM' single element model (uniform separation equal to the applied displacement) for Model.BC, or for every case of a batched model (Model.batchBC, Model.batchMatPropCz).
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :param nSteps: number of points along the step
+    :type nSteps: int
+
+    :return results: tslHistory results with the additional keys
+
+        :'U': effective displacement of the load face scaled by Model.uFactor with shape (nSets, nSteps)
+
+        :'RF': effective reaction force of the load face (traction times face area) with shape (nSets, nSteps)
+
+    :type results: dict
+    """
+    BCs, Props = Model.batchCases()
+    if not BCs:
+        BCs = [Model.BC]
+        Props = [Model.matPropCz]
+    frac = np.linspace(0, 1, nSteps)
+    separation = frac[None, :, None]*np.asarray(BCs, dtype=float)[:, None, :]
+    results = tslHistory(separation, np.asarray(Props, dtype=float))
+    area = (Model.lenTop - Model.crack)*Model.width
+    results['U'] = Model.uFactor*np.sqrt((separation**2).sum(axis=2))
+    results['RF'] = area*np.sqrt((results['traction']**2).sum(axis=2))
+    return results
@@ -85,7 +85,19 @@ class analyticalModel:
 		self.crackLenStop = self.intialCrack + 40
 		self.name = Model.name + '_Analytical'
 
-	def generate(self):
+	def generate(self, plot=True, save=True):
+		"""
+		Load-displacement curves for the model type.
+
+		:param plot: save a plot of the curves to '<name>.png'
+		:type plot: boolean
+
+		:param save: save the curves to '<name>.csv'
+		:type save: boolean
+
+		:return Results: curves with the columns 'U_elastic', 'P_elastic', 'U_fracture' and 'P_fracture'
+		:type Results: pandas DataFrame
+		"""
 		if self.type == 'DCB':
 			"""
 			DCB test for the defined model attributes. Generates a .csv file and plots with load-displacement data.
@@ -114,4 +126,74 @@ class analyticalModel:
 			"""
 			self.thicknessLower = self.thicknessUpper
 			from .ENF import run
-		run(self)
\ No newline at end of file
+		return run(self, plot, save)
+
+
+
+
+class _batchInput:
+	"""
+	Attributes of analyticalModel as arrays of shape (n, 1) for n models of the same type.
+	"""
+	def __init__(self, frame):
+		import numpy as np
+		col = lambda key: frame[key].to_numpy(dtype=float)[:, None]
+		self.halfLength = (col('lenTop') - col('loadE1') - col('loadE2'))*0.5
+		self.width = col('width')
+		self.thicknessUpper = col('thickTop')
+		self.thicknessLower = col('thickBot')
+		if frame['type'].iloc[0] in ['DCB', 'SLB', 'ENF']:
+			self.thicknessLower = self.thicknessUpper
+		self.thicknessCZ = col('thickCz')
+		self.intialCrack = col('crack') - col('loadE2')
+		self.materialProp = np.array(frame['matPropTop'].tolist(), dtype=float).T[:, :, None]
+		self.fractureToughness = col('fTough')
+		self.maxLoadElastic = col('peakLoad')
+		self.crackLenStart = self.intialCrack - 10
+		self.crackLenStop = self.intialCrack + 40
+
+
+
+
+def analyticalBatch(models, nPoints=20):
+	"""
+	Load-displacement curves of many models without plots or files. The formulas are evaluated on arrays for all the models of the same type at once.
+
+	Usage::
+
+		from czmtestkit.analytical import analyticalBatch
+		curves = analyticalBatch(ctk.runDatabase('Runs.db').query(type='DCB'))
+
+	:param models: testModel instances, dictionaries of testModel attributes or a pandas DataFrame with one testModel per row
+	:type models: list or DataFrame
+
+	:param nPoints: number of points along the elastic and the fracture part of the curve
+	:type nPoints: int
+
+	:return Results: one row per point with the columns 'name', 'type', 'point', 'U_elastic', 'P_elastic', 'U_fracture' and 'P_fracture'. Rows are in the order of the models.
+	:type Results: pandas DataFrame
+	"""
+	import importlib
+	import numpy as np
+	import pandas as pd
+	if isinstance(models, pd.DataFrame):
+		frame = models.reset_index(drop=True)
+	else:
+		frame = pd.DataFrame([Model if isinstance(Model, dict) else Model.__dict__ for Model in models])
+	modules = {'DCB': 'ADCB', 'ADCB': 'ADCB', 'SLB': 'ASLB', 'ASLB': 'ASLB', 'ENF': 'ENF'}
+	keys = ['U_elastic', 'P_elastic', 'U_fracture', 'P_fracture']
+	values = dict((key, np.full((len(frame), nPoints), np.nan)) for key in keys)
+	for Type in frame['type'].unique():
+		if Type not in modules:
+			continue
+		curves = importlib.import_module('.'+modules[Type], __package__).curves
+		rows = np.flatnonzero((frame['type'] == Type).to_numpy())
+		Out = curves(_batchInput(frame.iloc[rows]), nPoints)
+		for key, value in zip(keys, Out):
+			values[key][rows] = value
+	Results = pd.DataFrame({'name': np.repeat(frame['name'].to_numpy(), nPoints),
+		'type': np.repeat(frame['type'].to_numpy(), nPoints),
+		'point': np.tile(np.arange(nPoints), len(frame))})
+	for key in keys:
+		Results[key] = values[key].ravel()
+	return Results
@@ -0,0 +1,155 @@
+"""
+    czmtestkit.analytical.loading
+    =============================
+    :For use with: CZ environment
+
+    Sizes the applied displacement and the time incrementation of standardized tests from the analytical load-displacement curves.
+    The displacement at peak load (onset of crack growth at the initial crack length) and the displacement at which the crack has grown over the window of interest are predicted with the compliance and energy release rate of the analytical models.
+    The boundary condition then ends slightly after the end of crack growth, the increments are sized to resolve the linear part in a few increments and the crack growth in many.
+
+"""
+import numpy as np
+
+
+
+
+def _engineeringConstants(Prop):
+    """
+    Nine engineering constants [E1, E2, E3, v12, v13, v23, G12, G13, G23] from isotropic [E, v] or orthotropic properties.
+    """
+    if len(Prop) == 2:
+        E, v = float(Prop[0]), float(Prop[1])
+        G = E/(2*(1+v))
+        return [E, E, E, v, v, v, G, G, G]
+    return [float(x) for x in Prop[:9]]
+
+
+
+
+def crackWindow(Model, margin=0.2, crackGrowth=None, nPoints=101):
+    """
+    Predicted displacements at peak load and at the end of crack growth.
+
+    :param Model: testModel instance of type 'DCB', 'ADCB', 'SLB', 'ASLB' or 'ENF'
+    :type Model: object
+
+    :param margin: ligament left at the end of the specimen as a fraction of the initial ligament when crackGrowth is None
+    :type margin: float
+
+    :param crackGrowth: crack extension of interest. Defaults to growth over the remaining ligament less the margin (up to mid span for 'SLB', 'ASLB' and 'ENF').
+    :type crackGrowth: float
+
+    :param nPoints: number of points along the fracture curve
+    :type nPoints: int
+
+    :return window: displacements of the load point as applied by the boundary condition (analytical displacement divided by Model.uFactor)
+
+        :'uPeak': displacement at peak load
+
+        :'pPeak': peak load
+
+        :'uEnd': largest displacement along the crack growth
+
+        :'aStart', 'aStop': crack lengths of the window measured as in analyticalModel
+
+    :type window: dict
+    """
+    from . import analyticalModel
+    modules = {'DCB': 'ADCB', 'ADCB': 'ADCB', 'SLB': 'ASLB', 'ASLB': 'ASLB', 'ENF': 'ENF'}
+    if Model.type not in modules:
+        raise ValueError('No analytical model for type ' + Model.type)
+    import importlib
+    curves = importlib.import_module('.'+modules[Model.type], __package__).curves
+    input = analyticalModel(Model)
+    input.materialProp = _engineeringConstants(Model.matPropTop)
+    if Model.type in ['DCB', 'SLB', 'ENF']:
+        input.thicknessLower = input.thicknessUpper
+    # Crack tip positions where the analytical solution stops (end of the bonded length or mid span)
+    if Model.type in ['DCB', 'ADCB']:
+        aEnd = 2*input.halfLength
+    else:
+        aEnd = input.halfLength
+    aStart = input.intialCrack
+    if crackGrowth is None:
+        aStop = aEnd - margin*(aEnd - aStart)
+    else:
+        aStop = min(aStart + crackGrowth, aEnd)
+    input.crackLenStart = aStart
+    input.crackLenStop = aStop
+    U_elastic, P_elastic, U_fracture, P_fracture = curves(input, nPoints)
+    uFactor = float(Model.uFactor)
+    return {'uPeak': float(U_fracture[0])/uFactor, 'pPeak': float(P_fracture[0]), 'uEnd': float(np.max(U_fracture))/uFactor,
+        'aStart': float(aStart), 'aStop': float(aStop)}
+
+
+
+
+def planLoading(Model, margin=0.2, crackGrowth=None, nElastic=10, nFracture=100, nOutput=100):
+    """
+    Sets the boundary condition, step time increments and history output interval of Model from the analytical curves.
+    The direction of Model.BC is kept and its magnitude is set to (1 + margin) times the displacement at the end of crack growth.
+    Model.stepTime is kept, the increments and the output interval are fractions of it (Model.initialInc, Model.maxInc, Model.outputInterval).
+
+    Usage::
+
+        t.type = 'DCB'
+        ...
+        pPy.planLoading(t)
+        t.addToDatabase()
+
+    :param Model: testModel instance of type 'DCB', 'ADCB', 'SLB', 'ASLB' or 'ENF'
+    :type Model: object
+
+    :param margin: safety margin on the displacement and on the crack growth (see crackWindow)
+    :type margin: float
+
+    :param crackGrowth: crack extension of interest (see crackWindow)
+    :type crackGrowth: float
+
+    :param nElastic: least number of increments up to peak load, bounds the initial increment
+    :type nElastic: int
+
+    :param nFracture: least number of increments from peak load to the end of the step, sets the largest increment and bounds the initial increment
+    :type nFracture: int
+
+    :param nOutput: number of history output points over the step
+    :type nOutput: int
+
+    :return window: crackWindow results with the additional key 'tPeak', the fraction of the step at peak load
+    :type window: dict
+    """
+    window = crackWindow(Model, margin, crackGrowth)
+    Mag = sum([x**2 for x in Model.BC])**0.5
+    Dir = [x/Mag for x in Model.BC] if Mag > 0 else [0, 0, 1]
+    U = (1 + margin)*window['uEnd']
+    Model.BC = [U*x for x in Dir]
+    tPeak = window['uPeak']/U
+    window['tPeak'] = tPeak
+    Model.maxInc = (1 - tPeak)/nFracture
+    Model.initialInc = min(tPeak/nElastic, Model.maxInc)
+    Model.outputInterval = 1.0/nOutput
+    return window
+
+
+
+
+def stopAtCrackGrowth(Model, crackGrowth, margin=0.1):
+    """
+    Sets Model.stopDisplacement so that the job monitor stops the job once the crack has grown by crackGrowth (see czmtestkit.monitor).
+    The displacement is the analytical displacement at the end of the crack growth increased by margin, as the cohesive zone delays crack growth in the simulation.
+
+    :param Model: testModel instance of type 'DCB', 'ADCB', 'SLB', 'ASLB' or 'ENF'
+    :type Model: object
+
+    :param crackGrowth: crack extension after which the job is stopped
+    :type crackGrowth: float
+
+    :param margin: relative margin on the stop displacement
+    :type margin: float
+
+    :return window: crackWindow results
+    :type window: dict
+    """
+    window = crackWindow(Model, crackGrowth=crackGrowth)
+    Model.stopDisplacement = (1 + margin)*window['uEnd']
+    return window
@@ -0,0 +1,254 @@
+"""
+    czmtestkit.cache
+    ================
+    :For use with: CZ environment
+
+    Content addressed cache for simulation results.
+    Results are keyed on the testModel attributes that affect the simulation together with the contents of the user subroutine in testModel.matTypeCz.
+    Cached artifacts are restored under the name of the requesting model, so reruns and duplicate cases in a sweep skip the simulation.
+    Runs stopped by the wall clock budget of the job monitor (testModel.wallTime) are not cached, as where they stop depends on the machine load.
+
+"""
+import os
+import json
+import time
+import uuid
+import shutil
+import socket
+import hashlib
+
+
+
+
+class resultCache:
+    """
+    Size bounded least recently used cache of result files.
+
+    The cache directory holds one sub directory per key and 'manifest.json' with the size and last use of each entry and the hit, miss and eviction counts.
+
+    Usage::
+
+        c = pPy.resultCache('../Cache')
+        if not c.fetch(t):
+            ctk.abqFun(t.name+"_in.json", 'withBulk')
+            ctk.abqFun(t.name+"_in.json", 'hisOutLoadPoint')
+            pPy.UvsRF(t)
+            c.store(t)
+
+    :param path: cache directory
+    :type path: str
+
+    :param maxSize: maximum size of the cached files in bytes
+    :type maxSize: int
+
+    :param suffixes: suffixes of the files stored per model, appended to testModel.name
+    :type suffixes: list
+    """
+    # Attributes which do not change the simulation results
+    ignore = ['name', 'UvsRFplot', 'nCpu', 'nGpu', 'meshInclude', 'wallTime']
+
+    def __init__(self, path='Cache', maxSize=2**30, suffixes=['.csv', '_Split.csv', '_Analytical.csv']):
+        self.path = os.path.abspath(path)
+        self.maxSize = maxSize
+        self.suffixes = list(suffixes)
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+    def key(self, Model):
+        """
+        Hash of the canonicalized model attributes. The path in matTypeCz is replaced with the hash of the file contents so the key does not depend on where the subroutine is located.
+
+        :param Model: testModel instance
+        :type Model: object
+
+        :return key: sha256 hex digest
+        :type key: str
+        """
+        attributes = dict((k, v) for k, v in Model.__dict__.items() if k not in self.ignore)
+        if Model.matTypeCz != 'AbqMatLib':
+            with open(Model.matTypeCz, 'rb') as file:
+                attributes['matTypeCz'] = hashlib.sha256(file.read()).hexdigest()
+        canonical = json.dumps(attributes, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def fetch(self, Model, dst='.'):
+        """
+        Restores cached results for the model as '<dst>/<Model.name><suffix>'.
+
+        :param Model: testModel instance
+        :type Model: object
+
+        :param dst: directory to restore the files to
+        :type dst: str
+
+        :return hit: True if the results were restored, False if there is no entry or its files are missing
+        :type hit: boolean
+        """
+        key = self.key(Model)
+        with _lock(self.path):
+            manifest = self._read()
+            entry = manifest['entries'].get(key)
+            if entry is not None and not (entry['files'] and all([os.path.exists(os.path.join(self.path, key, suffix)) for suffix in entry['files']])):
+                # Incomplete entry, dropped so that the results are simulated and stored again
+                shutil.rmtree(os.path.join(self.path, key), ignore_errors=True)
+                del manifest['entries'][key]
+                entry = None
+            if entry is None:
+                manifest['misses'] = manifest['misses'] + 1
+                self._write(manifest)
+                return False
+            for suffix in entry['files']:
+                shutil.copyfile(os.path.join(self.path, key, suffix), os.path.join(dst, Model.name+suffix))
+            entry['used'] = time.time()
+            manifest['hits'] = manifest['hits'] + 1
+            self._write(manifest)
+        return True
+
+    def store(self, Model, src='.'):
+        """
+        Adds the available result files '<src>/<Model.name><suffix>' to the cache and evicts the least recently used entries beyond maxSize.
+        Nothing is stored when there are no result files or the run was stopped by the wall clock budget ('<Model.name>_Stop.txt' written by monitor.jobMonitor).
+
+        :param Model: testModel instance
+        :type Model: object
+
+        :param src: directory with the result files
+        :type src: str
+
+        :return stored: True if the results were added
+        :type stored: boolean
+        """
+        key = self.key(Model)
+        stop = os.path.join(src, Model.name+'_Stop.txt')
+        if os.path.exists(stop):
+            with open(stop, 'r') as file:
+                if file.read().startswith('wall time'):
+                    return False
+        if not [suffix for suffix in self.suffixes if os.path.exists(os.path.join(src, Model.name+suffix))]:
+            return False
+        with _lock(self.path):
+            manifest = self._read()
+            folder = os.path.join(self.path, key)
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+            files = []
+            size = 0
+            for suffix in self.suffixes:
+                file = os.path.join(src, Model.name+suffix)
+                if os.path.exists(file):
+                    shutil.copyfile(file, os.path.join(folder, suffix))
+                    files.append(suffix)
+                    size = size + os.path.getsize(file)
+            manifest['entries'][key] = {'files': files, 'size': size, 'used': time.time(), 'name': Model.name}
+            self._evict(manifest)
+            self._write(manifest)
+        return True
+
+    def stats(self):
+        """
+        :return stats: dictionary with 'hits', 'misses', 'evictions', 'entries' and 'size' (bytes)
+        :type stats: dict
+        """
+        manifest = self._read()
+        size = sum([entry['size'] for entry in manifest['entries'].values()])
+        return {'hits': manifest['hits'], 'misses': manifest['misses'], 'evictions': manifest['evictions'],
+            'entries': len(manifest['entries']), 'size': size}
+
+    def _evict(self, manifest):
+        entries = manifest['entries']
+        size = sum([entry['size'] for entry in entries.values()])
+        for key in sorted(entries, key=lambda k: entries[k]['used']):
+            if size <= self.maxSize:
+                break
+            size = size - entries[key]['size']
+            shutil.rmtree(os.path.join(self.path, key), ignore_errors=True)
+            del entries[key]
+            manifest['evictions'] = manifest['evictions'] + 1
+
+    def _read(self):
+        file = os.path.join(self.path, 'manifest.json')
+        if not os.path.exists(file):
+            return {'entries': {}, 'hits': 0, 'misses': 0, 'evictions': 0}
+        with open(file, 'r') as file:
+            return json.load(file)
+
+    def _write(self, manifest):
+        file = os.path.join(self.path, 'manifest.json')
+        with open(file+'.tmp', 'w') as tmp:
+            json.dump(manifest, tmp)
+        os.replace(file+'.tmp', file)
+
+
+
+
+class _lock:
+    """
+    Lock file guarding the manifest against concurrent sweep processes.
+    The lock file holds the host name, process id and a token of the holder. A lock is only broken when it is stale: its holder on this host is no longer running, or, when the holder cannot be checked (other host or windows), the lock is older than timeout.
+    On exit the lock is only removed while it still holds the token of this process.
+    """
+    def __init__(self, path, timeout=60):
+        self.file = os.path.join(path, 'manifest.lock')
+        self.timeout = timeout
+        self.token = '%s %d %s' % (socket.gethostname(), os.getpid(), uuid.uuid4().hex)
+
+    def _read(self, file):
+        try:
+            with open(file, 'r') as lock:
+                return lock.read()
+        except (IOError, OSError):
+            return None
+
+    def _stale(self, owner):
+        try:
+            host, pid, token = owner.split()
+            pid = int(pid)
+        except (AttributeError, ValueError):
+            host, pid = None, None
+        if host == socket.gethostname() and os.name != 'nt':
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                return True
+            except OSError:
+                pass
+            return False
+        try:
+            return time.time() - os.path.getmtime(self.file) > self.timeout
+        except OSError:
+            return False
+
+    def _break(self, owner):
+        # Moves the stale lock aside and restores it if another process took the lock in the meantime
+        moved = self.file + '.' + uuid.uuid4().hex
+        try:
+            os.rename(self.file, moved)
+        except OSError:
+            return
+        if self._read(moved) != owner:
+            try:
+                os.link(moved, self.file)
+            except OSError:
+                pass
+        os.remove(moved)
+
+    def __enter__(self):
+        while True:
+            try:
+                fd = os.open(self.file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except OSError:
+                owner = self._read(self.file)
+                if owner is not None and self._stale(owner):
+                    self._break(owner)
+                time.sleep(0.01)
+                continue
+            os.write(fd, self.token.encode())
+            os.close(fd)
+            return self
+
+    def __exit__(self, *args):
+        if self._read(self.file) == self.token:
+            try:
+                os.remove(self.file)
+            except OSError:
+                pass
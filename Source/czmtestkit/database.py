@@ -0,0 +1,267 @@
+"""
+    czmtestkit.database
+    ===================
+    :For use with: CZ environment and Abaqus cae environment
+
+    Indexed run database based on sqlite.
+    Model inputs (testModel) and comparison results (testOutput) are stored in the tables 'models' and 'outputs' with one typed column per class attribute.
+    List attributes are stored as json text.
+    Columns are added automatically when new attributes are introduced to the classes.
+    This module has to be importable by the python shipped with abaqus cae, so it is restricted to the standard library.
+
+"""
+import os
+import json
+import sqlite3
+
+
+
+
+def latestRecord(path):
+    """
+    Reads the last record from a run database or a json-lines file without reading the whole file.
+
+    :param path: '.db' or '.sqlite' run database or json-lines file such as the ones generated by testModel.addToDatabase
+    :type path: str
+
+    :return record: dictionary of instance attributes
+    :type record: dict
+    """
+    if isDatabase(path):
+        with runDatabase(path) as db:
+            return db.latest()
+    with open(path, 'rb') as file:
+        file.seek(0, os.SEEK_END)
+        end = file.tell()
+        block = 4096
+        data = b''
+        while end > 0:
+            start = max(end - block, 0)
+            file.seek(start)
+            data = file.read(end - start) + data
+            end = start
+            lines = data.strip().split(b'\n')
+            if len(lines) > 1 or end == 0:
+                return json.loads(lines[-1].decode('utf-8'))
+            block = block*2
+    raise ValueError(path + ' is empty')
+
+
+
+
+def isDatabase(path):
+    """
+    :return: True if the path has a run database extension ('.db' or '.sqlite')
+    :type: boolean
+    """
+    return os.path.splitext(path)[1] in ['.db', '.sqlite']
+
+
+
+
+class runDatabase:
+    """
+    Indexed store for model inputs and outputs.
+
+    Usage::
+
+        db = ctk.runDatabase('Runs.db')
+        db.add(t)
+        db.addOutput(out)
+        db.query(type='DCB', thickCz=0.2)
+        db.latest()
+        db.close()
+
+    The connection is also closed when used as a context manager::
+
+        with ctk.runDatabase('Runs.db') as db:
+            db.add(t)
+
+    :param path: database file
+    :type path: str
+    """
+    # Columns indexed by default
+    indexed = {'models': ['name', 'type', 'matTypeCz'], 'outputs': ['name']}
+
+    def __init__(self, path='Runs.db'):
+        from . import testModel, testOutput
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.templates = {'models': testModel(), 'outputs': testOutput()}
+        for table in self.templates:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS ' + table + ' (id INTEGER PRIMARY KEY AUTOINCREMENT)')
+            for key, value in self.templates[table].__dict__.items():
+                self._addColumn(table, key, value)
+            for key in self.indexed[table]:
+                self.index(key, table)
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _columns(self, table):
+        return [row[1] for row in self.connection.execute('PRAGMA table_info(' + table + ')')]
+
+    def _addColumn(self, table, key, value):
+        if key in self._columns(table):
+            return
+        if isinstance(value, str):
+            sqlType = 'TEXT'
+        elif isinstance(value, (list, dict)):
+            sqlType = 'JSON TEXT'
+        else:
+            sqlType = 'NUMERIC'
+        self.connection.execute('ALTER TABLE ' + table + ' ADD COLUMN "' + key + '" ' + sqlType)
+
+    def index(self, column, table='models'):
+        """
+        Creates an index on a column to speed up queries filtering on it.
+
+        :param column: attribute name
+        :type column: str
+
+        :param table: 'models' or 'outputs'
+        :type table: str
+        """
+        self.connection.execute('CREATE INDEX IF NOT EXISTS ' + table + '_' + column + ' ON ' + table + ' ("' + column + '", id)')
+        self.connection.commit()
+
+    def _insert(self, table, records):
+        records = list(records)
+        if not records:
+            return
+        keys = []
+        for record in records:
+            for key in record:
+                if key not in keys:
+                    keys.append(key)
+        for key in keys:
+            sample = [record[key] for record in records if key in record][0]
+            self._addColumn(table, key, sample)
+        columns = ', '.join(['"' + key + '"' for key in keys])
+        marks = ', '.join(['?' for key in keys])
+        types = self._types(table)
+        rows = [[_encode(types[key], record.get(key)) for key in keys] for record in records]
+        self.connection.executemany('INSERT INTO ' + table + ' (' + columns + ') VALUES (' + marks + ')', rows)
+        self.connection.commit()
+
+    def add(self, Model):
+        """
+        Adds a testModel record.
+
+        :param Model: testModel instance
+        :type Model: object
+        """
+        self._insert('models', [Model.__dict__])
+
+    def addOutput(self, out):
+        """
+        Adds a testOutput record. Outputs are linked to models by name.
+
+        :param out: testOutput instance
+        :type out: object
+        """
+        self._insert('outputs', [out.__dict__])
+
+    def importJsonLines(self, path, table='models'):
+        """
+        Bulk import of json-lines files such as InputDatabase.json or OutputDatabase.json in a single transaction.
+
+        :param path: json-lines file
+        :type path: str
+
+        :param table: 'models' for testModel records or 'outputs' for testOutput records
+        :type table: str
+
+        :return n: number of imported records
+        :type n: int
+        """
+        with open(path, 'r') as file:
+            records = [json.loads(line) for line in file if line.strip()]
+        self._insert(table, records)
+        return len(records)
+
+    def _types(self, table):
+        return dict((r[1], r[2]) for r in self.connection.execute('PRAGMA table_info(' + table + ')'))
+
+    def _decode(self, types, row):
+        record = {}
+        for key in row.keys():
+            if key == 'id' or row[key] is None:
+                continue
+            if types[key] == 'JSON TEXT':
+                record[key] = json.loads(row[key])
+            else:
+                record[key] = row[key]
+        return record
+
+    def latest(self, table='models', name=None):
+        """
+        Most recently added record.
+
+        :param table: 'models' or 'outputs'
+        :type table: str
+
+        :param name: only consider records with this name
+        :type name: str
+
+        :return record: dictionary of instance attributes
+        :type record: dict
+        """
+        if name is None:
+            row = self.connection.execute('SELECT * FROM ' + table + ' ORDER BY id DESC LIMIT 1').fetchone()
+        else:
+            row = self.connection.execute('SELECT * FROM ' + table + ' WHERE name = ? ORDER BY id DESC LIMIT 1', (name,)).fetchone()
+        if row is None:
+            raise ValueError('No records in ' + table)
+        return self._decode(self._types(table), row)
+
+    def query(self, table='models', **filters):
+        """
+        Records with attributes equal to the given values. Example: ``db.query(type='DCB', thickCz=0.2)``
+
+        :param table: 'models' or 'outputs'
+        :type table: str
+
+        :return records: list of dictionaries of instance attributes in the order they were added
+        :type records: list
+        """
+        where = ' AND '.join(['"' + key + '" = ?' for key in filters])
+        sql = 'SELECT * FROM ' + table
+        if where:
+            sql = sql + ' WHERE ' + where
+        types = self._types(table)
+        values = [_encode(types[key], filters[key]) for key in filters]
+        rows = self.connection.execute(sql + ' ORDER BY id', values).fetchall()
+        return [self._decode(types, row) for row in rows]
+
+    def results(self, **filters):
+        """
+        Model records joined with the latest output record of the same name.
+
+        :return records: list of (model, output) dictionary pairs. output is None for models without outputs.
+        :type records: list
+        """
+        pairs = []
+        for model in self.query('models', **filters):
+            try:
+                out = self.latest('outputs', model['name'])
+            except ValueError:
+                out = None
+            pairs.append((model, out))
+        return pairs
+
+
+
+
+def _encode(sqlType, value):
+    if sqlType == 'JSON TEXT' and value is not None:
+        return json.dumps(value)
+    return value
@@ -0,0 +1,273 @@
+"""
+    czmtestkit.kernel
+    =================
+    :For use with: CZ environment and Abaqus cae environment
+
+    Long lived worker session for running abqPython functions.
+    A single kernel (abaqus cae or the pure python stand-in from abqStandIn module) is started once and receives testModel dictionaries and function names over a local socket.
+    Requests are executed back to back in the order they are submitted.
+
+    Each request and reply is a single line of json:
+
+        :request: ``{"func": <function name>, "model": <testModel.__dict__>, "cwd": <working directory>}``
+
+        :reply: ``{"status": "done" or "error", "func": <function name>, "name": <model name>, "error": <traceback>}``
+
+    The request ``{"func": "exit"}`` shuts the kernel down.
+    This module has to be importable by the python shipped with abaqus cae, so it is restricted to the standard library.
+"""
+import os
+import sys
+import json
+import socket
+
+
+
+
+def _native(value):
+    """
+    Converts unicode strings from json to native str (abaqus python 2) recursively.
+    """
+    if sys.version_info[0] < 3:
+        if isinstance(value, unicode):
+            return str(value)
+        if isinstance(value, list):
+            return [_native(x) for x in value]
+        if isinstance(value, dict):
+            return dict((_native(k), _native(v)) for k, v in value.items())
+    return value
+
+
+
+
+def _send(sock, message):
+    """
+    Writes a json message followed by a new line to the socket.
+    """
+    line = json.dumps(message) + '\n'
+    sock.sendall(line.encode('utf-8'))
+
+
+
+
+def _receive(stream):
+    """
+    Reads a single json message from a socket file object. Returns None once the connection is closed.
+    """
+    line = stream.readline()
+    if not line:
+        return None
+    return json.loads(line.decode('utf-8'))
+
+
+
+
+def serve(host, port, namespace, reset=None):
+    """
+    :For use with: Abaqus cae environment or CZ environment (stand-in)
+
+    Kernel loop. Connects to the session at host:port and executes requests until an exit request is received or the session closes the connection.
+    Exceptions raised by a function are reported back to the session and do not stop the kernel.
+
+    :param host: session host address
+    :type host: str
+
+    :param port: session port
+    :type port: int
+
+    :param namespace: module with the functions to run and the testModel class (czmtestkit.abqPython or czmtestkit.abqStandIn)
+    :type namespace: module
+
+    :param reset: called before every request to start from a clean state. Example: ``abaqus.Mdb`` to start from a new model database
+    :type reset: callable
+    """
+    import traceback
+    sock = socket.create_connection((host, port))
+    stream = sock.makefile('rb')
+    try:
+        while True:
+            request = _receive(stream)
+            if request is None or request['func'] == 'exit':
+                break
+            request = _native(request)
+            reply = {'func': request['func'], 'name': request['model'].get('name', '')}
+            try:
+                os.chdir(request['cwd'])
+                if reset is not None:
+                    reset()
+                Model = namespace.testModel()
+                for key in request['model']:
+                    setattr(Model, key, request['model'][key])
+                getattr(namespace, request['func'])(Model)
+                reply['status'] = 'done'
+            except Exception:
+                reply['status'] = 'error'
+                reply['error'] = traceback.format_exc()
+            _send(sock, reply)
+    finally:
+        stream.close()
+        sock.close()
+
+
+
+
+class abqSession:
+    """
+    Persistent kernel for running abqPython functions without restarting abaqus cae for every call.
+
+    Usage::
+
+        with ctk.abqSession() as s:
+            ctk.abqFun(t.name+"_in.json", 'withBulk', session=s)
+            ctk.abqFun(t.name+"_in.json", 'hisOutLoadPoint', session=s)
+
+    :param standIn: use the pure python stand-in kernel (czmtestkit.abqStandIn) instead of abaqus cae
+    :type standIn: boolean
+
+    :param command: command used to launch the kernel script, ``{script}`` is replaced by the script name. Defaults to ``cmd.exe /c abaqus cae noGui={script}`` or the current python interpreter for the stand-in.
+    :type command: str or list
+
+    :param timeout: seconds to wait for the kernel to connect
+    :type timeout: float
+
+    :param script: name of the kernel script written to the current working directory
+    :type script: str
+    """
+    def __init__(self, standIn=False, command=None, timeout=600, script='abqKernel.py'):
+        self.standIn = standIn
+        self.command = command
+        self.timeout = timeout
+        self.script = script
+        self.process = None
+        self.pending = 0
+        self._server = None
+        self._sock = None
+        self._stream = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def start(self):
+        """
+        Writes the kernel script, launches the kernel and waits for it to connect.
+        """
+        import subprocess
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.bind(('127.0.0.1', 0))
+        self._server.listen(1)
+        self._server.settimeout(self.timeout)
+        host, port = self._server.getsockname()
+        script = os.path.abspath(self.script)
+        with open(script, 'w') as file:
+            file.write("import sys\n")
+            file.write("sys.path.extend("+ str(sys.path) +")\n")
+            file.write("import czmtestkit.kernel as kernel\n")
+            if self.standIn:
+                file.write("import czmtestkit.abqStandIn as namespace\n")
+                file.write("reset = None\n")
+            else:
+                file.write("import czmtestkit.abqPython as namespace\n")
+                file.write("from abaqus import Mdb as reset\n")
+            file.write("kernel.serve('"+host+"', "+str(port)+", namespace, reset)\n")
+        if self.command is None:
+            if self.standIn:
+                runCommand = [sys.executable, script]
+            else:
+                runCommand = 'cmd.exe /c abaqus cae noGui='+script
+        elif isinstance(self.command, str):
+            runCommand = self.command.replace('{script}', script)
+        else:
+            runCommand = [x.replace('{script}', script) for x in self.command]
+        self.process = subprocess.Popen(runCommand)
+        try:
+            self._sock, address = self._server.accept()
+        except socket.timeout:
+            self.process.kill()
+            raise RuntimeError('Kernel did not connect within %s seconds' % self.timeout)
+        self._sock.settimeout(None)
+        self._stream = self._sock.makefile('rb')
+
+    def submit(self, func, Model):
+        """
+        Queues a function call on the kernel without waiting for it to finish. Requests run in the order they are submitted using the current working directory at the time of submission.
+
+        :param func: function name from abqPython module
+        :type func: str
+
+        :param Model: testModel instance or dictionary of its attributes
+        :type Model: object or dict
+        """
+        if self._sock is None:
+            self.start()
+        model = Model if isinstance(Model, dict) else Model.__dict__
+        _send(self._sock, {'func': func, 'model': model, 'cwd': os.getcwd()})
+        self.pending = self.pending + 1
+
+    def collect(self):
+        """
+        Waits for the reply to the oldest pending request.
+
+        :return reply: reply from the kernel with keys 'status', 'func', 'name' and 'error' (only on failure)
+        :type reply: dict
+        """
+        reply = _receive(self._stream)
+        if reply is None:
+            raise RuntimeError('Kernel closed the connection with %d pending requests' % self.pending)
+        self.pending = self.pending - 1
+        return reply
+
+    def run(self, func, Model):
+        """
+        Runs a function on the kernel and waits for it to finish.
+
+        :param func: function name from abqPython module
+        :type func: str
+
+        :param Model: testModel instance or dictionary of its attributes
+        :type Model: object or dict
+
+        :return reply: reply from the kernel
+        :type reply: dict
+        """
+        self.submit(func, Model)
+        reply = self.collect()
+        if reply['status'] != 'done':
+            raise RuntimeError('%s failed for %s\n%s' % (reply['func'], reply['name'], reply['error']))
+        return reply
+
+    def runAll(self, tasks):
+        """
+        Queues all tasks and collects the replies. Failures are reported in the replies instead of raised.
+
+        :param tasks: list of (function name, testModel instance) pairs
+        :type tasks: list
+
+        :return replies: replies in the order of tasks
+        :type replies: list
+        """
+        for func, Model in tasks:
+            self.submit(func, Model)
+        return [self.collect() for task in tasks]
+
+    def close(self):
+        """
+        Shuts the kernel down and waits for the process to exit.
+        """
+        if self._sock is not None:
+            try:
+                _send(self._sock, {'func': 'exit'})
+            except socket.error:
+                pass
+            self._stream.close()
+            self._sock.close()
+            self._sock = None
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        if self.process is not None:
+            self.process.wait()
+            self.process = None
@@ -0,0 +1,183 @@
+"""
+    czmtestkit.monitor
+    ==================
+    :For use with: CZ environment and Abaqus cae environment
+
+    Early termination of running jobs.
+    The load point reaction force and displacement are printed to the '.dat' file every increment ('*Node Print' requested by withBulk when a stop criterion is set).
+    jobMonitor tails the '.dat' and '.sta' files while the job runs and terminates the job with 'abaqus terminate' once a stop criterion is met, so the results written up to then can still be extracted.
+    This module has to be importable by the python shipped with abaqus cae, so it is restricted to the standard library.
+
+"""
+import os
+import time
+import subprocess
+
+
+
+
+# Keyword lines requesting the load point output in the '.dat' file every increment
+nodePrint = '*Node Print, nset=LoadPoint, summary=NO, totals=NO\nRF, U'
+
+
+
+
+def readNodePrint(path, offset=0, columns=None):
+    """
+    Reads the node print tables appended to a '.dat' file since offset.
+
+    :param path: '.dat' file
+    :type path: str
+
+    :param offset: position in the file after the last complete line read before
+    :type offset: int
+
+    :param columns: columns of the table being read at offset (returned by the previous call)
+    :type columns: list
+
+    :return rows, offset, columns: list of dictionaries of the printed variables (for example 'RF1', 'U3') for each printed node, the new offset and the columns of the table being read
+    :type rows, offset, columns: list, int, list
+    """
+    rows = []
+    if not os.path.exists(path):
+        return rows, offset, columns
+    with open(path, 'rb') as file:
+        file.seek(offset)
+        data = file.read()
+    end = data.rfind(b'\n') + 1
+    for line in data[:end].decode('latin-1').splitlines():
+        tokens = line.split()
+        if 'FOOT-' in tokens:
+            columns = tokens[tokens.index('FOOT-')+1:]
+            continue
+        if columns is None or not tokens:
+            continue
+        try:
+            int(tokens[0])
+            values = [float(x) for x in tokens[-len(columns):]]
+        except ValueError:
+            if tokens[0] not in ['NOTE']:
+                columns = None
+            continue
+        if len(tokens) < len(columns) + 1:
+            continue
+        rows.append(dict(zip(columns, values)))
+    return rows, offset + end, columns
+
+
+
+
+class jobMonitor:
+    """
+    Stops a running job once one of the criteria is met. Criteria set to 0 are disabled.
+
+    Usage::
+
+        myJob.submit()
+        jobMonitor.fromModel(Model).run()
+        myJob.waitForCompletion()
+
+    :param name: job name
+    :type name: str
+
+    :param stopLoadFraction: stop after peak once the load has dropped below this fraction of the peak load
+    :type stopLoadFraction: float
+
+    :param stopDisplacement: stop once the load point displacement exceeds this value
+    :type stopDisplacement: float
+
+    :param wallTime: stop after this many seconds
+    :type wallTime: float
+
+    :param poll: seconds between reads of the job files
+    :type poll: float
+
+    :param terminate: callable terminating the job. Defaults to 'abaqus terminate job=<name>'.
+    :type terminate: callable
+    """
+    def __init__(self, name, stopLoadFraction=0, stopDisplacement=0, wallTime=0, poll=5, terminate=None):
+        self.name = name
+        self.stopLoadFraction = stopLoadFraction
+        self.stopDisplacement = stopDisplacement
+        self.wallTime = wallTime
+        self.poll = poll
+        if terminate is not None:
+            self.terminate = terminate
+        self.offset = 0
+        self.columns = None
+        self.load = 0.0
+        self.displacement = 0.0
+        self.peak = 0.0
+        self.start = time.time()
+        self.reason = None
+
+    @classmethod
+    def fromModel(cls, Model, poll=5, terminate=None):
+        """
+        Monitor with the criteria Model.stopLoadFraction, Model.stopDisplacement and Model.wallTime.
+
+        :param Model: testModel instance
+        :type Model: object
+        """
+        return cls(Model.name, Model.stopLoadFraction, Model.stopDisplacement, Model.wallTime, poll, terminate)
+
+    def terminate(self):
+        subprocess.call('abaqus terminate job=' + self.name, shell=True)
+
+    def update(self):
+        """
+        Reads the increments printed since the last update.
+        """
+        rows, self.offset, self.columns = readNodePrint(self.name+'.dat', self.offset, self.columns)
+        for row in rows:
+            self.load = sum([row.get(k, 0.0)**2 for k in ['RF1', 'RF2', 'RF3']])**0.5
+            self.displacement = sum([row.get(k, 0.0)**2 for k in ['U1', 'U2', 'U3']])**0.5
+            self.peak = max(self.peak, self.load)
+        return len(rows)
+
+    def finished(self):
+        """
+        :return: True once the '.sta' file reports the end of the analysis
+        :type: boolean
+        """
+        if not os.path.exists(self.name+'.sta'):
+            return False
+        with open(self.name+'.sta', 'r') as file:
+            return 'COMPLETED' in file.read()
+
+    def check(self):
+        """
+        :return reason: description of the met criterion or None
+        :type reason: str
+        """
+        if self.stopLoadFraction and self.peak > 0 and self.load < self.stopLoadFraction*self.peak:
+            return 'load %g below %g of peak load %g' % (self.load, self.stopLoadFraction, self.peak)
+        if self.stopDisplacement and self.displacement >= self.stopDisplacement:
+            return 'displacement %g reached %g' % (self.displacement, self.stopDisplacement)
+        if self.wallTime and time.time() - self.start > self.wallTime:
+            return 'wall time %g s exceeded' % self.wallTime
+        return None
+
+    def run(self, timeout=None):
+        """
+        Polls the job until it finishes or a criterion is met. The reason for stopping is written to '<name>_Stop.txt'.
+
+        :param timeout: seconds after which the monitor returns without terminating the job
+        :type timeout: float
+
+        :return reason: description of the met criterion or None if the job finished
+        :type reason: str
+        """
+        while True:
+            self.update()
+            if self.finished():
+                return None
+            self.reason = self.check()
+            if self.reason is not None:
+                self.terminate()
+                with open(self.name+'_Stop.txt', 'w') as file:
+                    file.write(self.reason + '\n')
+                return self.reason
+            if timeout is not None and time.time() - self.start > timeout:
+                return None
+            time.sleep(self.poll)
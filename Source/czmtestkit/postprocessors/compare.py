@@ -1,356 +1,854 @@
-"""
-Created on Mon Oct 11 18:34:36 2021
-
-@author: NMudunuru
-"""
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit
-
-
-
-def mSE(y_exp, y_pred):
-    """
-    compares the error between predicted and observed data.
-    
-    :param y_exp: Expected outcome
-    :type y_exp:array
-    
-    :param y_pred: Predicted outcome
-    :type y_pred:array
-    
-    :return mse: Mean squared error
-    :type mse: float
-    
-    :return mean: mean of the data
-    :return mean: float
-    
-    :return std: standard deviation in the expected data
-    :return std: float
-    """
-    Error = y_pred-y_exp
-    ErrorSquare = Error**2
-    n = ErrorSquare.shape[0]
-    mse = sum(ErrorSquare)/n
-    mean = sum(y_exp)/n
-    std = (sum((y_exp - mean)**2)/n)**0.5
-    return mse, mean, std
-
-
-
-
-def meanComb(m1, m2, n1, n2):
-	"""
-	Determines the mean of two groups given the mean and size of each group.
-
-	:param m1: mean of group 1
-	:type m1: float
-
-	:param m2: mean of group 2
-	:type m2: float
-
-	:param n1: size of group 1
-	:type n1: int
-
-	:param n2: size of group 2
-	:type n2: int
-
-	:retun mc: mean of combined samples
-	:type mc: float
-	"""
-	return (n1*m1 + n2*m2)/(n1+n2)
-
-
-
-
-def sdComb(m1, m2, sd1, sd2, n1, n2):
-	"""
-	Determines the standard deviation of two groups given the mean, standard deviation and size of each group.
-
-	:param m1: mean of group 1
-	:type m1: float
-
-	:param m2: mean of group 2
-	:type m2: float
-	
-	:param sd1: standard deviation of group 1
-	:type sd1: float
-
-	:param sd2: standard deviation of group 2
-	:type sd2: float
-
-	:param n1: size of group 1
-	:type n1: int
-
-	:param n2: size of group 2
-	:type n2: int
-
-	:retun mc: mean of combined samples
-	:type mc: float
-	"""
-	t1 = (n1-1)*(sd1**2)
-	t2 = (n2-1)*(sd2**2)
-	t3 = n1*n2*(m1**2 + m2**2 - 2*m1*m2)/(n1+n2)
-	t4 = n1+n2-1
-	return ((t1+t2+t3)/t4)**0.5
-
-
-
-
-def split_max(FileName, DispCol, ForceCol):
-    """
-    Splits data at maximum force, resulting in split data for elastic regime and fracture regime.
-    
-    :param FileName: path to csv file with force displacement data. Do not include file extension.
-    :type FileName: str
-    
-    :param DispCol: column name for displacement data.
-    :type DispCol: str
-    
-    :param ForceCol: column name for force data.
-    :type ForceCol: str
-    
-    :return Split: Extracted data with four columns.
-    
-        :'U_elastic': displacement data from elastic regime.
-    
-        :'P_elastic': force data from elastic regime.
-    
-        :'U_fracture': displacement data from fracture regime.
-    
-        :'P_fracture': force data from fracture regime.
-        
-    :param type: pandas dataframe
-
-    """
-    dataFrame = pd.read_csv(FileName+'.csv', delimiter=',', header=1).astype(float)
-    Max = dataFrame.idxmax()
-    Elastic = dataFrame.iloc[:Max[ForceCol],:]
-    Fracture = dataFrame.iloc[Max[ForceCol]:,:]
-    SplitA = pd.DataFrame()
-    SplitA['U_elastic'] = Elastic.iloc[:,DispCol]
-    SplitA['P_elastic'] = Elastic.iloc[:,ForceCol]
-    SplitB = pd.DataFrame()
-    SplitB['U_fracture'] = Fracture.iloc[:,DispCol]
-    SplitB['P_fracture'] = Fracture.iloc[:,ForceCol]
-    SplitB = SplitB.reset_index(drop=True)
-    Split = pd.concat([SplitA, SplitB], axis=1)
-    Split.to_csv(FileName+'_Split.csv', index=False)
-    return Split
-
-
-
-def linear(x, *args):
-    """
-    linear model :math:`y = arg[0] + arg[1]x`
-    
-    :param x: independent variable
-    :type x: numpy array or pandas series
-        
-    :param *args: model parameters
-    :type *args: args[0], args[1]
-    
-    :return y: dependent variable
-    :type y: numpy array or pandas series 
-    """
-    a = args[0]
-    b = args[1]
-    y = np.multiply(x,b)
-    y = y + a
-    return y
-
-
-
-def quadratic(x, *args):
-    """
-    quadratic model :math:`y = arg[0] + arg[1]x + arg[2]x^2`
-    
-    :param x: independent variable
-    :type x: numpy array or pandas series
-        
-    :param *args: model parameters
-    :type *args: args[0], args[1], args[2]
-    
-    :return y: dependent variable
-    :type y: numpy array or pandas series 
-    """
-    a = args[0]
-    b = args[1]
-    c = args[2]
-    y = np.multiply(np.power(x,2),c) 
-    y = y + np.multiply(x,b)
-    y = y + a
-    return y 
-
-
-
-def exponent(x, *args):
-    """
-    exponential model :math:`y = arg[3] + arg[0] e^{-arg[1] x}`
-    
-    :param x: independent variable
-    :type x: numpy array or pandas series
-        
-    :param *args: model parameters
-    :type *args: args[0], args[1], args[2]
-    
-    :return y: dependent variable
-    :type y: numpy array or pandas series 
-    """
-    a = args[0]
-    b = args[1]
-    c = args[2]
-    y = np.multiply(x, -b)
-    y = np.exp(y)
-    y = np.multiply(y, a)
-    return y + c
-
-
-
-def cubic(x, *args):
-    """
-    cubic model :math:`y = arg[0] + arg[1]x + arg[2]x^2 + arg[3]x^3`
-    
-    :param x: independent variable
-    :type x: numpy array or pandas series
-        
-    :param *args: model parameters
-    :type *args: args[0], args[1], args[2], args[3]
-    
-    :return y: dependent variable
-    :type y: numpy array or pandas series 
-    """
-    a = args[0]
-    b = args[1]
-    c = args[2]
-    d = args[3]
-    y = np.multiply(np.power(x,3),d)
-    y = y + np.multiply(np.power(x,2),c)
-    y = y + np.multiply(x,b)
-    y = y + a
-    return y
-
-
-
-def fit(dataframe, x_loc, y_loc, func, n, ax):
-    """
-    Optimize model paramters by fitting with training data.
-    
-    :param dataframe: independent and dependent variable in columns
-    :type dataframe: pandas dataframe
-    
-    :param x_loc: iloc index for independent column
-    :type x_loc: int
-    
-    :param y_loc: iloc index for dependent column
-    :type y_loc: int
-    
-    :param func: model function
-    
-        Available models in the package    
-        
-        :linear: :math:`y = arg[0] + arg[1]x`
-        
-        :quadratic: :math:`y = arg[0] + arg[1]x + arg[2]x^2`
-        
-        :cubic: :math:`y = arg[0] + arg[1]x + arg[2]x^2 + arg[3]x^3`
-        
-        :exponent: :math:`y = arg[3] + arg[0] e^{-arg[1] x}`
-    
-    :type func: alias
-    
-    :param n: number of parameters in model expression.
-    :type n: int
-    
-    :param ax: axes for plotting observed data and the predicted data
-    :type ax: matplotlib axes._subplots.AxesSubplot
-    
-    :param pOpt: optimized model parameters
-    :type pOpt: array
-    
-    :return pCov: covariance in model parameters
-    :type pCov: array
-    
-    :return mse: mean squared error
-    :type mse: float
-    
-    :return mseNorm: mean normalized mean squared error
-    :type mseNorm: float
-    
-    :return xmin: lower bound for model validity
-    :type xmin: float
-    
-    :return xmax: upper bound for model validity
-    :type xmax: float
-    """
-    x = dataframe.iloc[:,x_loc].dropna()
-    y = dataframe.iloc[:,y_loc].dropna()
-    p0 = np.ones(n)
-    pOpt, pCov = curve_fit(func, x, y, p0=p0)
-    y_predicted = func(x, *pOpt)
-    mse, mean, std = mSE(y, y_predicted)
-    xmax = max(x)
-    xmin = min(x)
-    ax.plot(x,y,label='training')
-    ax.plot(x, y_predicted, '--', label='prediction')
-    return pOpt, pCov, xmin, xmax, mse, mean, std
-
-
-
-def test(dataframe, x_loc, y_loc, x_min, x_max, func, popt, ax): 
-    """
-    Calculate the goodness of fit between test data and model predictions.
-    
-    :param dataframe: independent and dependent variable in columns
-    :type dataframe: pandas dataframe
-    
-    :param x_loc: iloc index for independent column
-    :type x_loc: int
-    
-    :param y_loc: iloc index for dependent column
-    :type y_loc: int
-    
-    :param x_min: lower bound for model validity
-    :type x_min: float
-    
-    :param x_max: upper bound for model validity
-    :type x_max: float
-    
-    :param func: model function
-    
-        Available models in the package    
-        
-        :linear: :math:`y = arg[0] + arg[1]x`
-        
-        :quadratic: :math:`y = arg[0] + arg[1]x + arg[2]x^2`
-        
-        :cubic: :math:`y = arg[0] + arg[1]x + arg[2]x^2 + arg[3]x^3`
-        
-        :exponent: :math:`y = arg[3] + arg[0] e^{-arg[1] x}`
-    
-    :type func: alias
-    
-    :param popt: model parameters
-    :type popt: array
-    
-    :param ax: axes for plotting observed data and the predicted data
-    :type ax: matplotlib axes._subplots.AxesSubplot
-    
-    :return mse: mean squared error
-    :type mse: float
-    
-    :return mseNorm: mean normalized mean squared error
-    :type mseNorm: float
-    """
-    data = dataframe.iloc[:,[x_loc,y_loc]].dropna()
-    x_header = dataframe.columns[x_loc]
-    y_header = dataframe.columns[y_loc]
-    testdata = data[(data[x_header]<x_max) & (data[x_header]>x_min)]
-    x = testdata[x_header]
-    y = testdata[y_header]
-    y_predicted = func(x, *popt)
-    mse, mean, std= mSE(y, y_predicted)
-    dataframe.plot(x_header, y_header, ax=ax)
-    ax.plot(x, y_predicted, '--', label='prediction')
+"""
+Created on Mon Oct 11 18:34:36 2021
+
+@author: NMudunuru
+"""
+import numpy as np
+# pandas and scipy are imported on first use to keep the import of purPython light
+
+
+
+def mSE(y_exp, y_pred):
+    """
+    compares the error between predicted and observed data.
+    
+    :param y_exp: Expected outcome
+    :type y_exp:array
+    
+    :param y_pred: Predicted outcome
+    :type y_pred:array
+    
+    :return mse: Mean squared error
+    :type mse: float
+    
+    :return mean: mean of the data
+    :return mean: float
+    
+    :return std: standard deviation in the expected data
+    :return std: float
+    """
+    Error = y_pred-y_exp
+    ErrorSquare = Error**2
+    n = ErrorSquare.shape[0]
+    mse = sum(ErrorSquare)/n
+    mean = sum(y_exp)/n
+    std = (sum((y_exp - mean)**2)/n)**0.5
+    return mse, mean, std
+
+
+
+
+def meanComb(m1, m2, n1, n2):
+	"""
+	Determines the mean of two groups given the mean and size of each group.
+	See runningStats for merging any number of groups.
+
+	:param m1: mean of group 1
+	:type m1: float
+
+	:param m2: mean of group 2
+	:type m2: float
+
+	:param n1: size of group 1
+	:type n1: int
+
+	:param n2: size of group 2
+	:type n2: int
+
+	:retun mc: mean of combined samples
+	:type mc: float
+	"""
+	return (n1*m1 + n2*m2)/(n1+n2)
+
+
+
+
+def sdComb(m1, m2, sd1, sd2, n1, n2):
+	"""
+	Determines the standard deviation of two groups given the mean, standard deviation and size of each group.
+	See runningStats for merging any number of groups.
+
+	:param m1: mean of group 1
+	:type m1: float
+
+	:param m2: mean of group 2
+	:type m2: float
+	
+	:param sd1: standard deviation of group 1
+	:type sd1: float
+
+	:param sd2: standard deviation of group 2
+	:type sd2: float
+
+	:param n1: size of group 1
+	:type n1: int
+
+	:param n2: size of group 2
+	:type n2: int
+
+	:retun mc: mean of combined samples
+	:type mc: float
+	"""
+	t1 = (n1-1)*(sd1**2)
+	t2 = (n2-1)*(sd2**2)
+	t3 = n1*n2*(m1**2 + m2**2 - 2*m1*m2)/(n1+n2)
+	t4 = n1+n2-1
+	return ((t1+t2+t3)/t4)**0.5
+
+
+
+
+class runningStats:
+    """
+    Streaming statistics of expected data and of the squared error of predictions (count, mean, M2, min, max and sum of squared errors).
+    Chunks are added with update and accumulators of different chunks, processes or runs are merged in any order with the parallel formulas of Chan et al., so the statistics of a whole campaign are computed without holding all the curves in memory.
+    mean, std and mse are the same as returned by mSE for all the data at once, for two groups mean is meanComb.
+
+    Usage::
+
+        s = pPy.runningStats()
+        s.update(y_exp, y_pred)
+        s.merge(other)
+        out.statsSimPred = s.toDict()
+        s = pPy.runningStats.fromDict(out.statsSimPred)
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.M2 = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self.sse = 0.0
+
+    def update(self, y_exp, y_pred=None):
+        """
+        Adds a chunk of data. Pairs with nan are ignored.
+
+        :param y_exp: Expected outcome
+        :type y_exp: array
+
+        :param y_pred: Predicted outcome. The squared error is not updated if None.
+        :type y_pred: array
+
+        :return self: updated accumulator
+        :type self: runningStats
+        """
+        y_exp = np.asarray(y_exp, dtype=float).ravel()
+        keep = ~np.isnan(y_exp)
+        if y_pred is not None:
+            y_pred = np.asarray(y_pred, dtype=float).ravel()
+            keep = keep & ~np.isnan(y_pred)
+        y = y_exp[keep]
+        if y.size == 0:
+            return self
+        chunk = runningStats()
+        chunk.count = int(y.size)
+        chunk.mean = float(y.mean())
+        chunk.M2 = float(((y - chunk.mean)**2).sum())
+        chunk.min = float(y.min())
+        chunk.max = float(y.max())
+        if y_pred is not None:
+            chunk.sse = float(((y_pred[keep] - y)**2).sum())
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """
+        Merges the statistics of another accumulator into this one.
+
+        :param other: accumulator
+        :type other: runningStats
+
+        :return self: updated accumulator
+        :type self: runningStats
+        """
+        if other.count == 0:
+            return self
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta*other.count/n
+        self.M2 = self.M2 + other.M2 + delta**2*self.count*other.count/n
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sse = self.sse + other.sse
+        return self
+
+    def __add__(self, other):
+        return runningStats.fromDict(self.toDict()).merge(other)
+
+    @property
+    def mse(self):
+        """
+        Mean squared error of the predictions
+        """
+        return self.sse/self.count if self.count else float('nan')
+
+    @property
+    def std(self):
+        """
+        Standard deviation of the expected data (population, as mSE)
+        """
+        return (self.M2/self.count)**0.5 if self.count else float('nan')
+
+    @property
+    def sampleStd(self):
+        """
+        Sample standard deviation of the expected data (as sdComb)
+        """
+        return (self.M2/(self.count - 1))**0.5 if self.count > 1 else float('nan')
+
+    def toDict(self):
+        """
+        :return record: attributes for storing in testOutput and the run database
+        :type record: dict
+        """
+        return {'count': self.count, 'mean': self.mean, 'M2': self.M2, 'min': self.min, 'max': self.max, 'sse': self.sse}
+
+    @classmethod
+    def fromDict(cls, record):
+        """
+        :param record: dictionary from toDict
+        :type record: dict
+
+        :return stats: accumulator
+        :type stats: runningStats
+        """
+        stats = cls()
+        for key in ['count', 'mean', 'M2', 'min', 'max', 'sse']:
+            if key in record:
+                setattr(stats, key, record[key])
+        stats.count = int(stats.count)
+        return stats
+
+
+
+
+def combineStats(stats):
+    """
+    Merges many accumulators, for example the statistics returned by the processes of a sweep or stored for the runs of a campaign.
+
+    :param stats: runningStats instances or dictionaries from runningStats.toDict
+    :type stats: list
+
+    :return total: merged accumulator
+    :type total: runningStats
+    """
+    total = runningStats()
+    for s in stats:
+        total.merge(runningStats.fromDict(s) if isinstance(s, dict) else s)
+    return total
+
+
+
+
+def split_max(FileName, DispCol, ForceCol):
+    """
+    Splits data at maximum force, resulting in split data for elastic regime and fracture regime.
+    
+    :param FileName: path to csv file with force displacement data. Do not include file extension.
+    :type FileName: str
+    
+    :param DispCol: column name for displacement data.
+    :type DispCol: str
+    
+    :param ForceCol: column name for force data.
+    :type ForceCol: str
+    
+    :return Split: Extracted data with four columns.
+    
+        :'U_elastic': displacement data from elastic regime.
+    
+        :'P_elastic': force data from elastic regime.
+    
+        :'U_fracture': displacement data from fracture regime.
+    
+        :'P_fracture': force data from fracture regime.
+        
+    :param type: pandas dataframe
+
+    """
+    import pandas as pd
+    dataFrame = pd.read_csv(FileName+'.csv', delimiter=',', header=1).astype(float)
+    Max = dataFrame.idxmax()
+    Elastic = dataFrame.iloc[:Max[ForceCol],:]
+    Fracture = dataFrame.iloc[Max[ForceCol]:,:]
+    SplitA = pd.DataFrame()
+    SplitA['U_elastic'] = Elastic.iloc[:,DispCol]
+    SplitA['P_elastic'] = Elastic.iloc[:,ForceCol]
+    SplitB = pd.DataFrame()
+    SplitB['U_fracture'] = Fracture.iloc[:,DispCol]
+    SplitB['P_fracture'] = Fracture.iloc[:,ForceCol]
+    SplitB = SplitB.reset_index(drop=True)
+    Split = pd.concat([SplitA, SplitB], axis=1)
+    Split.to_csv(FileName+'_Split.csv', index=False)
+    return Split
+
+
+
+def joinSplit(dataframe):
+    """
+    Joins the elastic and fracture parts of split load displacement data (split_max, analyticalModel) into one curve.
+
+    :param dataframe: columns U_elastic, P_elastic, U_fracture and P_fracture (in this order)
+    :type dataframe: pandas dataframe
+
+    :return x, y: displacement and force
+    :type x, y: numpy array
+    """
+    parts = [dataframe.iloc[:, [k, k+1]].dropna().to_numpy(dtype=float) for k in [0, 2]]
+    curve = np.concatenate(parts)
+    return curve[:, 0], curve[:, 1]
+
+
+
+def resample(x, y, grid):
+    """
+    Linear interpolation of many curves onto displacement grids in one vectorized pass.
+    Curves are sorted by x, grid points outside the range of a curve are nan.
+
+    :param x: independent variable of each curve
+    :type x: list of arrays or numpy array (nCurves, nPoints) padded with nan
+
+    :param y: dependent variable of each curve
+    :type y: list of arrays or numpy array (nCurves, nPoints) padded with nan
+
+    :param grid: grid shared by all the curves (nGrid,) or one grid per curve (nCurves, nGrid)
+    :type grid: numpy array
+
+    :return values: interpolated values (nCurves, nGrid)
+    :type values: numpy array
+    """
+    x = _pad(x)
+    y = _pad(y)
+    nCurves, nPoints = x.shape
+    grid = np.broadcast_to(np.asarray(grid, dtype=float), (nCurves, np.shape(grid)[-1]))
+    valid = ~(np.isnan(x) | np.isnan(y))
+    order = np.argsort(np.where(valid, x, np.inf), axis=1, kind='stable')
+    x = np.take_along_axis(x, order, axis=1)
+    y = np.take_along_axis(y, order, axis=1)
+    valid = np.take_along_axis(valid, order, axis=1)
+    # Curves are mapped to disjoint intervals [3k-0.5, 3k+2] of one sorted key array, so one searchsorted locates all the grid points
+    lo = grid.min(axis=1)[:, None]
+    span = grid.max(axis=1)[:, None] - lo
+    span = np.where(span > 0, span, 1)
+    offset = 3.0*np.arange(nCurves)[:, None]
+    key = np.where(valid, np.clip((x - lo)/span, -0.5, 1.5), 2) + offset
+    gridKey = (grid - lo)/span + offset
+    i = np.searchsorted(key.ravel(), gridKey.ravel(), side='right').reshape(grid.shape)
+    row = np.arange(nCurves)[:, None]*nPoints
+    right = np.clip(i, row + 1, row + nPoints - 1)
+    left = right - 1
+    xf, yf, vf = x.ravel(), y.ravel(), valid.ravel()
+    x0, x1, y0, y1 = xf[left], xf[right], yf[left], yf[right]
+    inside = vf[left] & vf[right] & (grid >= x0) & (grid <= x1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        w = np.where(x1 > x0, (grid - x0)/(x1 - x0), 0)
+    return np.where(inside, y0 + w*(y1 - y0), np.nan)
+
+
+
+def curveMetrics(x, y, xRef, yRef, nGrid=200):
+    """
+    Distance between curves and reference curves (for example simulation against analytical or experimental load displacement curves) for many pairs at once without fitting a model.
+    Both curves of a pair are interpolated on nGrid points spanning the displacement range covered by both.
+
+    :param x, y: curves to score, lists of arrays or 2D arrays padded with nan
+    :type x, y: list or numpy array
+
+    :param xRef, yRef: reference curves, one per curve or a single one for all
+    :type xRef, yRef: list or numpy array
+
+    :param nGrid: number of grid points
+    :type nGrid: int
+
+    :return metrics: arrays with one value per pair
+
+        :'mse': mean squared error of the force on the grid
+
+        :'nrmse': root mean squared error normalized by the force range of the reference
+
+        :'area': area between the curves
+
+        :'peakError': relative error of the peak force
+
+        :'energyError': relative error of the work of the force (area under the curve) on the common range
+
+    :type metrics: dict
+    """
+    x, y, xRef, yRef = [_pad(v) for v in [x, y, xRef, yRef]]
+    n = max(x.shape[0], xRef.shape[0])
+    x, y = [np.broadcast_to(v, (n, v.shape[1])) for v in [x, y]]
+    xRef, yRef = [np.broadcast_to(v, (n, v.shape[1])) for v in [xRef, yRef]]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        lo = np.maximum(np.nanmin(x, axis=1), np.nanmin(xRef, axis=1))
+        hi = np.minimum(np.nanmax(x, axis=1), np.nanmax(xRef, axis=1))
+        grid = lo[:, None] + (hi - lo)[:, None]*np.linspace(0, 1, nGrid)
+        Y = resample(x, y, grid)
+        R = resample(xRef, yRef, grid)
+        error = Y - R
+        mse = np.nanmean(error**2, axis=1)
+        refRange = np.nanmax(yRef, axis=1) - np.nanmin(yRef, axis=1)
+        dx = np.diff(grid, axis=1)
+        trapz = lambda v: np.nansum(0.5*(v[:, 1:] + v[:, :-1])*dx, axis=1)
+        peakRef = np.nanmax(yRef, axis=1)
+        energyRef = trapz(R)
+        metrics = {'mse': mse,
+            'nrmse': mse**0.5/refRange,
+            'area': trapz(np.abs(error)),
+            'peakError': (np.nanmax(y, axis=1) - peakRef)/peakRef,
+            'energyError': (trapz(Y) - energyRef)/energyRef}
+    return metrics
+
+
+
+def metricsToOutputs(outputs, metrics, attribute='metricsSimAna'):
+    """
+    Stores the metrics of each pair in a dictionary attribute of the corresponding testOutput.
+
+    :param outputs: testOutput instances in the order of the pairs
+    :type outputs: list
+
+    :param metrics: result of curveMetrics
+    :type metrics: dict
+
+    :param attribute: 'metricsSimAna', 'metricsSimExp' or 'metricsAnaExp'
+    :type attribute: str
+    """
+    for k, out in enumerate(outputs):
+        setattr(out, attribute, dict((key, float(metrics[key][k])) for key in metrics))
+
+
+
+def linear(x, *args):
+    """
+    linear model :math:`y = arg[0] + arg[1]x`
+    
+    :param x: independent variable
+    :type x: numpy array or pandas series
+        
+    :param *args: model parameters
+    :type *args: args[0], args[1]
+    
+    :return y: dependent variable
+    :type y: numpy array or pandas series 
+    """
+    a = args[0]
+    b = args[1]
+    y = np.multiply(x,b)
+    y = y + a
+    return y
+
+
+
+def quadratic(x, *args):
+    """
+    quadratic model :math:`y = arg[0] + arg[1]x + arg[2]x^2`
+    
+    :param x: independent variable
+    :type x: numpy array or pandas series
+        
+    :param *args: model parameters
+    :type *args: args[0], args[1], args[2]
+    
+    :return y: dependent variable
+    :type y: numpy array or pandas series 
+    """
+    a = args[0]
+    b = args[1]
+    c = args[2]
+    y = np.multiply(np.power(x,2),c) 
+    y = y + np.multiply(x,b)
+    y = y + a
+    return y 
+
+
+
+def exponent(x, *args):
+    """
+    exponential model :math:`y = arg[3] + arg[0] e^{-arg[1] x}`
+    
+    :param x: independent variable
+    :type x: numpy array or pandas series
+        
+    :param *args: model parameters
+    :type *args: args[0], args[1], args[2]
+    
+    :return y: dependent variable
+    :type y: numpy array or pandas series 
+    """
+    a = args[0]
+    b = args[1]
+    c = args[2]
+    y = np.multiply(x, -b)
+    y = np.exp(y)
+    y = np.multiply(y, a)
+    return y + c
+
+
+
+def cubic(x, *args):
+    """
+    cubic model :math:`y = arg[0] + arg[1]x + arg[2]x^2 + arg[3]x^3`
+    
+    :param x: independent variable
+    :type x: numpy array or pandas series
+        
+    :param *args: model parameters
+    :type *args: args[0], args[1], args[2], args[3]
+    
+    :return y: dependent variable
+    :type y: numpy array or pandas series 
+    """
+    a = args[0]
+    b = args[1]
+    c = args[2]
+    d = args[3]
+    y = np.multiply(np.power(x,3),d)
+    y = y + np.multiply(np.power(x,2),c)
+    y = y + np.multiply(x,b)
+    y = y + a
+    return y
+
+
+
+def exponentJac(x, *args):
+    """
+    Jacobian of the exponential model with respect to the model parameters.
+    
+    :param x: independent variable
+    :type x: numpy array or pandas series
+        
+    :param *args: model parameters
+    :type *args: args[0], args[1], args[2]
+    
+    :return J: derivatives with shape x.shape + (3,)
+    :type J: numpy array
+    """
+    a = args[0]
+    b = args[1]
+    x = np.asarray(x, dtype=float)
+    e = np.exp(np.multiply(x, -b))
+    return np.stack([e, -a*x*e, np.ones_like(x)], axis=-1)
+
+
+
+# Degree of the models that are linear in their parameters and fitted with a direct least squares solve
+polynomials = {linear: 1, quadratic: 2, cubic: 3}
+
+
+
+def fit(dataframe, x_loc, y_loc, func, n, ax=None, stats=None):
+    """
+    Optimize model paramters by fitting with training data.
+    Polynomial models (linear, quadratic, cubic) are solved directly by least squares and the exponent model as in fitBatch, other models with scipy.optimize.curve_fit starting from ones.
+    
+    :param dataframe: independent and dependent variable in columns
+    :type dataframe: pandas dataframe
+    
+    :param x_loc: iloc index for independent column
+    :type x_loc: int
+    
+    :param y_loc: iloc index for dependent column
+    :type y_loc: int
+    
+    :param func: model function
+    
+        Available models in the package    
+        
+        :linear: :math:`y = arg[0] + arg[1]x`
+        
+        :quadratic: :math:`y = arg[0] + arg[1]x + arg[2]x^2`
+        
+        :cubic: :math:`y = arg[0] + arg[1]x + arg[2]x^2 + arg[3]x^3`
+        
+        :exponent: :math:`y = arg[3] + arg[0] e^{-arg[1] x}`
+    
+    :type func: alias
+    
+    :param n: number of parameters in model expression.
+    :type n: int
+    
+    :param ax: axes for plotting observed data and the predicted data. Nothing is plotted if None.
+    :type ax: matplotlib axes._subplots.AxesSubplot
+    
+    :param stats: accumulator updated with the data and predictions
+    :type stats: runningStats
+    
+    :param pOpt: optimized model parameters
+    :type pOpt: array
+    
+    :return pCov: covariance in model parameters
+    :type pCov: array
+    
+    :return mse: mean squared error
+    :type mse: float
+    
+    :return mseNorm: mean normalized mean squared error
+    :type mseNorm: float
+    
+    :return xmin: lower bound for model validity
+    :type xmin: float
+    
+    :return xmax: upper bound for model validity
+    :type xmax: float
+    """
+    x = dataframe.iloc[:,x_loc].dropna()
+    y = dataframe.iloc[:,y_loc].dropna()
+    if func in polynomials and polynomials[func] + 1 == n:
+        pOpt, pCov = _polyFit(np.asarray(x, dtype=float)[None, :], np.asarray(y, dtype=float)[None, :], n)
+        pOpt, pCov = pOpt[0], pCov[0]
+    elif func is exponent and n == 3:
+        pOpt, pCov = _expFit(np.asarray(x, dtype=float)[None, :], np.asarray(y, dtype=float)[None, :])
+        pOpt, pCov = pOpt[0], pCov[0]
+    else:
+        from scipy.optimize import curve_fit
+        p0 = np.ones(n)
+        # Trial steps may overflow the model
+        with np.errstate(over='ignore', invalid='ignore'):
+            pOpt, pCov = curve_fit(func, x, y, p0=p0)
+    y_predicted = func(x, *pOpt)
+    mse, mean, std = mSE(y, y_predicted)
+    if stats is not None:
+        stats.update(y, y_predicted)
+    xmax = max(x)
+    xmin = min(x)
+    if ax is not None:
+        ax.plot(x,y,label='training')
+        ax.plot(x, y_predicted, '--', label='prediction')
+    return pOpt, pCov, xmin, xmax, mse, mean, std
+
+
+
+def fitBatch(x, y, func, n):
+    """
+    Fits the same model to many curves in one call, for example the load displacement curves of all runs of a sweep.
+    Curves of different length are passed as lists of arrays or as 2D arrays padded with nan, points with nan in x or y are ignored.
+    Polynomial models are solved with a batched QR decomposition of the Vandermonde matrices. The exponent model starts from the best decay rate on a grid (a and c in closed form) and is refined with batched Levenberg-Marquardt iterations using the analytical jacobian.
+    
+    :param x: independent variable of each curve
+    :type x: list of arrays or numpy array (nCurves, nPoints)
+    
+    :param y: dependent variable of each curve
+    :type y: list of arrays or numpy array (nCurves, nPoints)
+    
+    :param func: model function (linear, quadratic, cubic or exponent)
+    :type func: alias
+    
+    :param n: number of parameters in model expression.
+    :type n: int
+    
+    :return pOpt, pCov, xmin, xmax, mse, mean, std: outputs of fit for each curve, with shapes (nCurves, n), (nCurves, n, n) and (nCurves,). Curves with fewer points than parameters give nan.
+    :type pOpt, pCov, xmin, xmax, mse, mean, std: numpy array
+    """
+    x = _pad(x)
+    y = _pad(y)
+    if func in polynomials and polynomials[func] + 1 == n:
+        pOpt, pCov = _polyFit(x, y, n)
+    elif func is exponent and n == 3:
+        pOpt, pCov = _expFit(x, y)
+    else:
+        raise ValueError('fitBatch supports linear, quadratic, cubic and exponent models')
+    mask = ~(np.isnan(x) | np.isnan(y))
+    count = mask.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        y_predicted = func(np.where(mask, x, 0), *[pOpt[:, [k]] for k in range(n)])
+        mse = np.where(mask, (y_predicted - y)**2, 0).sum(axis=1)/count
+        mean = np.where(mask, y, 0).sum(axis=1)/count
+        std = (np.where(mask, (y - mean[:, None])**2, 0).sum(axis=1)/count)**0.5
+        xmin = np.nanmin(np.where(mask, x, np.nan), axis=1)
+        xmax = np.nanmax(np.where(mask, x, np.nan), axis=1)
+    return pOpt, pCov, xmin, xmax, mse, mean, std
+
+
+
+def _pad(curves):
+    """
+    Stacks curves of different length into a 2D array padded with nan.
+    """
+    if isinstance(curves, np.ndarray) and curves.ndim == 2:
+        return curves.astype(float)
+    curves = [np.asarray(c, dtype=float).ravel() for c in curves]
+    out = np.zeros((len(curves), max([len(c) for c in curves]))) + np.nan
+    for k, c in enumerate(curves):
+        out[k, :len(c)] = c
+    return out
+
+
+
+def _covariance(J, r, mask):
+    """
+    Covariance of the parameters as returned by scipy.optimize.curve_fit, inv(J^T J) scaled by the residual variance.
+    """
+    n = J.shape[2]
+    dof = mask.sum(axis=1) - n
+    JtJ = np.einsum('kij,kil->kjl', J, J)
+    pCov = np.zeros_like(JtJ) + np.nan
+    ok = (dof > 0) & (np.linalg.matrix_rank(JtJ) == n)
+    if ok.any():
+        s2 = (r[ok]**2).sum(axis=1)/dof[ok]
+        pCov[ok] = np.linalg.inv(JtJ[ok])*s2[:, None, None]
+    pCov[(dof == 0) & (np.linalg.matrix_rank(JtJ) == n)] = np.inf
+    return pCov
+
+
+
+def _polyFit(x, y, n):
+    """
+    Batched least squares of polynomials with n coefficients (ascending powers) for curves in the rows of x and y.
+    Curves with fewer than n points or rank deficient Vandermonde matrices (a diagonal entry of R small relative to the norm of its column) get nan coefficients.
+    """
+    mask = ~(np.isnan(x) | np.isnan(y))
+    X = np.where(mask, x, 0)
+    Y = np.where(mask, y, 0)
+    # Vandermonde matrices with the rows of missing points set to zero
+    V = (X[:, :, None]**np.arange(n)) * mask[:, :, None]
+    pOpt = np.zeros((x.shape[0], n)) + np.nan
+    ok = mask.sum(axis=1) >= n
+    if ok.any():
+        Q, R = np.linalg.qr(V[ok])
+        QtY = np.einsum('kij,ki->kj', Q, Y[ok])
+        diag = np.abs(np.diagonal(R, axis1=1, axis2=2))
+        full = np.all(diag > np.finfo(float).eps*max(V.shape[1], n)*np.linalg.norm(V[ok], axis=1), axis=1)
+        ok[ok] = full
+        if ok.any():
+            pOpt[ok] = np.linalg.solve(R[full], QtY[full][:, :, None])[:, :, 0]
+    r = np.where(mask, Y - np.einsum('kij,kj->ki', V, np.nan_to_num(pOpt)), 0)
+    return pOpt, _covariance(V, r, mask)
+
+
+
+def _expFit(x, y, maxIter=100, tol=1e-12):
+    """
+    Batched fit of the exponent model for curves in the rows of x and y.
+    For a given decay rate b the model is linear in a and c, so b is first chosen from a grid (relative to the range of x) with a and c solved in closed form, then all parameters are refined with Levenberg-Marquardt iterations using the analytical jacobian.
+    x is shifted to start at zero during the fit to keep the exponentials bounded.
+    """
+    mask = ~(np.isnan(x) | np.isnan(y))
+    count = mask.sum(axis=1)
+    nCurves = x.shape[0]
+    x0 = np.nanmin(np.where(mask, x, np.nan), axis=1)
+    x0 = np.where(count > 0, x0, 0)
+    X = np.where(mask, x - x0[:, None], 0)
+    Y = np.where(mask, y, 0)
+    span = X.max(axis=1)
+    span = np.where(span > 0, span, 1)
+
+    def linear(b):
+        # Closed form a and c for the decay rate b
+        e = np.exp(-b[:, None]*X)*mask
+        Se, See, Sy, Sey = e.sum(axis=1), (e**2).sum(axis=1), Y.sum(axis=1), (e*Y).sum(axis=1)
+        det = See*count - Se**2
+        a = np.where(det != 0, (Sey*count - Se*Sy)/det, 0)
+        c = np.where(det != 0, (See*Sy - Se*Sey)/det, Sy/np.maximum(count, 1))
+        return a, c
+
+    def residual(p):
+        return np.where(mask, Y - exponent(X, p[:, [0]], p[:, [1]], p[:, [2]]), 0)
+
+    p = np.zeros((nCurves, 3))
+    cost = np.zeros(nCurves) + np.inf
+    grid = np.logspace(-3, 2, 30)
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        for g in np.concatenate([-grid[::-1], grid]):
+            b = g/span
+            a, c = linear(b)
+            q = np.stack([a, b, c], axis=1)
+            r = residual(q)
+            trial = (r**2).sum(axis=1)
+            better = trial < cost
+            p[better] = q[better]
+            cost[better] = trial[better]
+        r = residual(p)
+        lam = np.zeros(nCurves) + 1e-3
+        active = count >= 3
+        for it in range(maxIter):
+            if not active.any():
+                break
+            J = exponentJac(X, p[:, 0:1], p[:, 1:2]) * mask[:, :, None]
+            JtJ = np.einsum('kij,kil->kjl', J, J)
+            Jtr = np.einsum('kij,ki->kj', J, r)
+            A = JtJ + lam[:, None, None]*(JtJ*np.eye(3))
+            # Small shift keeps A invertible when a parameter has no influence (a = 0)
+            A = A + 1e-12*np.trace(JtJ, axis1=1, axis2=2)[:, None, None]*np.eye(3)
+            A[~active] = np.eye(3)
+            step = np.linalg.solve(A, np.where(active[:, None], Jtr, 0)[:, :, None])[:, :, 0]
+            pNew = p + step
+            rNew = residual(pNew)
+            costNew = (rNew**2).sum(axis=1)
+            better = active & (costNew < cost)
+            converged = active & ((cost - np.where(better, costNew, cost) <= tol*cost) & (lam <= 1e-3) | (lam > 1e10))
+            p[better] = pNew[better]
+            r[better] = rNew[better]
+            cost[better] = costNew[better]
+            lam = np.where(better, np.maximum(lam/10, 1e-12), lam*10)
+            active = active & ~converged
+        # Back to the unshifted x
+        p[:, 0] = p[:, 0]*np.exp(p[:, 1]*x0)
+        J = exponentJac(np.where(mask, x, 0), p[:, 0:1], p[:, 1:2]) * mask[:, :, None]
+    p[count < 3] = np.nan
+    return p, _covariance(J, r, mask)
+
+
+
+def test(dataframe, x_loc, y_loc, x_min, x_max, func, popt, ax=None, stats=None): 
+    """
+    Calculate the goodness of fit between test data and model predictions.
+    
+    :param dataframe: independent and dependent variable in columns
+    :type dataframe: pandas dataframe
+    
+    :param x_loc: iloc index for independent column
+    :type x_loc: int
+    
+    :param y_loc: iloc index for dependent column
+    :type y_loc: int
+    
+    :param x_min: lower bound for model validity
+    :type x_min: float
+    
+    :param x_max: upper bound for model validity
+    :type x_max: float
+    
+    :param func: model function
+    
+        Available models in the package    
+        
+        :linear: :math:`y = arg[0] + arg[1]x`
+        
+        :quadratic: :math:`y = arg[0] + arg[1]x + arg[2]x^2`
+        
+        :cubic: :math:`y = arg[0] + arg[1]x + arg[2]x^2 + arg[3]x^3`
+        
+        :exponent: :math:`y = arg[3] + arg[0] e^{-arg[1] x}`
+    
+    :type func: alias
+    
+    :param popt: model parameters
+    :type popt: array
+    
+    :param ax: axes for plotting observed data and the predicted data. Nothing is plotted if None.
+    :type ax: matplotlib axes._subplots.AxesSubplot
+    
+    :param stats: accumulator updated with the data and predictions
+    :type stats: runningStats
+    
+    :return mse: mean squared error
+    :type mse: float
+    
+    :return mseNorm: mean normalized mean squared error
+    :type mseNorm: float
+    """
+    data = dataframe.iloc[:,[x_loc,y_loc]].dropna()
+    x_header = dataframe.columns[x_loc]
+    y_header = dataframe.columns[y_loc]
+    testdata = data[(data[x_header]<x_max) & (data[x_header]>x_min)]
+    x = testdata[x_header]
+    y = testdata[y_header]
+    y_predicted = func(x, *popt)
+    mse, mean, std= mSE(y, y_predicted)
+    if stats is not None:
+        stats.update(y, y_predicted)
+    if ax is not None:
+        dataframe.plot(x_header, y_header, ax=ax)
+        ax.plot(x, y_predicted, '--', label='prediction')
     return mse, mean, std
\ No newline at end of file
@@ -13,42 +13,76 @@ def hisOutLoadPoint(Model):
     """
     :For use with: Abaqus cae environment
      
-    Extracts history output of the first region (in regions with history outputs) from Job.odb.
+    Extracts history output of the first region (in regions with history outputs) from Job.odb, or from the odb store '<Model.name>.odbx' if it exists (see odbStore), which also works in CZ environment.
 
     Requires that history output for reaction force and displacement be requested at a reference point of interest such that this output request is the first one called when defining the model.
 
+    The outputs of all regions are written to '<Model.name>_Raw.npz' (see writeRaw). Each history output is converted to an array in one call instead of row by row. The time is that of the longest history output, to which the shorter ones are padded.
+
     :param Model: testModel instance
     :type Model: object
 
 	:param Name: odb file name (without extension)
 	:type Name: str
     """
-    import csv
-    # Abaqus/CAE Release 2018
-    ## Importing abaqus libraries for postprocessing
-    from odbAccess import openOdb
-    import odbAccess
+    import os
+    import numpy as np
 
     Name = Model.name
     print(Name)
+    if os.path.isdir(Name+'.odbx'):
+        from .odbStore import openOdb
+        Database = openOdb(Name+'.odbx')
+    else:
+        # Abaqus/CAE Release 2018
+        ## Importing abaqus libraries for postprocessing
+        from odbAccess import openOdb
+        Database = openOdb(Name+'.odb')
+    Regions = Database.steps['Step-1'].historyRegions
+    Set = Regions.keys()
+    OutKey = Regions[Set[0]].historyOutputs.keys()
+    Region = []
     Output = []
-    Database = openOdb(Name+'.odb')
-    Set = Database.steps['Step-1'].historyRegions.keys()
-    with open(Name+'_Raw.csv', mode='w') as file:
-        writer = csv.writer(file)
-        OutKey = Database.steps['Step-1'].historyRegions[Set[0]].historyOutputs.keys()
-        for j in Set:
-            for i in OutKey:
-                Out_raw = Database.steps['Step-1'].historyRegions[j].historyOutputs[i].data
-                Out_dat = [float(row[1]) for row in Out_raw]
-                Out = [j]
-                Out.append(i[:-1])
-                Out.append(i[-1])
-                Out = Out + Out_dat
-                Output.append(Out)
-        for j in range(len(Output[0])):
-            row = []
-            for i in range(len(Output)):
-                row.append(Output[i][j])
-            writer.writerow(row)
-    Database.close()
\ No newline at end of file
+    Direction = []
+    Data = []
+    Time = None
+    for j in Set:
+        for i in OutKey:
+            Out_raw = np.asarray(Regions[j].historyOutputs[i].data, dtype=np.float64)
+            if Time is None or len(Out_raw) > len(Time):
+                Time = Out_raw[:, 0]
+            Region.append(j)
+            Output.append(i[:-1])
+            Direction.append(i[-1])
+            Data.append(Out_raw[:, 1])
+    Database.close()
+    writeRaw(Name+'_Raw.npz', Time, Region, Output, Direction, Data)
+
+
+
+
+def writeRaw(path, Time, Region, Output, Direction, Data):
+    """
+    :For use with: Abaqus cae environment and CZ environment
+
+    Writes history outputs to a binary numpy container with the arrays
+
+        :'time' (float64, (nTime,)): time of the history points of the longest history output, padded with nan if shorter
+
+        :'data' (float64, (nOutput, nTime)): one row per history output, shorter histories are padded with nan
+
+        :'region', 'output', 'direction' (str, (nOutput,)): history region, variable and component of each row
+
+    :param path: '.npz' file
+    :type path: str
+    """
+    import numpy as np
+    nTime = max([len(x) for x in Data])
+    Array = np.zeros((len(Data), nTime)) + np.nan
+    for k in range(len(Data)):
+        Array[k, :len(Data[k])] = Data[k]
+    Times = np.zeros(nTime) + np.nan
+    Times[:len(Time)] = np.asarray(Time, dtype=np.float64)[:nTime]
+    np.savez(path, time=Times, data=Array,
+        region=np.array([str(x) for x in Region]), output=np.array([str(x) for x in Output]),
+        direction=np.array([str(x) for x in Direction]))
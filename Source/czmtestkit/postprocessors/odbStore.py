@@ -0,0 +1,404 @@
+"""
+    czmtestkit.postprocessors.odbStore
+    ==================================
+    :For use with: Abaqus cae environment (exportOdb) and CZ environment (openOdb, syntheticOdb)
+
+    Offline stand-in for abaqus output databases, so that results can be extracted without an abaqus installation.
+    An odb store is a directory '<name>.odbx' with a 'manifest.json' describing the contents and one '.npy' file per array::
+
+        <name>.odbx/
+            manifest.json
+            h<step>_<region>_<output>.npy   history output, float64 (nTime, 2) with columns time and value
+            f<step>_time.npy                frame values, float64 (nFrames,)
+            f<step>_<field>_labels.npy      node or element labels, int32 (nValues,)
+            f<step>_<field>_instance.npy    index into the instance names of the field, int32 (nValues,)
+            f<step>_<field>_data.npy        field values, float32 (nFrames, nValues, nComponents)
+
+    The manifest keeps steps, history regions, history outputs and field outputs in the order of the original database::
+
+        {"format": "czmtestkit.odbStore", "version": 1, "source": "Job.odb",
+         "steps": [{"name": "Step-1", "frames": "f0_time.npy",
+            "historyRegions": [{"name": "Node ASSEMBLY.1", "historyOutputs": [{"name": "U1", "file": "h0_0_0.npy"}]}],
+            "fieldOutputs": [{"name": "U", "position": "NODAL", "componentLabels": ["U1", "U2", "U3"],
+                "instances": ["PART-1-1"], "labels": "f0_0_labels.npy", "instance": "f0_0_instance.npy", "data": "f0_0_data.npy"}]}]}
+
+    openOdb reads a store into objects with the subset of the odbAccess interface used by odbExtract (steps, historyRegions, historyOutputs, data, frames, frameValue, fieldOutputs, values, bulkDataBlocks, close).
+    Arrays are memory mapped, so large field outputs are only read when they are accessed.
+
+"""
+import os
+import json
+import numpy as np
+
+
+
+
+class odbWriter:
+    """
+    Writes an odb store incrementally. Used by exportOdb and syntheticOdb.
+
+    :param path: store directory ('.odbx')
+    :type path: str
+
+    :param source: name of the original output database
+    :type source: str
+    """
+    def __init__(self, path, source=''):
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self.path = path
+        self.manifest = {'format': 'czmtestkit.odbStore', 'version': 1, 'source': source, 'steps': []}
+
+    def step(self, name, frameValues):
+        """
+        Adds a step with the given frame values.
+
+        :return k: step index
+        :type k: int
+        """
+        k = len(self.manifest['steps'])
+        file = 'f'+str(k)+'_time.npy'
+        np.save(os.path.join(self.path, file), np.asarray(frameValues, dtype=np.float64))
+        self.manifest['steps'].append({'name': name, 'frames': file, 'historyRegions': [], 'fieldOutputs': []})
+        return k
+
+    def history(self, k, region, output, data):
+        """
+        Adds a history output to step k.
+
+        :param data: (time, value) pairs
+        :type data: numpy array
+        """
+        regions = self.manifest['steps'][k]['historyRegions']
+        names = [x['name'] for x in regions]
+        if region not in names:
+            regions.append({'name': region, 'historyOutputs': []})
+            names.append(region)
+        j = names.index(region)
+        outputs = regions[j]['historyOutputs']
+        file = 'h'+str(k)+'_'+str(j)+'_'+str(len(outputs))+'.npy'
+        np.save(os.path.join(self.path, file), np.asarray(data, dtype=np.float64).reshape(-1, 2))
+        outputs.append({'name': output, 'file': file})
+
+    def field(self, k, name, position, componentLabels, instances, instance, labels):
+        """
+        Adds a field output to step k.
+
+        :param instances: instance names
+        :type instances: list
+
+        :param instance: index into instances for each value
+        :type instance: numpy array
+
+        :param labels: node or element label for each value
+        :type labels: numpy array
+
+        :return data: memory mapped array (nFrames, nValues, nComponents) to be filled frame by frame
+        :type data: numpy memmap
+        """
+        step = self.manifest['steps'][k]
+        nFrames = np.load(os.path.join(self.path, step['frames'])).shape[0]
+        prefix = 'f'+str(k)+'_'+str(len(step['fieldOutputs']))
+        np.save(os.path.join(self.path, prefix+'_labels.npy'), np.asarray(labels, dtype=np.int32))
+        np.save(os.path.join(self.path, prefix+'_instance.npy'), np.asarray(instance, dtype=np.int32))
+        shape = (nFrames, len(labels), max(len(componentLabels), 1))
+        data = np.lib.format.open_memmap(os.path.join(self.path, prefix+'_data.npy'), mode='w+', dtype=np.float32, shape=shape)
+        step['fieldOutputs'].append({'name': name, 'position': position, 'componentLabels': list(componentLabels),
+            'instances': list(instances), 'labels': prefix+'_labels.npy', 'instance': prefix+'_instance.npy', 'data': prefix+'_data.npy'})
+        return data
+
+    def close(self):
+        """
+        Writes the manifest. The store is only readable after close.
+        """
+        with open(os.path.join(self.path, 'manifest.json'), 'w') as file:
+            json.dump(self.manifest, file, indent=1)
+
+
+
+
+def exportOdb(Model, fields=None):
+    """
+    :For use with: Abaqus cae environment
+
+    Exports '<Model.name>.odb' to the odb store '<Model.name>.odbx'.
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :param fields: names of the field outputs to export. All field outputs are exported by default, an empty list exports history outputs only.
+    :type fields: list
+    """
+    from odbAccess import openOdb
+    Name = Model.name
+    Database = openOdb(Name+'.odb', readOnly=True)
+    store = odbWriter(Name+'.odbx', Name+'.odb')
+    for stepName in Database.steps.keys():
+        Step = Database.steps[stepName]
+        k = store.step(stepName, [Frame.frameValue for Frame in Step.frames])
+        for region in Step.historyRegions.keys():
+            Outputs = Step.historyRegions[region].historyOutputs
+            for output in Outputs.keys():
+                store.history(k, region, output, Outputs[output].data)
+        if len(Step.frames) == 0:
+            continue
+        for fieldName in Step.frames[0].fieldOutputs.keys():
+            if fields is not None and fieldName not in fields:
+                continue
+            Field = Step.frames[0].fieldOutputs[fieldName]
+            instances = []
+            instance = []
+            labels = []
+            for Block in Field.bulkDataBlocks:
+                Labels = Block.nodeLabels if Block.nodeLabels is not None else Block.elementLabels
+                instances.append(Block.instance.name if Block.instance is not None else '')
+                instance.append(np.zeros(len(Labels), dtype=np.int32) + len(instances) - 1)
+                labels.append(np.asarray(Labels, dtype=np.int32))
+            if not labels:
+                continue
+            data = store.field(k, fieldName, str(Field.locations[0].position), [str(x) for x in Field.componentLabels],
+                instances, np.concatenate(instance), np.concatenate(labels))
+            for f in range(len(Step.frames)):
+                Blocks = Step.frames[f].fieldOutputs[fieldName].bulkDataBlocks
+                values = np.concatenate([np.asarray(Block.data, dtype=np.float32).reshape(len(Block.data), -1) for Block in Blocks])
+                if values.shape != data.shape[1:]:
+                    print('Skipping field output ' + fieldName + ' in ' + stepName + ': number of values changes between frames')
+                    break
+                data[f] = values
+            data.flush()
+            del data
+    Database.close()
+    store.close()
+
+
+
+
+class _repository(dict):
+    """
+    Ordered dictionary with the keys() of abaqus repositories (list in insertion order).
+    """
+    def __init__(self, items):
+        dict.__init__(self, items)
+        self.order = [key for key, value in items]
+
+    def keys(self):
+        return list(self.order)
+
+    def __iter__(self):
+        return iter(self.order)
+
+    def values(self):
+        return [self[key] for key in self.order]
+
+    def items(self):
+        return [(key, self[key]) for key in self.order]
+
+
+
+
+class offlineOdb:
+    """
+    Output database read from an odb store. Returned by openOdb.
+
+    :param path: store directory ('.odbx')
+    :type path: str
+    """
+    def __init__(self, path):
+        with open(os.path.join(path, 'manifest.json'), 'r') as file:
+            manifest = json.load(file)
+        if manifest.get('format') != 'czmtestkit.odbStore':
+            raise ValueError(path + ' is not an odb store')
+        self.path = path
+        self.name = str(manifest['source'])
+        self.steps = _repository([(str(x['name']), offlineStep(path, x)) for x in manifest['steps']])
+
+    def close(self):
+        pass
+
+
+
+
+class offlineStep:
+    """
+    Step of an odb store with historyRegions and frames.
+    """
+    def __init__(self, path, step):
+        self.name = str(step['name'])
+        self.historyRegions = _repository([(str(x['name']), offlineHistoryRegion(path, x)) for x in step['historyRegions']])
+        frameValues = np.load(os.path.join(path, step['frames']))
+        fields = [offlineFieldData(path, x) for x in step['fieldOutputs']]
+        self.frames = [offlineFrame(k, frameValues[k], fields) for k in range(len(frameValues))]
+
+
+
+
+class offlineHistoryRegion:
+    """
+    History region of an odb store with historyOutputs.
+    """
+    def __init__(self, path, region):
+        self.name = str(region['name'])
+        self.historyOutputs = _repository([(str(x['name']), offlineHistoryOutput(path, x)) for x in region['historyOutputs']])
+
+
+
+
+class offlineHistoryOutput:
+    """
+    History output of an odb store. data is a memory mapped (nTime, 2) array of (time, value) pairs.
+    """
+    def __init__(self, path, output):
+        self.name = str(output['name'])
+        self.file = os.path.join(path, output['file'])
+
+    @property
+    def data(self):
+        return np.load(self.file, mmap_mode='r')
+
+
+
+
+class offlineFieldData:
+    """
+    Field output of an odb store over all frames of a step. The values are memory mapped on first access.
+    """
+    def __init__(self, path, field):
+        self.name = str(field['name'])
+        self.position = str(field['position'])
+        self.componentLabels = tuple([str(x) for x in field['componentLabels']])
+        self.instances = [str(x) for x in field['instances']]
+        self.files = [os.path.join(path, field[key]) for key in ['labels', 'instance', 'data']]
+        self.arrays = None
+
+    def load(self):
+        if self.arrays is None:
+            self.arrays = [np.load(x, mmap_mode='r') for x in self.files]
+        return self.arrays
+
+
+
+
+class offlineFrame:
+    """
+    Frame of an odb store with frameId, frameValue and fieldOutputs.
+    """
+    def __init__(self, frameId, frameValue, fields):
+        self.frameId = frameId
+        self.frameValue = float(frameValue)
+        self.fieldOutputs = _repository([(x.name, offlineFieldOutput(x, frameId)) for x in fields])
+
+
+
+
+class offlineFieldOutput:
+    """
+    Field output of a single frame.
+
+    :bulkDataBlocks: one block per instance with data (nValues, nComponents) and nodeLabels or elementLabels
+    :values: list of field values with nodeLabel or elementLabel, instance name and data
+    """
+    def __init__(self, field, frameId):
+        self.field = field
+        self.frameId = frameId
+        self.name = field.name
+        self.componentLabels = field.componentLabels
+
+    @property
+    def bulkDataBlocks(self):
+        labels, instance, data = self.field.load()
+        nodal = self.field.position == 'NODAL'
+        blocks = []
+        for k in range(len(self.field.instances)):
+            mask = instance == k
+            blocks.append(_block(self.field.instances[k], labels[mask], data[self.frameId][mask], nodal))
+        return blocks
+
+    @property
+    def values(self):
+        labels, instance, data = self.field.load()
+        nodal = self.field.position == 'NODAL'
+        frame = np.asarray(data[self.frameId])
+        return [_value(self.field.instances[instance[j]], labels[j], frame[j], nodal) for j in range(len(labels))]
+
+
+
+
+class _block:
+    def __init__(self, instance, labels, data, nodal):
+        self.instance = _named(instance)
+        self.data = data
+        self.nodeLabels = labels if nodal else None
+        self.elementLabels = None if nodal else labels
+
+
+
+
+class _value:
+    def __init__(self, instance, label, data, nodal):
+        self.instance = _named(instance)
+        self.nodeLabel = int(label) if nodal else None
+        self.elementLabel = None if nodal else int(label)
+        self.data = data if len(data) > 1 else float(data[0])
+
+
+
+
+class _named:
+    def __init__(self, name):
+        self.name = name
+
+
+
+
+def openOdb(path, readOnly=True):
+    """
+    :For use with: CZ environment
+
+    Opens an odb store with the interface of odbAccess.openOdb.
+
+    :param path: store directory ('.odbx')
+    :type path: str
+
+    :return Database: output database
+    :type Database: offlineOdb
+    """
+    return offlineOdb(path)
+
+
+
+
+def syntheticOdb(Model, nPoints=101, nNodes=0, nWritten=None):
+    """
+    :For use with: CZ environment
+
+    Writes the odb store '<Model.name>.odbx' with the canned load point history of abqStandIn (history region 'Node ASSEMBLY.1', or 'Node CEINST-<i>.1' for batched single element models) in step 'Step-1'.
+    Optionally adds a nodal displacement field 'U' on a row of nNodes nodes of instance 'PART-1-1', interpolated linearly from zero at the first node to the load point displacement at the last node.
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :param nPoints: number of history points and frames
+    :type nPoints: int
+
+    :param nNodes: number of nodes in the displacement field
+    :type nNodes: int
+
+    :param nWritten: number of history points and frames written, as for the partial results of a terminated job. Defaults to nPoints.
+    :type nWritten: int
+    """
+    from ..abqStandIn import loadPointHistory
+    Time, Region, Output, Direction, Data = loadPointHistory(Model, nPoints)
+    if nWritten is not None:
+        Time = Time[:nWritten]
+        Data = [x[:nWritten] for x in Data]
+    store = odbWriter(Model.name+'.odbx', Model.name+'.odb')
+    k = store.step('Step-1', Time)
+    for j in range(len(Data)):
+        store.history(k, Region[j], Output[j]+Direction[j], np.stack([Time, Data[j]], axis=1))
+    if nNodes > 0:
+        data = store.field(k, 'U', 'NODAL', ['U1', 'U2', 'U3'], ['PART-1-1'], np.zeros(nNodes), np.arange(1, nNodes+1))
+        U = np.stack([Data[j] for j in range(3)], axis=1)
+        data[:] = np.linspace(0, 1, nNodes)[None, :, None]*U[:, None, :]
+        data.flush()
+        del data
+    store.close()
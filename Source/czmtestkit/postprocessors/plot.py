@@ -10,77 +10,204 @@
 
 
 
-def UvsRF(Model):
+def UvsRF(Model, plot=None, keepRaw=False):
     """
     :For use with: CZ environment 
      
-    Processes raw data extracted from history output. Calculates and plots effective displacement and load data. Also generates a csv file with the results.
+    Processes raw data extracted from history output ('<Model.name>_Raw.npz' or '<Model.name>_Raw.csv'). Calculates and plots effective displacement and load data. Also generates a csv file with the results.
+    Results of batched single element models are additionally written to one csv file per element, '<Model.name>_<i>.csv'.
+    Reaction forces of half width models (Model.symmetry) are doubled in the length-thickness plane (RF1, RF3) and RF2 across the symmetry plane is set to zero, so all results are those of the full specimen.
+    The history is reshaped to a (time, node, output, direction) array (see readRaw) and the effective values of all nodes and outputs are computed in one operation.
 
     :param Model: testModel instance
     :type Model: object
 
+    :param plot: plot force vs displacement. Defaults to Model.UvsRFplot. The plot can also be made later with plotUvsRF.
+    :type plot: boolean
+
+    :param keepRaw: keep the raw history file
+    :type keepRaw: boolean
+
+    :return Data: components and effective values (direction 'Effective') with columns (Node, Output, Direction) indexed by time. None if the raw file does not exist.
+    :type Data: pandas DataFrame
+
 	:return 'Model.name'_UvsRF.png:  matplotlib plot of force vs displacement if Model.UvsRFplot = TRUE
 	:type 'Model.name'_UvsRF.png: image
     """
     
     import os
+    import numpy as np
     import pandas as pd
-    import matplotlib.pyplot as plt
 
     Name = Model.name
-    U_factor = Model.uFactor
-    plot = Model.UvsRFplot
+    if plot is None:
+        plot = Model.UvsRFplot
 
-    
-    if os.path.exists(Name+'_Raw.csv'):
-        data = pd.read_csv(Name+'_Raw.csv', header=None)
-        Data = data.loc[3:]
-        Ind = data.loc[0:2].values.tolist()
-        Head = [[], [], []]
-        for i in range(3):
-            Head[i] = list(sorted(set(Ind[i]), key=Ind[i].index))
-        header = pd.MultiIndex.from_product(Head, names=['Node','Output','Direction'])
-        Data.columns = header
-        Data = Data.astype(float)
-        for i in Head[0]:
-            for j in Head[1]:
-                Data[i,j,'Effective'] = (Data.xs(i,level='Node',axis=1).xs(j,level='Output',axis=1)**2).sum(axis=1)**0.5
-            Data[i,'U','Effective'] = U_factor*Data[i,'U','Effective']
-        NodeSet = list(Data.columns.levels[0])
-        Results = Data.xs('Effective',level='Direction',axis=1)   
-        Results.to_csv(Name+'.csv', index=False)
-        os.remove(Name+'_Raw.csv')
-        if plot:
-            fig, ax = plt.subplots()
-            lw = (len(NodeSet)+1)*2
-            al = 1
-            for i in NodeSet:
-                Results.xs(i,level='Node',axis=1).plot('U', 'RF',ax=ax, linewidth=lw, alpha=al)
-                lw = lw-2
-            ax.legend(NodeSet)
-            ax.set_xlabel('Displacement [mm]')
-            ax.set_ylabel('Force [N]')
-            ax.grid()
-            plt.savefig(Name+'_UvsRF.png')
-            plt.close()
-    else:
+    Raw = [x for x in [Name+'_Raw.npz', Name+'_Raw.csv'] if os.path.exists(x)]
+    if not Raw:
         print("The file does not exist")
+        return None
+    Time, Array, Nodes, Outputs, Directions = readRaw(Raw[0])
+    if Model.forceScale() != 1:
+        ## Half width models: forces along the length and thickness are doubled, the force across the symmetry plane (RF2) vanishes in the full model
+        for i, Output in enumerate(Outputs):
+            if Output.startswith('RF'):
+                for j, Direction in enumerate(Directions):
+                    Array[:, :, i, j] = 0 if Direction == '2' else Array[:, :, i, j]*Model.forceScale()
+    Effective = effective(Array, Outputs, Model.uFactor)
+    nTime = Array.shape[0]
+
+    header = pd.MultiIndex.from_product([Nodes, Outputs], names=['Node','Output'])
+    Results = pd.DataFrame(Effective.reshape(nTime, -1), columns=header)
+    Results.to_csv(Name+'.csv', index=False)
+    if Model.batchBC or Model.batchMatPropCz:
+        ## Splitting batched single elements into '<Name>_<i>.csv' using the instance names 'ceInst-<i>' in the regions
+        Case = [i.split(' ')[-1].split('.')[0].split('-')[-1] for i in Nodes]
+        for k in range(len(Model.batchCases()[0])):
+            Results[[i for i, c in zip(Nodes, Case) if c == str(k)]].to_csv(Name+'_'+str(k)+'.csv', index=False)
+    if not keepRaw:
+        os.remove(Raw[0])
+
+    header = pd.MultiIndex.from_product([Nodes, Outputs, Directions+['Effective']], names=['Node','Output','Direction'])
+    Data = pd.DataFrame(np.concatenate([Array, Effective[:, :, :, None]], axis=3).reshape(nTime, -1), columns=header,
+        index=pd.Index(Time, name='Time') if Time is not None else None)
+    if plot:
+        plotUvsRF(Model, Data)
+    return Data
+
+
+
+
+def readRaw(path):
+    """
+    :For use with: CZ environment
+
+    Reads raw history output ('_Raw.npz' written by odbExtract.writeRaw or legacy '_Raw.csv' with region, output and direction header rows).
+
+    :param path: raw history file
+    :type path: str
+
+    :return Time: time of the history points, None for csv files
+    :type Time: numpy array
+
+    :return Array: history with shape (nTime, nNode, nOutput, nDirection), nan where a node has no such output
+    :type Array: numpy array
+
+    :return Nodes, Outputs, Directions: labels along the axes of Array in order of appearance
+    :type Nodes, Outputs, Directions: list
+    """
+    import numpy as np
+    if path.endswith('.npz'):
+        with np.load(path) as data:
+            Time = data['time']
+            Values = data['data']
+            Labels = [data[key].astype(str) for key in ['region', 'output', 'direction']]
+    else:
+        import csv
+        with open(path, 'r') as file:
+            rows = list(csv.reader(file))
+        Time = None
+        Labels = [np.array(rows[k]) for k in range(3)]
+        Values = np.array(rows[3:], dtype=np.float64).T
+    Index = []
+    Names = []
+    for x in Labels:
+        unique, first, inverse = np.unique(x, return_index=True, return_inverse=True)
+        order = np.argsort(first)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        Names.append([str(y) for y in unique[order]])
+        Index.append(rank[inverse.reshape(-1)])
+    Array = np.zeros((Values.shape[1], len(Names[0]), len(Names[1]), len(Names[2]))) + np.nan
+    Array[:, Index[0], Index[1], Index[2]] = Values.T
+    return Time, Array, Names[0], Names[1], Names[2]
+
+
+
+
+def effective(Array, Outputs, uFactor=1):
+    """
+    :For use with: CZ environment
+
+    Effective (euclidean norm over directions) values of a history array from readRaw. Missing directions are ignored. The displacement 'U' is multiplied by uFactor.
+
+    :return Effective: array with shape (nTime, nNode, nOutput)
+    :type Effective: numpy array
+    """
+    import numpy as np
+    Effective = np.sqrt(np.nansum(Array**2, axis=3))
+    if 'U' in Outputs:
+        Effective[:, :, Outputs.index('U')] *= uFactor
+    return Effective
+
+
+
+
+def plotUvsRF(Model, Data):
+    """
+    :For use with: CZ environment
+
+    Plots effective force vs displacement of every node to '<Model.name>_UvsRF.png'.
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :param Data: results returned by UvsRF
+    :type Data: pandas DataFrame
+    """
+    NodeSet = list(Data.columns.unique(level='Node'))
+    plt = pyplot()
+    fig, ax = plt.subplots()
+    lw = (len(NodeSet)+1)*2
+    al = 1
+    for i in NodeSet:
+        ax.plot(Data[i, 'U', 'Effective'].values, Data[i, 'RF', 'Effective'].values, linewidth=lw, alpha=al)
+        lw = lw-2
+    ax.legend(NodeSet)
+    ax.set_xlabel('Displacement [mm]')
+    ax.set_ylabel('Force [N]')
+    ax.grid()
+    plt.savefig(Model.name+'_UvsRF.png')
+    plt.close()
+
+
+
+
+def pyplot():
+    """
+    Imports matplotlib.pyplot on first use. The non-interactive 'Agg' backend is selected when no display is available (posix without DISPLAY or WAYLAND_DISPLAY) unless a backend is set with the MPLBACKEND environment variable.
+
+    :return plt: matplotlib.pyplot module
+    :type plt: module
+    """
+    import os
+    import sys
+    if 'matplotlib.pyplot' not in sys.modules and 'MPLBACKEND' not in os.environ:
+        if os.name == 'posix' and sys.platform != 'darwin' and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+            import matplotlib
+            matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
 
 
 
 
 def cleanUp(saveExt=[]):
     """
-    current work directory clean up. txt, json, png, csv files are always excluded during clean up.
+    current work directory clean up. txt, json, png, csv, npz files are always excluded during clean up. Other directories than odb stores ('.odbx') are kept.
 
     :param saveExt: extensions to ignore (do not include '.') Example: ['odb', 'log', 'inp']
     :type saveExt: list
     """
-    Ext = ['txt', 'json', 'png', 'csv'] + saveExt
+    Ext = ['txt', 'json', 'png', 'csv', 'npz'] + saveExt
     import os 
+    import shutil
     from os import listdir
-    for file_name in listdir():
+    for file_name in listdir('.'):
         if file_name.split('.')[-1] in Ext:
             pass
+        elif os.path.isdir(file_name):
+            if file_name.endswith('.odbx'):
+                shutil.rmtree(file_name)
         else:
             os.remove(file_name)
\ No newline at end of file
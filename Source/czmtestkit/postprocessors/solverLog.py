@@ -0,0 +1,319 @@
+"""
+    czmtestkit.postprocessors.solverLog
+    ===================================
+    :For use with: CZ environment and Abaqus cae environment (logReport requires pandas)
+
+    Solver performance records from the abaqus status ('.sta'), message ('.msg') and data ('.dat') files.
+    Each attempted increment is one record with the columns::
+
+        step, increment, attempt, cutback, severe, equilibrium, iterations, totalTime, stepTime, timeIncrement, warnings
+
+    'cutback' is 1 for attempts abandoned with a smaller time increment ('U' suffix in the '.sta' file).
+    The records are read from the '.sta' file, or from the '.msg' file when there is no '.sta' file; 'warnings' is taken from the '.msg' file.
+    The job time summary (user, system, cpu and wall clock time) and the problem size (elements, nodes, variables) are read from the '.dat' or '.msg' file.
+    writeLog stores the columnar table and the summary as '<name>_Log.json' next to the results, so they are kept by cleanUp, and logReport collects them across runs.
+    Apart from logReport, this module has to be importable by the python shipped with abaqus cae, so it is restricted to the standard library.
+
+"""
+import os
+import re
+import json
+
+
+
+
+# Columns of the increment table
+columns = ['step', 'increment', 'attempt', 'cutback', 'severe', 'equilibrium', 'iterations', 'totalTime', 'stepTime', 'timeIncrement', 'warnings']
+
+# Patterns of the '.msg' and '.dat' files
+_attemptStart = re.compile(r'INCREMENT\s+(\d+)\s+STARTS\.\s+ATTEMPT NUMBER\s+(\d+),\s+TIME INCREMENT\s+([-+.0-9EeDd]+)')
+_stepStart = re.compile(r'^\s*S T E P\s+(\d+)')
+_iterationSummary = re.compile(r'ITERATION SUMMARY FOR THE INCREMENT:\s+(\d+)\s+TOTAL ITERATIONS')
+_iterationSplit = re.compile(r'(\d+)\s+ARE SEVERE DISCONTINUITY ITERATIONS AND\s+(\d+)\s+ARE EQUILIBRIUM')
+_stepTime = re.compile(r'STEP TIME COMPLETED\s+([-+.0-9EeDd]+),\s+TOTAL TIME COMPLETED\s+([-+.0-9EeDd]+)')
+_summary = {'userTime': re.compile(r'USER TIME \(SEC\)\s+=\s+([-+.0-9Ee]+)'),
+    'systemTime': re.compile(r'SYSTEM TIME \(SEC\)\s+=\s+([-+.0-9Ee]+)'),
+    'cpuTime': re.compile(r'TOTAL CPU TIME \(SEC\)\s+=\s+([-+.0-9Ee]+)'),
+    'wallTime': re.compile(r'WALLCLOCK TIME \(SEC\)\s+=\s+([-+.0-9Ee]+)'),
+    'nElements': re.compile(r'NUMBER OF ELEMENTS IS\s+(\d+)'),
+    'nNodes': re.compile(r'NUMBER OF NODES IS\s+(\d+)'),
+    'nVariables': re.compile(r'TOTAL NUMBER OF VARIABLES IN THE MODEL\s+(\d+)')}
+
+
+
+
+def _float(x):
+    return float(x.replace('D', 'E').replace('d', 'e'))
+
+
+
+
+def _table():
+    return dict((k, []) for k in columns)
+
+
+
+
+def readSta(path):
+    """
+    Reads the increment table of a '.sta' file.
+
+    :param path: '.sta' file
+    :type path: str
+
+    :return table, completed: dictionary of column lists (without 'warnings') and True if the analysis completed successfully
+    :type table, completed: dict, boolean
+    """
+    table = _table()
+    del table['warnings']
+    completed = False
+    with open(path, 'r') as file:
+        for line in file:
+            if 'COMPLETED SUCCESSFULLY' in line:
+                completed = True
+            tokens = line.split()
+            if len(tokens) < 9 or not tokens[0].isdigit() or not tokens[1].isdigit():
+                continue
+            attempt = tokens[2]
+            try:
+                values = [_float(x) for x in tokens[6:9]]
+            except ValueError:
+                continue
+            table['step'].append(int(tokens[0]))
+            table['increment'].append(int(tokens[1]))
+            table['cutback'].append(1 if attempt.endswith('U') else 0)
+            table['attempt'].append(int(attempt.rstrip('U')))
+            table['severe'].append(int(tokens[3]))
+            table['equilibrium'].append(int(tokens[4]))
+            table['iterations'].append(int(tokens[5]))
+            table['totalTime'].append(values[0])
+            table['stepTime'].append(values[1])
+            table['timeIncrement'].append(values[2])
+    return table, completed
+
+
+
+
+def readMsg(path):
+    """
+    Reads the attempted increments and the job time summary of a '.msg' file.
+    As in the '.sta' file, abandoned attempts have the step and total time completed before the attempt.
+
+    :param path: '.msg' file
+    :type path: str
+
+    :return table, summary: dictionary of column lists and dictionary of the job time summary
+    :type table, summary: dict, dict
+    """
+    table = _table()
+    summary = {}
+    step = 1
+    current = None
+    # Step and total time completed
+    completed = [0.0, 0.0]
+    with open(path, 'r') as file:
+        for line in file:
+            match = _stepStart.match(line)
+            if match:
+                step = int(match.group(1))
+                completed[0] = 0.0
+                continue
+            match = _attemptStart.search(line)
+            if match:
+                current = len(table['step'])
+                table['step'].append(step)
+                table['increment'].append(int(match.group(1)))
+                table['attempt'].append(int(match.group(2)))
+                table['timeIncrement'].append(_float(match.group(3)))
+                table['cutback'].append(1)
+                for k in ['severe', 'equilibrium', 'iterations', 'warnings']:
+                    table[k].append(0)
+                table['stepTime'].append(completed[0])
+                table['totalTime'].append(completed[1])
+                continue
+            for key in _summary:
+                match = _summary[key].search(line)
+                if match:
+                    summary[key] = _float(match.group(1))
+            if current is None:
+                continue
+            if '***WARNING' in line:
+                table['warnings'][current] += 1
+            elif 'CONVERGENCE CHECKS FOR SEVERE DISCONTINUITY ITERATION' in line:
+                table['severe'][current] += 1
+                table['iterations'][current] += 1
+            elif 'CONVERGENCE CHECKS FOR EQUILIBRIUM ITERATION' in line:
+                table['equilibrium'][current] += 1
+                table['iterations'][current] += 1
+            else:
+                match = _iterationSummary.search(line)
+                if match:
+                    table['iterations'][current] = int(match.group(1))
+                    table['cutback'][current] = 0
+                match = _iterationSplit.search(line)
+                if match:
+                    table['severe'][current] = int(match.group(1))
+                    table['equilibrium'][current] = int(match.group(2))
+                    continue
+                match = _stepTime.search(line)
+                if match:
+                    completed = [_float(match.group(1)), _float(match.group(2))]
+                    table['stepTime'][current] = completed[0]
+                    table['totalTime'][current] = completed[1]
+    return table, summary
+
+
+
+
+def readDat(path):
+    """
+    Reads the problem size and the job time summary of a '.dat' file.
+
+    :param path: '.dat' file
+    :type path: str
+
+    :return summary: 'nElements', 'nNodes', 'nVariables', 'userTime', 'systemTime', 'cpuTime' and 'wallTime' when printed
+    :type summary: dict
+    """
+    summary = {}
+    with open(path, 'r') as file:
+        for line in file:
+            for key in _summary:
+                if key not in summary or key.endswith('Time'):
+                    match = _summary[key].search(line)
+                    if match:
+                        summary[key] = _float(match.group(1)) if key.endswith('Time') else int(match.group(1))
+    return summary
+
+
+
+
+def solverLog(name):
+    """
+    Increment table and summary of the job files '<name>.sta', '<name>.msg' and '<name>.dat' in the current directory. Missing files are skipped.
+
+    :param name: job name
+    :type name: str
+
+    :return log: 'increments', dictionary of column lists, and 'summary', dictionary with the job time summary, the problem size and
+
+        :'completed': True if the analysis completed successfully
+
+        :'increments', 'attempts', 'cutbacks': completed increments, attempted increments and abandoned attempts
+
+        :'iterations', 'severe': total and severe discontinuity iterations over all attempts
+
+        :'iterationsPerIncrement': iterations per completed increment
+
+        :'warnings': warnings in the '.msg' file
+
+        :'stepTime': step time reached
+
+    :type log: dict
+    """
+    table = None
+    summary = {'completed': False}
+    if os.path.exists(name+'.msg'):
+        table, times = readMsg(name+'.msg')
+        summary.update(times)
+    if os.path.exists(name+'.sta'):
+        sta, summary['completed'] = readSta(name+'.sta')
+        warnings = table['warnings'] if table is not None and len(table['warnings']) == len(sta['step']) else [0]*len(sta['step'])
+        table = sta
+        table['warnings'] = warnings
+    if table is None:
+        table = _table()
+    if os.path.exists(name+'.dat'):
+        summary.update(readDat(name+'.dat'))
+    n = len(table['step'])
+    cutbacks = sum(table['cutback'])
+    summary['attempts'] = n
+    summary['cutbacks'] = cutbacks
+    summary['increments'] = n - cutbacks
+    summary['iterations'] = sum(table['iterations'])
+    summary['severe'] = sum(table['severe'])
+    summary['warnings'] = sum(table['warnings'])
+    summary['iterationsPerIncrement'] = summary['iterations']/float(max(n - cutbacks, 1))
+    summary['stepTime'] = table['totalTime'][-1] if table['totalTime'] else 0.0
+    return {'increments': table, 'summary': summary}
+
+
+
+
+def writeLog(Model):
+    """
+    Parses the job files of Model and writes '<Model.name>_Log.json'. Has to be called before cleanUp removes the job files.
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :return log: solverLog results, the summary has the additional keys 'name', 'matTypeCz', 'nCpu' and 'cpuWallTime' (wall clock time times the number of cpus)
+    :type log: dict
+    """
+    log = solverLog(Model.name)
+    summary = log['summary']
+    summary['name'] = Model.name
+    summary['matTypeCz'] = Model.matTypeCz
+    summary['nCpu'] = Model.nCpu
+    if 'wallTime' in summary:
+        summary['cpuWallTime'] = summary['wallTime']*Model.nCpu
+    with open(Model.name+'_Log.json', 'w') as file:
+        json.dump(log, file)
+    return log
+
+
+
+
+def logReport(paths, attributes=['type', 'matTypeCz', 'nCpu', 'meshSeed', 'crackSeed']):
+    """
+    Cross-run report of solver cost.
+
+    Usage::
+
+        report = pPy.logReport(glob.glob('*/*_Log.json'))
+        report.groupby('matTypeCz')[['wallTime', 'iterationsPerIncrement']].mean()
+
+    :param paths: '_Log.json' files or run directories containing one
+    :type paths: list
+
+    :param attributes: model attributes added as columns, read from '<name>_in.json' next to the log when it exists
+    :type attributes: list
+
+    :return report: one row per run indexed by name with the summary of solverLog, the model attributes and
+
+        :'wallTimePerIncrement', 'cpuTimePerIncrement': time per completed increment
+
+        :'wallTimePerElement': wall clock time per element
+
+    :type report: pandas DataFrame
+    """
+    import pandas as pd
+    from ..database import latestRecord
+    rows = []
+    for path in paths:
+        if os.path.isdir(path):
+            logs = [x for x in os.listdir(path) if x.endswith('_Log.json')]
+            if not logs:
+                continue
+            path = os.path.join(path, logs[0])
+        with open(path, 'r') as file:
+            row = dict(json.load(file)['summary'])
+        row.setdefault('name', os.path.basename(path)[:-len('_Log.json')])
+        model = os.path.join(os.path.dirname(path), row['name']+'_in.json')
+        if os.path.exists(model):
+            record = latestRecord(model)
+            for key in attributes:
+                if key in record:
+                    row[key] = json.dumps(record[key]) if isinstance(record[key], list) else record[key]
+        rows.append(row)
+    report = pd.DataFrame(rows)
+    if report.empty:
+        return report
+    report = report.set_index('name')
+    increments = report['increments'].where(report['increments'] > 0)
+    for key in ['wallTime', 'cpuTime']:
+        if key in report:
+            report[key+'PerIncrement'] = report[key]/increments
+    if 'wallTime' in report and 'nElements' in report:
+        report['wallTimePerElement'] = report['wallTime']/report['nElements']
+    return report
@@ -0,0 +1,766 @@
+"""
+    Input deck funcitons
+    =====================
+    :For use with: CZ environment
+
+    Generates abaqus input files for the models from the models module without abaqus cae.
+    Parts are meshed with structured hexahedral (C3D8) and cohesive (COH3D8) elements using numpy and written directly to the input file together with sets, surfaces, constraints, boundary conditions and output requests.
+    Alternatively the meshes are written once to include files shared by all runs with the same geometry (testModel.meshInclude).
+
+"""
+import os
+import json
+import hashlib
+import numpy as np
+from ..monitor import nodePrint
+
+
+
+
+class partGeometry:
+    """
+    Part attributes used by the structured mesher. Mirrors the attributes of rectPart.geometry.
+
+    :param dim: Part length, width and height
+    :type dim: List
+
+    :param type: Part type ('UnPart', 'CrackPart', 'EnfTop', 'EnfBot', 'SlbTop', 'SlbBot')
+    :type type: str
+    """
+    def __init__(self):
+        self.dim = [1,1,0] # dimensions [length, width, thickness]
+        self.crack = 0 # crack length
+        self.loadE1 = 0 # loading edge 1
+        self.loadE2 = 0 # loading edge 2
+        self.matType = None # String to indicate material type
+        self.matProp = [] # List of material properties
+        self.meshSeed = [1,1,1] # List of mesh seed by side along the 3 directions
+        self.crackMesh = 5 # Mesh seed size for crack
+        self.TabPosition = 0 # Location of load for DCB and ADCB
+        self.biasRatio = 1 # Ratio of the coarsest to the finest seed of graded seeding
+        self.biasBand = 0 # Length ahead of the crack seeded uniformly when graded
+        self.interface = 'Bot' # Face bonded to the cohesive zone
+        self.dimension = '3D' # '3D' solid or '2D' plane mesh in the length-thickness plane
+        self.planeType = 'Strain' # Plane 'Strain' or 'Stress' elements of 2D meshes
+        self.type = 'UnPart'
+
+
+
+
+def modelGeometries(Model):
+    """
+    Part geometries of the top substrate, cohesive zone and bottom substrate as defined in models.withBulk. Half width models (Model.symmetry) span the width from 0 to the mid-width plane.
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :return geometries: dictionary with partGeometry instances for 'Top', 'Cz' and 'Bot'
+    :type geometries: dict
+    """
+    Width = Model.width*0.5 if Model.symmetry else Model.width
+
+    ## Defining top substrate
+    gT = partGeometry()
+    gT.dim = [Model.lenTop, Width, Model.thickTop]
+    gT.crack = Model.crack
+    gT.matType = Model.matTypeTop
+    gT.matProp = Model.matPropTop
+    gT.meshSeed = list(Model.meshSeed)
+    gT.crackMesh = Model.crackSeed
+    gT.interface = 'Bot'
+
+    ## Defining bot substrate
+    gB = partGeometry()
+    gB.dim = [Model.lenBot, Width, Model.thickBot]
+    gB.crack = Model.crack - Model.lenTop + Model.lenBot
+    gB.matType = Model.matTypeBot
+    gB.matProp = Model.matPropBot
+    gB.meshSeed = list(Model.meshSeed)
+    gB.crackMesh = Model.crackSeed
+    gB.interface = 'Top'
+
+    ## Defining cohesive zone
+    gC = partGeometry()
+    gC.dim = [Model.lenTop - Model.crack, Width, Model.thickCz]
+    gC.matType = 'AbqMatLib'
+    gC.matProp = Model.matPropCz
+    gC.meshSeed = [Model.meshSeed[0], Model.meshSeed[1], Model.thickCz]
+    for g in [gT, gB, gC]:
+        g.biasRatio = Model.biasRatio
+        g.biasBand = Model.biasBand
+        g.dimension = Model.dimension
+        g.planeType = Model.planeType
+
+    if Model.type in ['DCB','ADCB']:
+        gT.TabPosition = Model.TabPosition
+        gB.TabPosition = 1 - Model.TabPosition
+        gT.type = 'CrackPart'
+        gB.type = 'CrackPart'
+    elif Model.type == 'ENF':
+        gT.loadE1 = Model.lenTop*0.5
+        gB.loadE1 = Model.loadE1
+        gB.loadE2 = Model.loadE2
+        gT.type = 'EnfTop'
+        gB.type = 'EnfBot'
+    elif Model.type in ['SLB','ASLB']:
+        gT.loadE1 = Model.lenTop*0.5
+        gT.loadE2 = Model.loadE2
+        gB.loadE1 = Model.loadE1
+        gT.type = 'SlbTop'
+        gB.type = 'SlbBot'
+    return {'Top': gT, 'Cz': gC, 'Bot': gB}
+
+
+
+
+def gridLine(breaks, sizes):
+    """
+    Node coordinates along a line partitioned at breaks and seeded by size in each segment.
+    A segment seeded with a pair of sizes is graded geometrically from the first size at its start to the second at its end, with the number of elements of a seed size growing linearly along the segment (as abaqus seedEdgeByBias with minSize and maxSize).
+
+    :param breaks: sorted partition coordinates including both ends
+    :type breaks: list
+
+    :param sizes: seed size or (start size, end size) for each segment
+    :type sizes: list
+
+    :return line: node coordinates
+    :type line: numpy array
+    """
+    line = [np.array([breaks[0]], dtype=float)]
+    for i in range(len(breaks)-1):
+        length = breaks[i+1] - breaks[i]
+        if isinstance(sizes[i], (list, tuple)) and abs(sizes[i][1] - sizes[i][0]) > 1e-9*max(sizes[i]):
+            a, b = [float(x) for x in sizes[i]]
+            n = max(int(np.ceil(length*np.log(b/a)/(b - a) - 1e-6)), 1)
+            steps = (b/a)**(np.arange(n)/float(max(n-1, 1)))
+            line.append(breaks[i] + length*np.cumsum(steps)/steps.sum())
+            continue
+        size = max(sizes[i]) if isinstance(sizes[i], (list, tuple)) else sizes[i]
+        n = max(int(np.ceil(length/size - 1e-6)), 1)
+        line.append(np.linspace(breaks[i], breaks[i+1], n+1)[1:])
+    return np.concatenate(line)
+
+
+
+
+def gradedSeed(geom, axis, lo, hi):
+    """
+    Seed sizes at the ends of the segment [lo, hi] of a part with graded seeding (geom.biasRatio > 1). Used by partAxes and rectPart.geometry.generate.
+
+    Along the length (axis 0), the cracked region keeps geom.crackMesh and the band of length geom.biasBand ahead of the crack tip keeps geom.meshSeed[0].
+    From the end of the band, the seed grows linearly to geom.biasRatio times meshSeed[0] at the end of the part.
+    Through the thickness (axis 2), the seed grows linearly from geom.meshSeed[2] at the interface (geom.interface, 'Bot' or 'Top' face) to biasRatio times meshSeed[2] at the opposite face, at most half the thickness so that the bending of the substrate is resolved by two elements or more.
+    Cohesive parts ('AbqMatLib') keep a single element.
+
+    :param geom: part geometry
+    :type geom: partGeometry or rectPart.geometry
+
+    :param axis: 0 for the length or 2 for the thickness
+    :type axis: int
+
+    :return sizes: seed sizes at lo and hi
+    :type sizes: tuple
+    """
+    l, b, h = [float(x) for x in geom.dim]
+    ratio = float(geom.biasRatio)
+    if axis == 0:
+        cr = float(geom.crack) if geom.type != 'UnPart' else 0.0
+        if cr != 0 and max(lo, hi) <= cr*(1 + 1e-9):
+            return (geom.crackMesh, geom.crackMesh)
+        band = min(cr + geom.biasBand, l)
+        size = float(geom.meshSeed[0])
+        def seed(x):
+            if x <= band or band >= l:
+                return size
+            return size*(1 + (ratio - 1)*(x - band)/(l - band))
+    else:
+        size = float(geom.meshSeed[2])
+        if geom.matType == 'AbqMatLib':
+            return (size, size)
+        coarse = max(min(ratio*size, 0.5*h), size)
+        def seed(z):
+            d = z if geom.interface == 'Bot' else h - z
+            return size + (coarse - size)*d/h
+    return (seed(lo), seed(hi))
+
+
+
+
+def _breaks(points, start, stop):
+    points = sorted(set([float(p) for p in points if start < p < stop] + [start, stop]))
+    return points
+
+
+
+
+def partAxes(geom):
+    """
+    Node coordinates along the 3 directions of the structured mesh of a part, partitioned as in the corresponding rectPart function.
+
+    :param geom: part geometry
+    :type geom: partGeometry
+
+    :return x, y, z: node coordinates along the length, width and thickness. y is [0] for 2D parts.
+    :type x, y, z: numpy array
+    """
+    l, b, h = [float(x) for x in geom.dim]
+    cr = float(geom.crack)
+    p1 = geom.loadE1
+    p2 = geom.loadE2
+    LoadLen = l - p1
+
+    # Partitions
+    xPoints = []
+    zPoints = []
+    if geom.type != 'UnPart':
+        xPoints.append(cr)
+    if geom.type == 'CrackPart' and 0 < geom.TabPosition < 1:
+        zPoints.append(geom.TabPosition*h)
+    if geom.type in ['EnfTop', 'SlbTop', 'EnfBot', 'SlbBot']:
+        xPoints.append(LoadLen)
+    if geom.type in ['SlbTop', 'EnfBot']:
+        xPoints.append(p2)
+    graded = geom.biasRatio > 1
+    if graded and geom.biasBand > 0:
+        xPoints.append((cr if geom.type != 'UnPart' else 0.0) + geom.biasBand)
+    xBreaks = _breaks(xPoints, 0.0, l)
+    zBreaks = _breaks(zPoints, 0.0, h)
+    xSizes = []
+    for i in range(len(xBreaks)-1):
+        if graded:
+            xSizes.append(gradedSeed(geom, 0, xBreaks[i], xBreaks[i+1]))
+        elif geom.type != 'UnPart' and cr != 0 and xBreaks[i+1] <= cr:
+            xSizes.append(geom.crackMesh)
+        else:
+            xSizes.append(geom.meshSeed[0])
+    x = gridLine(xBreaks, xSizes)
+    y = gridLine([0.0, b], [geom.meshSeed[1]]) if geom.dimension != '2D' else np.zeros(1)
+    if graded:
+        zSizes = [gradedSeed(geom, 2, zBreaks[i], zBreaks[i+1]) for i in range(len(zBreaks)-1)]
+    else:
+        zSizes = [geom.meshSeed[2]]*(len(zBreaks)-1)
+    z = gridLine(zBreaks, zSizes)
+    return x, y, z
+
+
+
+
+def partMesh(geom):
+    """
+    Structured hexahedral mesh of a part with the partitions, sets and surfaces created by the corresponding rectPart function.
+    2D parts (geom.dimension == '2D') are meshed with quadrilaterals in the length-thickness plane, the thickness being the second coordinate, and the edges of the 3D part become nodes and the faces become element edges.
+
+    :param geom: part geometry
+    :type geom: partGeometry
+
+    :return mesh: dictionary with
+
+        :'nodes' (array (n, 3) or (n, 2)): node coordinates, node labels start at 1
+
+        :'elements' (array (m, 8) or (m, 4)): element connectivity (node labels) with the bottom nodes first, counterclockwise in 2D, element labels start at 1
+
+        :'shape' (tuple): number of elements along the 3 directions (1 along the width in 2D)
+
+        :'nsets' (dict): node labels of named regions
+
+        :'surfaces' (dict): (element labels, face label) of named face regions
+
+    :type mesh: dict
+    """
+    l, b, h = [float(x) for x in geom.dim]
+    cr = float(geom.crack)
+    p2 = geom.loadE2
+    LoadLen = l - geom.loadE1
+    x, y, z = partAxes(geom)
+    nx, ny, nz = len(x), len(y), len(z)
+
+    # Nodes ordered with x varying fastest
+    Z, Y, X = np.meshgrid(z, y, x, indexing='ij')
+    label = np.arange(1, nx*ny*nz+1).reshape(nz, ny, nx)
+
+    if ny == 1:
+        nodes = np.column_stack([X.ravel(), Z.ravel()])
+        n1 = label[:-1, :, :-1]
+        n2 = label[:-1, :, 1:]
+        n3 = label[1:, :, 1:]
+        n4 = label[1:, :, :-1]
+        elements = np.column_stack([n.ravel() for n in [n1, n2, n3, n4]])
+        shape = (nx-1, 1, nz-1)
+        topFace = 'S3'
+    else:
+        nodes = np.column_stack([X.ravel(), Y.ravel(), Z.ravel()])
+        # Elements with bottom face (z-) nodes first
+        n1 = label[:-1, :-1, :-1]
+        n2 = label[:-1, :-1, 1:]
+        n3 = label[:-1, 1:, 1:]
+        n4 = label[:-1, 1:, :-1]
+        n5 = label[1:, :-1, :-1]
+        n6 = label[1:, :-1, 1:]
+        n7 = label[1:, 1:, 1:]
+        n8 = label[1:, 1:, :-1]
+        elements = np.column_stack([n.ravel() for n in [n1, n2, n3, n4, n5, n6, n7, n8]])
+        shape = (nx-1, ny-1, nz-1)
+        topFace = 'S2'
+    elemLabel = np.arange(1, elements.shape[0]+1).reshape(shape[2], shape[1], shape[0])
+    xMid = 0.5*(x[:-1] + x[1:])
+
+    tol = 1e-6*max(l, b, h)
+    def near(a, value):
+        return np.abs(a - value) < tol
+    def edge(xValue, zValue):
+        return label[near(z, zValue)][:, :, near(x, xValue)].ravel()
+    def face(zIndex, xMin, xMax):
+        nodeSel = label[zIndex][:, (x > xMin - tol) & (x < xMax + tol)].ravel()
+        elemIndex = 0 if zIndex == 0 else -1
+        elemSel = elemLabel[elemIndex][:, (xMid > xMin) & (xMid < xMax)].ravel()
+        return nodeSel, elemSel
+
+    nsets = {}
+    surfaces = {}
+    def addFace(name, zIndex, xMin, xMax):
+        nodeSel, elemSel = face(zIndex, xMin, xMax)
+        nsets[name] = nodeSel
+        surfaces[name] = (elemSel, 'S1' if zIndex == 0 else topFace)
+
+    nsets['FullGeom'] = label.ravel()
+    if geom.type == 'UnPart':
+        addFace('Top', -1, 0, l)
+        addFace('Bot', 0, 0, l)
+        nsets['Front'] = edge(l, h)
+        nsets['Back'] = edge(0, h)
+    elif geom.type == 'CrackPart':
+        addFace('Top', -1, cr, l)
+        addFace('Bot', 0, cr, l)
+        nsets['Front'] = edge(0, h*geom.TabPosition)
+        nsets['Back'] = nsets['Front']
+    elif geom.type == 'EnfTop':
+        addFace('Top', -1, cr, l)
+        addFace('Bot', 0, cr, l)
+        addFace('Contact', 0, 0, cr)
+        nsets['LoadEnd'] = edge(LoadLen, h)
+    elif geom.type == 'SlbTop':
+        addFace('Top', -1, cr, l)
+        addFace('Bot', 0, cr, l)
+        nsets['LoadEnd1'] = edge(LoadLen, h)
+        nsets['LoadEnd2'] = edge(p2, 0)
+    elif geom.type == 'EnfBot':
+        addFace('Top', -1, cr, l)
+        addFace('Bot', 0, cr, l)
+        addFace('Contact', -1, 0, cr)
+        nsets['LoadEnd1'] = edge(LoadLen, 0)
+        nsets['LoadEnd2'] = edge(p2, 0)
+    elif geom.type == 'SlbBot':
+        addFace('Top', -1, cr, l)
+        addFace('Bot', 0, cr, l)
+        nsets['LoadEnd'] = edge(LoadLen, 0)
+    return {'nodes': nodes, 'elements': elements, 'shape': shape, 'nsets': nsets, 'surfaces': surfaces}
+
+
+
+
+def meshSize(Model):
+    """
+    Number of elements and nodes of the mesh generated by withBulkInp, without generating it.
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :return size: dictionary with (elements, nodes) for 'Top', 'Cz' and 'Bot' and the totals 'elements', 'nodes' and 'dofs' (3 displacement degrees of freedom per node, 2 in 2D)
+    :type size: dict
+    """
+    size = {'elements': 0, 'nodes': 0}
+    for key, geom in modelGeometries(Model).items():
+        x, y, z = partAxes(geom)
+        nodes = len(x)*len(y)*len(z)
+        elements = (len(x)-1)*max(len(y)-1, 1)*(len(z)-1)
+        size[key] = (elements, nodes)
+        size['elements'] += elements
+        size['nodes'] += nodes
+    size['dofs'] = (2 if Model.dimension == '2D' else 3)*size['nodes']
+    return size
+
+
+
+
+def _labels(file, labels):
+    labels = np.asarray(labels, dtype=int)
+    for i in range(0, len(labels), 16):
+        file.write(', '.join([str(x) for x in labels[i:i+16]]) + '\n')
+
+
+
+
+def _values(file, values):
+    values = [str(x) for x in values]
+    for i in range(0, len(values), 8):
+        file.write(', '.join(values[i:i+8]) + '\n')
+
+
+
+
+def _elementType(geom, Model):
+    # Element keyword of the part, with the user element definition and properties of user subroutine cohesive zones
+    Plane = geom.dimension == '2D'
+    element = {'definition': '', 'property': '', 'order': None}
+    if geom.matType == 'AbqMatLib' and Model.matTypeCz != 'AbqMatLib':
+        CzMat = [str(x) for x in Model.matPropCz]
+        if Plane:
+            # Top nodes in the order of the bottom nodes as for the 3D user element
+            element['order'] = [0, 1, 3, 2]
+            # Specimen width as out-of-plane thickness after the properties, and the nlgeom flag of the step as integer property (THICK and NLGEOM of ut-v4-r2)
+            CzMat = CzMat + [str(geom.dim[1])]
+            element['definition'] = '*USER ELEMENT, NODES=4, Type= U1, PROPERTIES=' + str(len(CzMat)) + ', I PROPERTIES=1, COORDINATES=2,\n VARIABLES=21\n 1, 2\n'
+            element['property'] = '*UEL PROPERTY, elset=FullGeom\n ' + ','.join(CzMat) + '\n 1\n'
+        else:
+            element['definition'] = '*USER ELEMENT, NODES=8, Type= U1, PROPERTIES=' + str(len(CzMat)) + ', COORDINATES=3,\n VARIABLES=21\n 1, 2, 3\n'
+            element['property'] = '*UEL PROPERTY, elset=FullGeom\n ' + ','.join(CzMat) + '\n'
+        element['keyword'] = '*ELEMENT, TYPE=U1, elset=FullGeom\n'
+    elif geom.matType == 'AbqMatLib':
+        element['keyword'] = '*Element, type=' + ('COH2D4' if Plane else 'COH3D8') + '\n'
+    elif Plane:
+        element['keyword'] = '*Element, type=' + ('CPS4' if geom.planeType == 'Stress' else 'CPE4') + '\n'
+    else:
+        element['keyword'] = '*Element, type=C3D8\n'
+    return element
+
+
+
+
+def _writeNodes(file, mesh):
+    file.write('*Node\n')
+    nodes = mesh['nodes']
+    np.savetxt(file, np.column_stack([np.arange(1, nodes.shape[0]+1), nodes]), fmt='%d' + ', %.10g'*nodes.shape[1])
+
+
+
+
+def _writeElements(file, mesh, element):
+    elements = mesh['elements']
+    if element['order'] is not None:
+        elements = elements[:, element['order']]
+    file.write(element['keyword'])
+    np.savetxt(file, np.column_stack([np.arange(1, elements.shape[0]+1), elements]), fmt='%d')
+    for key in mesh['nsets']:
+        file.write('*Nset, nset=' + key + '\n')
+        _labels(file, mesh['nsets'][key])
+    file.write('*Elset, elset=FullGeom, generate\n')
+    file.write('1, ' + str(elements.shape[0]) + ', 1\n')
+    for key in mesh['surfaces']:
+        elems, side = mesh['surfaces'][key]
+        file.write('*Elset, elset=_' + key + '_' + side + ', internal\n')
+        _labels(file, elems)
+        file.write('*Surface, type=ELEMENT, name=' + key + '\n')
+        file.write('_' + key + '_' + side + ', ' + side + '\n')
+
+
+
+
+def _writeSection(file, name, geom, Model):
+    # Section, 2D sections have the specimen width as out-of-plane thickness so that forces are those of the full specimen
+    Width = str(geom.dim[1]) if geom.dimension == '2D' else ''
+    if geom.matType == 'AbqMatLib':
+        if Model.matTypeCz == 'AbqMatLib':
+            file.write('*Cohesive Section, elset=FullGeom, material=' + name + 'Mat, response=TRACTION SEPARATION, thickness=GEOMETRY\n')
+            file.write(',' + Width + '\n')
+    else:
+        file.write('*Solid Section, elset=FullGeom, material=' + name + 'Mat\n')
+        file.write(Width + ',\n')
+
+
+
+
+def _writePart(file, name, geom, mesh, Model):
+    element = _elementType(geom, Model)
+    file.write('*Part, name=' + name + '\n')
+    _writeNodes(file, mesh)
+    file.write(element['definition'] + element['property'])
+    _writeElements(file, mesh, element)
+    _writeSection(file, name, geom, Model)
+    file.write('*End Part\n')
+
+
+
+
+def meshInclude(geom, Model, meshDir):
+    """
+    Mesh include file of a part, '<meshDir>/Mesh-<key>.inp', with the nodes, elements, sets and surfaces of the part.
+    The key is the hash of everything the mesh depends on, the part geometry and the element type, so parts with the same mesh share the file regardless of their material properties.
+    The file is only meshed and written when it does not exist yet.
+
+    :param geom: part geometry
+    :type geom: partGeometry
+
+    :param Model: testModel instance, for the cohesive zone formulation
+    :type Model: object
+
+    :param meshDir: directory of the mesh include files
+    :type meshDir: str
+
+    :return path: include file path
+    :type path: str
+    """
+    element = _elementType(geom, Model)
+    attributes = dict((k, v) for k, v in geom.__dict__.items() if k not in ['matType', 'matProp'])
+    attributes['cohesive'] = geom.matType == 'AbqMatLib'
+    attributes['keyword'] = element['keyword']
+    attributes['order'] = element['order']
+    canonical = json.dumps(attributes, sort_keys=True, separators=(',', ':'))
+    path = os.path.join(meshDir, 'Mesh-' + hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:20] + '.inp')
+    if os.path.exists(path):
+        return path
+    if not os.path.isdir(meshDir):
+        try:
+            os.makedirs(meshDir)
+        except OSError:
+            pass # created by a concurrent run
+    mesh = partMesh(geom)
+    # Written under a temporary name so that concurrent runs never include a partial file
+    tmp = path + '.' + str(os.getpid())
+    with open(tmp, 'w') as file:
+        _writeNodes(file, mesh)
+        _writeElements(file, mesh, element)
+    try:
+        os.rename(tmp, path)
+    except OSError:
+        os.remove(tmp) # written by a concurrent run
+    return path
+
+
+
+
+def _includePart(file, name, geom, Model, meshDir):
+    element = _elementType(geom, Model)
+    file.write('*Part, name=' + name + '\n')
+    file.write(element['definition'])
+    file.write('*Include, input=' + meshInclude(geom, Model, meshDir) + '\n')
+    file.write(element['property'])
+    _writeSection(file, name, geom, Model)
+    file.write('*End Part\n')
+
+
+
+
+def _writeMaterial(file, name, geom):
+    Prop = geom.matProp
+    file.write('*Material, name=' + name + 'Mat\n')
+    if geom.matType == 'Iso':
+        file.write('*Elastic\n')
+        _values(file, Prop)
+    elif geom.matType == 'AnIso':
+        file.write('*Elastic, type=ENGINEERING CONSTANTS\n')
+        _values(file, Prop)
+    elif geom.matType == 'AbqMatLib':
+        file.write('*Damage Initiation, criterion=QUADS\n')
+        _values(file, [Prop[1], Prop[2], Prop[2]])
+        file.write('*Damage Evolution, type=ENERGY, mixed mode behavior=BK, power=' + str(Prop[5]) + '\n')
+        _values(file, [Prop[3], Prop[4], Prop[4]])
+        file.write('*Elastic, type=TRACTION\n')
+        _values(file, [Prop[0], Prop[0], Prop[0]])
+
+
+
+
+def loadCase(Model):
+    """
+    Load and support regions, reference points and boundary conditions as defined in models.withBulk.
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :return case: dictionary with
+
+        :'FixedEnd', 'LoadEnd' (list): (instance, part set) pairs forming the support and load regions
+
+        :'FixedPoint', 'LoadPoint' (list): reference point coordinates
+
+        :'BLoadCase', 'TLoadCase' (list): displacements of the fixed and load points
+
+        :'u_con' (list): True if the rotation about the axis is fixed
+
+    :type case: dict
+    """
+    top = Model.thickBot + Model.thickTop + Model.thickCz
+    mid = [Model.lenTop*0.5, Model.width*0.5]
+    case = {'FixedPoint': mid + [0], 'LoadPoint': mid + [top], 'u_con': [True, True, True]}
+    if Model.type in ['DCB', 'ADCB']:
+        case['TLoadCase'] = list(Model.BC)
+        case['BLoadCase'] = [-x for x in Model.BC]
+        case['u_con'] = [True, False, True]
+        case['FixedEnd'] = [('pBot', 'Back')]
+        case['LoadEnd'] = [('pTop', 'Front')]
+        case['FixedPoint'] = [0, 0, 0]
+        case['LoadPoint'] = [0, 0, top]
+    elif Model.type == 'ENF':
+        case['TLoadCase'] = [-x for x in Model.BC]
+        case['BLoadCase'] = [0 for x in Model.BC]
+        case['FixedEnd'] = [('pBot', 'LoadEnd1'), ('pBot', 'LoadEnd2')]
+        case['LoadEnd'] = [('pTop', 'LoadEnd')]
+    elif Model.type in ['SLB', 'ASLB']:
+        case['TLoadCase'] = [-x for x in Model.BC]
+        case['BLoadCase'] = [0 for x in Model.BC]
+        case['FixedEnd'] = [('pTop', 'LoadEnd2'), ('pBot', 'LoadEnd')]
+        case['LoadEnd'] = [('pTop', 'LoadEnd1')]
+    elif Model.type == 'NonStdUM':
+        case['TLoadCase'] = list(Model.BC)
+        case['BLoadCase'] = [0 for x in Model.BC]
+        case['FixedEnd'] = [('pBot', 'Bot')]
+        case['LoadEnd'] = [('pTop', 'Top')]
+    elif Model.type == 'NonStdNM':
+        case['TLoadCase'] = list(Model.BC)
+        case['BLoadCase'] = [0 for x in Model.BC]
+        case['FixedEnd'] = [('pBot', 'Bot'), ('pTop', 'Back')]
+        case['LoadEnd'] = [('pTop', 'Front')]
+    return case
+
+
+
+
+def withBulkInp(Model, path=''):
+    """
+    :For use with: CZ environment
+
+    Writes the input file of the model with substrates and a cohesive zone as generated by models.withBulk without using abaqus cae.
+    For user subroutines (Model.matTypeCz != 'AbqMatLib') the cohesive elements are written directly as user elements, equivalent to uelAssign.ReDefCE.
+
+    With Model.dimension == '2D' the model is written in the length-thickness plane with plane strain or plane stress elements (Model.planeType) and 'COH2D4' cohesive elements, or 4 node user elements with 2 coordinates.
+    The sections have the width as out-of-plane thickness, so the reaction forces are those of the full specimen.
+    2D user elements get the width appended to Model.matPropCz as last real property and the integer property 1 (nlgeom), the property layout of ut-v4-r2.for with Model.matPropCz = [GIC, GIIC, T1, T2, PEN, ETA]. Displacements Model.BC[0] and Model.BC[2] are applied along the first and second coordinate.
+
+    With Model.symmetry the model spans half the width, with symmetry conditions (YSYMM) on the nodes of the mid-width plane (node set 'Symmetry').
+    Nodes of the load and support couplings are left out of the set, the couplings already tie them to the reference points on the mid-width plane.
+
+    With Model.meshInclude, the nodes, elements, sets and surfaces of each part are read with '*Include' from the files of meshInclude in that directory, so runs differing only in materials, cohesive zone properties or loading share the meshes.
+    The per run input file then holds the part sections, materials, assembly, boundary conditions and output requests, and the parts are only meshed when their include file does not exist yet.
+    User subroutine cohesive zones have a different element type than the cohesive elements of 'AbqMatLib', so the two share the substrate meshes but not the cohesive zone mesh.
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :param path: input file path. Defaults to '<Model.name>.inp'
+    :type path: str
+
+    :return path: input file path
+    :type path: str
+    """
+    if path == '':
+        path = Model.name + '.inp'
+    if Model.symmetry and (Model.dimension == '2D' or Model.BC[1] != 0):
+        raise ValueError('Width symmetry requires a 3D model loaded in the length-thickness plane (BC[1] = 0)')
+    geometries = modelGeometries(Model)
+    # Meshes of parts written to shared include files (Model.meshInclude) are generated by meshInclude when needed, half width models need them for the symmetry set
+    Include = Model.meshInclude
+    meshes = {} if Include and not Model.symmetry else dict((key, partMesh(geometries[key])) for key in geometries)
+    case = loadCase(Model)
+    instances = {'pTop': ('Top', [0.0, 0.0, Model.thickBot+Model.thickCz]),
+        'ceInst': ('Cz', [Model.crack, 0.0, Model.thickBot]),
+        'pBot': ('Bot', [Model.lenTop - Model.lenBot, 0.0, 0.0])}
+    # Coordinates and degrees of freedom of the 3D model kept in 2D (length, thickness and rotation about the width)
+    if Model.dimension == '2D':
+        Axes, Dofs, Rotations = [0, 2], [1, 2], [(1, 6)]
+    else:
+        Axes, Dofs, Rotations = [0, 1, 2], [1, 2, 3], [(0, 4), (1, 5), (2, 6)]
+
+    with open(path, 'w') as file:
+        file.write('*Heading\n')
+        file.write('** Job name: ' + Model.name + ' Model name: Model-1\n')
+        file.write('** Generated by: czmtestkit.preprocessors.inpDeck\n')
+        file.write('*Preprint, echo=NO, model=NO, history=NO, contact=NO\n')
+        # Parts
+        for name in ['Cz', 'Top', 'Bot']:
+            if Include:
+                _includePart(file, name, geometries[name], Model, Include)
+            else:
+                _writePart(file, name, geometries[name], meshes[name], Model)
+        # Assembly
+        file.write('*Assembly, name=Assembly\n')
+        for inst in ['ceInst', 'pTop', 'pBot']:
+            part, shift = instances[inst]
+            file.write('*Instance, name=' + inst + ', part=' + part + '\n')
+            if any(shift):
+                _values(file, [shift[i] for i in Axes])
+            file.write('*End Instance\n')
+        ## Reference points
+        file.write('*Node\n')
+        _values(file, [1] + [case['LoadPoint'][i] for i in Axes])
+        file.write('*Node\n')
+        _values(file, [2] + [case['FixedPoint'][i] for i in Axes])
+        file.write('*Nset, nset=LoadPoint\n1,\n')
+        file.write('*Nset, nset=FixedPoint\n2,\n')
+        ## Load and support regions
+        for region in ['FixedEnd', 'LoadEnd']:
+            for inst, key in case[region]:
+                part = instances[inst][0]
+                file.write('*Nset, nset=' + region + ', instance=' + inst + '\n')
+                if Include:
+                    file.write(key + '\n')
+                else:
+                    _labels(file, meshes[part]['nsets'][key])
+            file.write('*Surface, type=NODE, name=' + region + '_CNS_, internal\n')
+            file.write(region + ', 1.\n')
+        ## Mid-width symmetry plane, without the nodes of the load and support couplings, which already follow the reference points
+        if Model.symmetry:
+            for inst in ['ceInst', 'pTop', 'pBot']:
+                part = instances[inst][0]
+                nodes = meshes[part]['nodes']
+                labels = np.nonzero(np.abs(nodes[:, 1] - geometries[part].dim[1]) < 1e-6*Model.width)[0] + 1
+                coupled = [meshes[part]['nsets'][key] for i, key in case['FixedEnd'] + case['LoadEnd'] if i == inst]
+                if coupled:
+                    labels = np.setdiff1d(labels, np.concatenate(coupled))
+                file.write('*Nset, nset=Symmetry, instance=' + inst + '\n')
+                _labels(file, labels)
+        ## Tie constraints for the cohesive surfaces
+        file.write('*Tie, name=Constraint-1, adjust=no, no rotation, type=NODE TO SURFACE\n')
+        file.write('pTop.Bot, ceInst.Top\n')
+        file.write('*Tie, name=Constraint-2, adjust=no, no rotation, type=NODE TO SURFACE\n')
+        file.write('pBot.Top, ceInst.Bot\n')
+        ## Coupling
+        file.write('*Coupling, constraint name=Constraint-11, ref node=FixedPoint, surface=FixedEnd_CNS_\n')
+        file.write('*Kinematic\n')
+        file.write('*Coupling, constraint name=Constraint-12, ref node=LoadPoint, surface=LoadEnd_CNS_\n')
+        file.write('*Kinematic\n')
+        file.write('*End Assembly\n')
+        # Materials
+        for name in ['Cz', 'Top', 'Bot']:
+            if name != 'Cz' or Model.matTypeCz == 'AbqMatLib':
+                _writeMaterial(file, name, geometries[name])
+        ## Symmetry boundary condition
+        if Model.symmetry:
+            file.write('*Boundary\n')
+            file.write('Symmetry, YSYMM\n')
+        ## Hard contact
+        if Model.type == 'ENF':
+            file.write('*Surface Interaction, name=HardContact\n')
+            file.write('1.,\n')
+            file.write('*Surface Behavior, pressure-overclosure=HARD\n')
+            file.write('*Contact Pair, interaction=HardContact, type=SURFACE TO SURFACE\n')
+            file.write('pTop.Contact, pBot.Contact\n')
+        # Step
+        file.write('*Step, name=Step-1, nlgeom=YES, inc=1000000000\n')
+        file.write('*Static\n')
+        _values(file, [Model.stepTime*Model.initialInc, Model.stepTime, 1e-25, Model.stepTime*Model.maxInc])
+        file.write('*Controls, parameters=time incrementation\n')
+        file.write('4, 8, 9, 16, 10, 4, 12, 25, 6, 3, 50\n')
+        # Boundary conditions
+        for name, point, values in [('BC-1', 'FixedPoint', case['BLoadCase']), ('BC-2', 'LoadPoint', case['TLoadCase'])]:
+            file.write('** Name: ' + name + ' Type: Displacement/Rotation\n')
+            file.write('*Boundary\n')
+            for i, dof in zip(Axes, Dofs):
+                file.write(point + ', ' + str(dof) + ', ' + str(dof) + ', ' + str(values[i]) + '\n')
+            for i, dof in Rotations:
+                if case['u_con'][i]:
+                    file.write(point + ', ' + str(dof) + ', ' + str(dof) + '\n')
+        # Output requests
+        file.write('*Output, field, frequency=10\n')
+        file.write('*Node Output\n')
+        file.write('RF, U\n')
+        file.write('*Element Output, directions=YES\n')
+        file.write('S,\n')
+        file.write('*Output, history, time interval=' + str(Model.stepTime*Model.outputInterval) + '\n')
+        file.write('*Node Output, nset=LoadPoint\n')
+        file.write('RT, UT\n')
+        # Load point output every increment for the job monitor
+        if Model.stopLoadFraction or Model.stopDisplacement or Model.wallTime:
+            file.write(nodePrint + '\n')
+        file.write('*End Step\n')
+    return path
@@ -0,0 +1,110 @@
+"""
+    czmtestkit.preprocessors.meshPlan
+    =================================
+    :For use with: CZ environment
+
+    Mesh seeding from the length of the cohesive process zone.
+    The process zone length is estimated with the Hillerborg type estimate for infinite bodies and the estimates for slender bodies (Harper and Hallett, 2008)::
+
+        infinite body           lcz = M E Gc/t0^2
+        slender body, mode-1    lcz = M (E Gc/t0^2)^(1/4) h^(3/4)
+        slender body, mode-2    lcz = M (E Gc/t0^2)^(1/2) h^(1/2)
+
+    with the interface strength t0 and toughness Gc of the mode, the substrate thickness h and the modulus E of the substrate, through the thickness (E3) for the infinite body and along the length (E1) for the slender body.
+    The zone length is the smallest estimate over the substrates and the modes loading the specimen (mode-1 for 'DCB' and 'ADCB', mode-2 for 'ENF', both otherwise).
+    The seed along the length then resolves the zone with a number of elements, at least 3 as recommended by Turon et al. (2007).
+    The interface properties are read from Model.matPropCz in the layout of the cohesive zone definition (propIndex), other layouts are rejected.
+
+"""
+import os
+from ..analytical.loading import _engineeringConstants
+from .inpDeck import meshSize
+
+
+
+
+# Modes loading the interface by model type
+modes = {'DCB': [1], 'ADCB': [1], 'ENF': [2]}
+
+# Indices of the penalty stiffness, normal strength, shear strength, mode-1 and mode-2 toughness in Model.matPropCz by user subroutine ('AbqMatLib' for the abaqus material library)
+propIndex = {'AbqMatLib': [0, 1, 2, 3, 4], 'IDF': [0, 1, 2, 3, 4], 'IDF_3D': [0, 1, 2, 3, 4], 'FDF': [0, 1, 2, 3, 4],
+    'FDF_3D': [0, 1, 2, 3, 4], 'FDF_Imp': [0, 1, 2, 3, 4], 'ut-v4-r2': [4, 2, 3, 0, 1], 'udgcoh-uek-17': [4, 2, 3, 0, 1]}
+
+
+
+
+def zoneLength(Model, M=1.0):
+    """
+    Estimated length of the cohesive process zone.
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :param M: parameter of the estimates (1 for Hillerborg, 0.88 for Rice, 0.4 for Dugdale)
+    :type M: float
+
+    :return zone: 'mode1' and 'mode2', smallest estimate of each mode over the substrates and the slender and infinite body estimates, and 'length', smallest of the modes loading Model.type
+    :type zone: dict
+
+    :raises ValueError: if the property layout of Model.matTypeCz is unknown
+    """
+    if Model.matTypeCz == 'AbqMatLib':
+        Name = 'AbqMatLib'
+    elif Model.dimension == '2D':
+        # 2D user elements are written with the property layout of ut-v4-r2 (see inpDeck.withBulkInp)
+        Name = 'ut-v4-r2'
+    else:
+        Name = os.path.splitext(os.path.basename(Model.matTypeCz))[0]
+    if Name not in propIndex:
+        raise ValueError('Unknown property layout of the cohesive zone ' + Model.matTypeCz)
+    K, tN, tS, GI, GII = [float(Model.matPropCz[k]) for k in propIndex[Name]]
+    zone = {}
+    for mode, t0, Gc in [(1, tN, GI), (2, tS, GII)]:
+        lengths = []
+        for Prop, h in [(Model.matPropTop, Model.thickTop), (Model.matPropBot, Model.thickBot)]:
+            E = _engineeringConstants(Prop)
+            lengths.append(M*E[2]*Gc/t0**2)
+            if mode == 1:
+                lengths.append(M*(E[0]*Gc/t0**2)**0.25*h**0.75)
+            else:
+                lengths.append(M*(E[0]*Gc/t0**2)**0.5*h**0.5)
+        zone['mode'+str(mode)] = min(lengths)
+    zone['length'] = min([zone['mode'+str(k)] for k in modes.get(Model.type, [1, 2])])
+    return zone
+
+
+
+
+def planMesh(Model, nZone=3, M=1.0):
+    """
+    Sets the seed along the length, Model.meshSeed[0], to the coarsest seed with nZone elements in the process zone and reports the resulting mesh size.
+    Model.crackSeed is raised to the same seed if it was finer, the seeds along the width and thickness are kept.
+
+    Usage::
+
+        t.type = 'DCB'
+        ...
+        plan = pPy.planMesh(t, nZone=5)
+        print(plan['elements'], plan['dofs'])
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :param nZone: number of elements in the process zone
+    :type nZone: int
+
+    :param M: parameter of the zone length estimates (see zoneLength)
+    :type M: float
+
+    :return plan: zoneLength results with the additional keys 'seed', and 'elements', 'nodes' and 'dofs' of the mesh generated by withBulkInp (see inpDeck.meshSize)
+    :type plan: dict
+    """
+    plan = zoneLength(Model, M)
+    seed = plan['length']/nZone
+    Model.meshSeed = [seed] + list(Model.meshSeed[1:])
+    Model.crackSeed = max(Model.crackSeed, seed)
+    plan['seed'] = seed
+    size = meshSize(Model)
+    for key in ['elements', 'nodes', 'dofs']:
+        plan[key] = size[key]
+    return plan
@@ -4,6 +4,7 @@ from abaqus import *
 from abaqusConstants import *
 # Importing packages functions
 from .rectPart import geometry
+from ..monitor import nodePrint, jobMonitor
 
 
 def withBulk(Model):
@@ -27,40 +28,54 @@ def withBulk(Model):
 
 	# Importing module function
 	from .uelAssign import ReDefCE
+
+	# 2D models and models with shared mesh include files are written by the input deck writer and run from the input file
+	if Model.dimension == '2D' or Model.meshInclude:
+		runDeck(Model)
+		return
+	if Model.symmetry and Model.BC[1] != 0:
+		raise ValueError('Width symmetry requires a model loaded in the length-thickness plane (BC[1] = 0)')
 		
 	# Assigning a model
 	m = mdb.models['Model-1']
+	## Half width models with symmetry about the mid-width plane
+	Width = Model.width*0.5 if Model.symmetry else Model.width
 
 	# Generating geometries
 	## Defining top substrate
 	gT = geometry()
-	gT.dim = [Model.lenTop, Model.width, Model.thickTop]
+	gT.dim = [Model.lenTop, Width, Model.thickTop]
 	gT.type = 'UnPart'
 	gT.crack = Model.crack
 	gT.matType = Model.matTypeTop
 	gT.matProp = Model.matPropTop
 	gT.meshSeed = Model.meshSeed
 	gT.crackMesh = Model.crackSeed
+	gT.interface = 'Bot'
 		
 	## Defining bot substrate
 	gB = geometry()
-	gB.dim = [Model.lenBot, Model.width, Model.thickBot]
+	gB.dim = [Model.lenBot, Width, Model.thickBot]
 	gB.type = 'UnPart'
 	gB.crack = Model.crack - Model.lenTop + Model.lenBot
 	gB.matType = Model.matTypeBot
 	gB.matProp = Model.matPropBot
 	gB.meshSeed = Model.meshSeed
 	gB.crackMesh = Model.crackSeed
+	gB.interface = 'Top'
 		
 	## Defining cohesive zone
 	gC = geometry()
-	gC.dim = [Model.lenTop - Model.crack, Model.width, Model.thickCz]
+	gC.dim = [Model.lenTop - Model.crack, Width, Model.thickCz]
 	gC.type = 'UnPart'
 	gC.matType = 'AbqMatLib'
 	gC.matProp = Model.matPropCz
 	gC.meshSeed[0] = Model.meshSeed[0]
 	gC.meshSeed[1] = Model.meshSeed[1]
 	gC.meshSeed[2] = Model.thickCz
+	for g in [gT, gB, gC]:
+		g.biasRatio = Model.biasRatio
+		g.biasBand = Model.biasBand
 
 	if Model.type in ['DCB','ADCB']:
 		gT.TabPosition = Model.TabPosition
@@ -184,11 +199,19 @@ def withBulk(Model):
 	r = a.referencePoints
 	a.Set(referencePoints=(r[rf2Id], ), name='FixedPoint')
 	a.Set(referencePoints=(r[rf1Id], ), name='LoadPoint')
+	## Symmetry boundary condition on the nodes of the mid-width plane, without the nodes of the couplings which already follow the reference points
+	if Model.symmetry:
+		Box = {'xMin': -Model.lenTop - Model.lenBot, 'xMax': Model.lenTop + Model.lenBot, 'yMin': Width*0.999, 'yMax': Width*1.001,
+			'zMin': -Model.thickBot, 'zMax': 2*(Model.thickBot + Model.thickCz + Model.thickTop)}
+		Coupled = set([(Node.instanceName, Node.label) for Region in ['FixedEnd', 'LoadEnd'] for Node in a.sets[Region].nodes])
+		Nodes = [Inst.nodes.sequenceFromLabels([Node.label for Node in Inst.nodes.getByBoundingBox(**Box) if (Inst.name, Node.label) not in Coupled]) for Inst in [ic, iT, iB]]
+		a.Set(nodes=Nodes[0] + Nodes[1] + Nodes[2], name='Symmetry')
+		m.YsymmBC(name='Symmetry', createStepName='Initial', region=a.sets['Symmetry'], localCsys=None)
 
 	# Step
 	m.StaticStep(name='Step-1', previous='Initial', 
-		timePeriod=Model.stepTime, maxNumInc=1000000000, initialInc=Model.stepTime*0.001, minInc=1e-25, 
-		maxInc=Model.stepTime*0.01, nlgeom=ON)
+		timePeriod=Model.stepTime, maxNumInc=1000000000, initialInc=Model.stepTime*Model.initialInc, minInc=1e-25, 
+		maxInc=Model.stepTime*Model.maxInc, nlgeom=ON)
 	m.steps['Step-1'].control.setValues(allowPropagation=OFF, 
 		resetDefaultValues=OFF, timeIncrementation=(4.0, 8.0, 9.0, 16.0, 10.0, 4.0, 
 		12.0, 25.0, 6.0, 3.0, 50.0))
@@ -213,8 +236,14 @@ def withBulk(Model):
 
 	# Output request
 	m.historyOutputRequests['H-Output-1'].setValues(variables=(
-		'UT', 'RT'), region=a.sets['LoadPoint'], timeInterval=Model.stepTime*0.01, sectionPoints=DEFAULT, rebar=EXCLUDE)
+		'UT', 'RT'), region=a.sets['LoadPoint'], timeInterval=Model.stepTime*Model.outputInterval, sectionPoints=DEFAULT, rebar=EXCLUDE)
 	m.fieldOutputRequests['F-Output-1'].setValues( frequency=10, variables=('S', 'U', 'RF'))
+	## Load point output in the .dat file every increment for the job monitor
+	Monitored = Model.stopLoadFraction or Model.stopDisplacement or Model.wallTime
+	if Monitored:
+		m.keywordBlock.synchVersions(storeNodesAndElements=False)
+		EndStep = [i for i, b in enumerate(m.keywordBlock.sieBlocks) if b.strip().lower().startswith('*end step')][0]
+		m.keywordBlock.insert(EndStep-1, nodePrint)
     
 	# Job 
 	mdb.Job(name=Model.name, model='Model-1', description='', type=ANALYSIS, 
@@ -236,16 +265,108 @@ def withBulk(Model):
 	# Submitting the job
 	myJob.submit()
 
+	# Stopping the job early once a stop criterion is met
+	if Monitored:
+		jobMonitor.fromModel(Model).run()
+
 	# Waiting for completion
 	myJob.waitForCompletion()
 
 
 
 
+def runDeck(Model):
+	"""
+	:For use with: Abaqus cae environment    
+	Writes the input file with inpDeck.withBulkInp and runs it as a job from the input file, with the user subroutine Model.matTypeCz if any. Used by withBulk for 2D models and models with shared mesh include files (Model.meshInclude).
+
+	:param Model: testModel instance
+	:type Model: object
+	"""
+	import job
+	from .inpDeck import withBulkInp
+
+	withBulkInp(Model)
+	SubRout = Model.matTypeCz if Model.matTypeCz != 'AbqMatLib' else ''
+	myJob = mdb.JobFromInputFile(name=Model.name, inputFileName=Model.name+'.inp',
+		userSubroutine=SubRout, multiprocessingMode=DEFAULT,  
+		numCpus=Model.nCpu, numDomains=Model.nCpu, numGPUs=Model.nGpu)
+	myJob.submit()
+	if Model.stopLoadFraction or Model.stopDisplacement or Model.wallTime:
+		jobMonitor.fromModel(Model).run()
+	myJob.waitForCompletion()
+
+
+
+
+def _sinEleCase(Model, m, Case, BC, CzMat, Offset=0.0):
+	"""
+	:For use with: Abaqus cae environment    
+	Adds one cohesive zone without substrates to the model: part 'Cz<Case>', instance 'ceInst<Case>' translated by Offset along the length, load sets 'FixedEnd<Case>' and 'LoadEnd<Case>' and displacement boundary conditions 'BC-1<Case>' and 'BC-2<Case>' in 'Step-1'.
+
+	:param Model: testModel instance
+	:type Model: object
+
+	:param m: abaqus model
+	:type m: object
+
+	:param Case: suffix of the part, instance, set and boundary condition names
+	:type Case: str
+
+	:param BC: displacement of the load set [x, y, z]
+	:type BC: list
+
+	:param CzMat: material properties of the cohesive zone
+	:type CzMat: list
+
+	:param Offset: translation of the instance along the length
+	:type Offset: float
+	"""
+	## Defining cohesive zone
+	gC = geometry()
+	gC.dim = [Model.lenTop - Model.crack, Model.width, Model.thickCz]
+	gC.matType = 'AbqMatLib'
+	gC.matProp = CzMat
+	gC.meshSeed[0:1] = Model.meshSeed[0:1]
+	gC.meshSeed[2] = Model.thickCz
+	gC.generate(m, 'Cz'+Case)
+
+	## Generating part instance
+	a = m.rootAssembly
+	a.Instance(name='ceInst'+Case, part=m.parts['Cz'+Case], dependent=ON)
+	ic = a.instances['ceInst'+Case]
+	if Offset:
+		ic.translate(vector=(Offset, 0.0, 0.0))
+
+	# Assigning load sets and cases
+	TLoadCase = BC
+	BLoadCase = [0 for x in BC]
+	if Model.type == 'NonStdUM':
+		a.Set(faces=ic.sets['Bot'].faces, name='FixedEnd'+Case)
+		a.Set(faces=ic.sets['Top'].faces, name='LoadEnd'+Case)
+	elif Model.type == 'NonStdNM':
+		a.Set(faces=ic.sets['Bot'].faces, edges=ic.sets['Back'].edges, name='FixedEnd'+Case)
+		a.Set(edges=ic.sets['Front'].edges, name='LoadEnd'+Case)
+
+	# Boundary conditions
+	m.DisplacementBC(name='BC-1'+Case, createStepName='Step-1', 
+		region=a.sets['FixedEnd'+Case], u1=BLoadCase[0], u2=BLoadCase[1], u3=BLoadCase[2], 
+		ur1=UNSET,ur2=UNSET, ur3=UNSET, amplitude=UNSET, distributionType=UNIFORM,
+		fieldName='', localCsys=None)  
+	m.DisplacementBC(name='BC-2'+Case, createStepName='Step-1', 
+		region=a.sets['LoadEnd'+Case], u1=TLoadCase[0], u2=TLoadCase[1], u3=TLoadCase[2], 
+		ur1=UNSET,ur2=UNSET, ur3=UNSET, amplitude=UNSET, distributionType=UNIFORM,
+		fieldName='', localCsys=None)
+
+
+
+
 def SinEle(Model):
 	"""
 	:For use with: Abaqus cae environment    
-	Generates the input file for the model with only the cohesive zone using defintions from instance attributes.
+	Generates and runs the input file for the model with only the cohesive zone using defintions from instance attributes.
+	Models with Model.batchBC or Model.batchMatPropCz have a batch of independent cohesive zones in a single job, one per case of Model.batchCases(), with part 'Cz-<i>', instance 'ceInst-<i>' and the load sets placed side by side along the length.
+	History output is requested on the load set of every instance, postprocessors.plot.UvsRF splits the results into one file per element.
 
     :param Model: testModel instance
     :type Model: object
@@ -265,37 +386,17 @@ def SinEle(Model):
 
 	# Assigning a model
 	m = mdb.models['Model-1']
-		
-	## Defining cohesive zone
-	gC = geometry()
-	gC.dim = [Model.lenTop - Model.crack, Model.width, Model.thickCz]
-	gC.matType = 'AbqMatLib'
-	gC.matProp = Model.matPropCz
-	gC.meshSeed[0:1] = Model.meshSeed[0:1]
-	gC.meshSeed[2] = Model.thickCz
-		
-	## Generating parts
-	gC.generate(m, 'Cz')
-	pC = m.parts['Cz']
+	BCs, Props = Model.batchCases()
+	Cases = ['-'+str(i) for i in range(len(BCs))]
+	if not BCs:
+		BCs = [Model.BC]
+		Props = [Model.matPropCz]
+		Cases = ['']
+	Length = Model.lenTop - Model.crack
 
 	# Assembly definition
 	a = m.rootAssembly
 	a.DatumCsysByDefault(CARTESIAN)
-	## Generating part instances
-	a.Instance(name='ceInst', part=pC, dependent=ON)
-	ic = a.instances['ceInst']		
-
-	# Assigning load sets and cases
-	if Model.type == 'NonStdUM':
-		TLoadCase = Model.BC
-		BLoadCase = [0 for x in Model.BC]
-		a.Set(faces=ic.sets['Bot'].faces, name='FixedEnd')
-		a.Set(faces=ic.sets['Top'].faces, name='LoadEnd')
-	elif Model.type == 'NonStdNM':
-		TLoadCase = Model.BC
-		BLoadCase = [0 for x in Model.BC]
-		a.Set(faces=ic.sets['Bot'].faces, edges=ic.sets['Back'].edges, name='FixedEnd')
-		a.Set(edges=ic.sets['Front'].edges, name='LoadEnd')
 
 	# Step
 	m.StaticStep(name='Step-1', previous='Initial', 
@@ -305,19 +406,17 @@ def SinEle(Model):
 		resetDefaultValues=OFF, timeIncrementation=(4.0, 8.0, 9.0, 16.0, 10.0, 4.0, 
 		12.0, 15.0, 6.0, 3.0, 50.0))
 
-	# Boundary conditions
-	m.DisplacementBC(name='BC-1', createStepName='Step-1', 
-		region=a.sets['FixedEnd'], u1=BLoadCase[0], u2=BLoadCase[1], u3=BLoadCase[2], 
-		ur1=UNSET,ur2=UNSET, ur3=UNSET, amplitude=UNSET, distributionType=UNIFORM,
-		fieldName='', localCsys=None)  
-	m.DisplacementBC(name='BC-2', createStepName='Step-1', 
-		region=a.sets['LoadEnd'], u1=TLoadCase[0], u2=TLoadCase[1], u3=TLoadCase[2], 
-		ur1=UNSET,ur2=UNSET, ur3=UNSET, amplitude=UNSET, distributionType=UNIFORM,
-		fieldName='', localCsys=None)
-
-	# Output request
-	m.historyOutputRequests['H-Output-1'].setValues(variables=(
-		'UT', 'RT'), region=a.sets['LoadEnd'], timeInterval=0.01, sectionPoints=DEFAULT, rebar=EXCLUDE)
+	for i in range(len(BCs)):
+		## Cohesive zones side by side along the length
+		_sinEleCase(Model, m, Cases[i], BCs[i], Props[i], 2*Length*i)
+
+		# Output request
+		if i == 0:
+			m.historyOutputRequests['H-Output-1'].setValues(variables=(
+				'UT', 'RT'), region=a.sets['LoadEnd'+Cases[i]], timeInterval=0.01, sectionPoints=DEFAULT, rebar=EXCLUDE)
+		else:
+			m.HistoryOutputRequest(name='H-Output-'+str(i+1), createStepName='Step-1', variables=(
+				'UT', 'RT'), region=a.sets['LoadEnd'+Cases[i]], timeInterval=0.01, sectionPoints=DEFAULT, rebar=EXCLUDE)
 	m.fieldOutputRequests['F-Output-1'].setValues( frequency=10, variables=('S', 'U', 'RF'))
     
 	# Job 
@@ -326,20 +425,19 @@ def SinEle(Model):
 		memoryUnits=PERCENTAGE, getMemoryFromAnalysis=True, 
 		explicitPrecision=SINGLE, nodalOutputPrecision=SINGLE, echoPrint=OFF, 
 		modelPrint=OFF, contactPrint=OFF, historyPrint=OFF, userSubroutine='', 
-		scratch='', resultsFormat=ODB, multiprocessingMode=DEFAULT, numCpus=4, 
-		numDomains=4, numGPUs=0)
+		scratch='', resultsFormat=ODB, multiprocessingMode=DEFAULT, numCpus=Model.nCpu, 
+		numDomains=Model.nCpu, numGPUs=Model.nGpu)
 
 	# Writing input file
 	mdb.jobs[Model.name].writeInput(consistencyChecking=OFF)
-	## Editing .inp to define CZ as user elements
+	## Editing .inp to define CZ as user elements with the properties of each part
 	if Model.matTypeCz!='AbqMatLib':
-		ReDefCE(Model)
+		ReDefCE(Model, dict(('Cz'+Cases[i], Props[i]) for i in range(len(Props))))
 
 	myJob = mdb.jobs[Model.name]
-	myJob.setValues(numCpus=Model.nCpu, numDomains=Model.nCpu, numGPUs=Model.nGpu)
 
 	# Submitting the job
 	myJob.submit()
 
 	# Waiting for completion
-	myJob.waitForCompletion()
\ No newline at end of file
+	myJob.waitForCompletion()
@@ -11,6 +11,7 @@
 from abaqus import *
 from abaqusConstants import *
 from .materials import *
+from .inpDeck import gradedSeed
 
 class geometry:
 	"""
@@ -72,6 +73,15 @@ class geometry:
 
 	:param TabPosition: Location of tab for DCB and ADCB
 	:type TabPosition: float <= 1
+
+	:param biasRatio: Ratio of the coarsest to the finest seed of graded seeding, 1 for uniform seeding (see inpDeck.gradedSeed)
+	:type biasRatio: float
+
+	:param biasBand: Length ahead of the crack seeded uniformly with meshSeed[0] when graded
+	:type biasBand: float
+
+	:param interface: Face bonded to the cohesive zone ('Bot' or 'Top'), where the seed through the thickness is the finest when graded
+	:type interface: str
 	"""
 	def __init__(self):
 		self.dim = [1,1,0] # dimensions [length, width, thickness]
@@ -84,6 +94,9 @@ class geometry:
 		self.crackMesh = 5 # Mesh seed size for crack
 		self.LoadCase = [0,0,0] # List of boundary conditions to be applied
 		self.TabPosition = 0 # Location of load for DCB and ADCB
+		self.biasRatio = 1 # Ratio of the coarsest to the finest seed of graded seeding
+		self.biasBand = 0 # Length ahead of the crack seeded uniformly when graded
+		self.interface = 'Bot' # Face bonded to the cohesive zone
 		self.type = 'UnPart'
 	
 	def generate(self, m, Name):
@@ -106,6 +119,12 @@ class geometry:
 		# Generating geometry 
 		partGeom(m, self, Name)
 		p = m.parts[Name]
+		## Partition at the end of the uniformly seeded band for graded seeding
+		Graded = self.biasRatio > 1
+		xBand = (self.crack if self.type != 'UnPart' else 0) + self.biasBand
+		if Graded and self.biasBand > 0 and xBand < self.dim[0]:
+			Dp = p.DatumPlaneByPrincipalPlane(principalPlane=YZPLANE, offset=xBand).id
+			p.PartitionCellByDatumPlane(datumPlane=p.datums[Dp], cells=p.cells)
 		
 		Type = self.matType
 		# Material, section and elementtypes
@@ -133,15 +152,42 @@ class geometry:
 		p.setElementType(elemTypes=elemType, regions=p.sets['FullGeom'])
 
 		# Assigning edge seeds
-		p.seedEdgeBySize(edges=p.sets['X_Edges'].edges, size=self.meshSeed[0], deviationFactor=0.1, constraint=FINER)
-		p.seedEdgeBySize(edges=p.sets['Y_Edges'].edges, size=self.meshSeed[1], deviationFactor=0.1, constraint=FINER)
-		p.seedEdgeBySize(edges=p.sets['Z_Edges'].edges, size=self.meshSeed[2], deviationFactor=0.1, constraint=FINER)
-		if self.crack != 0:
-			p.seedEdgeBySize(edges=p.sets['Xcrack_Edges'].edges, size=self.crackMesh, deviationFactor=0.1, constraint=FINER)
+		if Graded:
+			self.gradedSeeds(p)
+		else:
+			p.seedEdgeBySize(edges=p.sets['X_Edges'].edges, size=self.meshSeed[0], deviationFactor=0.1, constraint=FINER)
+			p.seedEdgeBySize(edges=p.sets['Y_Edges'].edges, size=self.meshSeed[1], deviationFactor=0.1, constraint=FINER)
+			p.seedEdgeBySize(edges=p.sets['Z_Edges'].edges, size=self.meshSeed[2], deviationFactor=0.1, constraint=FINER)
+			if self.crack != 0:
+				p.seedEdgeBySize(edges=p.sets['Xcrack_Edges'].edges, size=self.crackMesh, deviationFactor=0.1, constraint=FINER)
 		
 		# Generating mesh
 		p.generateMesh()
 
+	def gradedSeeds(self, p):
+		"""
+		:For use with: Abaqus cae environment    
+		Seeds every edge of the part with the sizes of inpDeck.gradedSeed at its ends, biased towards the finer end (seedEdgeBySize along the width and where both sizes are equal).
+
+		:param p: abaqus part
+		:type p: object
+		"""
+		tol = 1e-6*max(self.dim)
+		for edge in p.edges:
+			Ends = [p.vertices[k].pointOn[0] for k in edge.getVertices()]
+			Axis = [i for i in range(3) if abs(Ends[1][i] - Ends[0][i]) > tol][0]
+			Edges = p.edges[edge.index:edge.index+1]
+			if Axis == 1:
+				p.seedEdgeBySize(edges=Edges, size=self.meshSeed[1], deviationFactor=0.1, constraint=FINER)
+				continue
+			Sizes = gradedSeed(self, Axis, Ends[0][Axis], Ends[1][Axis])
+			if abs(Sizes[1] - Sizes[0]) <= 1e-9*max(Sizes):
+				p.seedEdgeBySize(edges=Edges, size=Sizes[0], deviationFactor=0.1, constraint=FINER)
+			elif Sizes[0] < Sizes[1]:
+				p.seedEdgeByBias(biasMethod=SINGLE, end1Edges=Edges, minSize=Sizes[0], maxSize=Sizes[1], constraint=FINER)
+			else:
+				p.seedEdgeByBias(biasMethod=SINGLE, end2Edges=Edges, minSize=Sizes[1], maxSize=Sizes[0], constraint=FINER)
+
 
 
 def partGeom(m, geom, Name):
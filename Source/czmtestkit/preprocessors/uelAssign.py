@@ -4,88 +4,112 @@ User element defintion
 :For use with: Abaqus cae environment
      
 Replaces the cohesive element definition from abaqus material library with a user element definition and rewrites the input file.
+The rewrite streams the file line by line so that large input files are not held in memory.
 
 """
-# Importing Abaqus/CAE Release 2018 libraries for preprocessing
-from abaqus import *
-from abaqusConstants import *
+import os
 
 
 
 
-def ReDefCE(Model):
+def rewriteInp(inFile, outFile, CzMat):
+    """
+    :For use with: CZ environment and Abaqus cae environment
+
+    Streams an input file line by line and redefines cohesive zone elements as user defined elements in a single pass with bounded memory.
+
+    :'*Element, type=COH...': replaced by the user element definition (written once) and '*ELEMENT, TYPE=U1'
+
+    :'*Cohesive Section, elset=...': replaced by '*UEL PROPERTY, elset=...' with the material properties and its data line dropped
+
+    :comment lines: dropped
+
+    :param inFile: input file generated by abaqus cae
+    :type inFile: str
+
+    :param outFile: rewritten input file
+    :type outFile: str
+
+    :param CzMat: user element properties, or dictionary of user element properties by part name when parts have different properties
+    :type CzMat: list or dict
+
+    :return n: number of redefined cohesive element blocks
+    :type n: int
+    """
+    if isinstance(CzMat, dict):
+        MaterialProp = dict((key, ','.join([str(x) for x in CzMat[key]])) for key in CzMat)
+        nProp = len(list(CzMat.values())[0])
+    else:
+        MaterialProp = ','.join([str(x) for x in CzMat])
+        nProp = len(CzMat)
+    Head = '*USER ELEMENT, NODES=8, Type= U1, PROPERTIES='+str(nProp)+', COORDINATES=3,\n'
+    Head = Head + ' VARIABLES=21\n'
+    Head = Head + ' 1, 2, 3\n'
+    n = 0
+    skip = False
+    Part = ''
+    with open(inFile, 'r') as src:
+        with open(outFile, 'w') as dst:
+            for line in src:
+                if skip:
+                    # Data line of the suppressed cohesive section
+                    skip = False
+                    continue
+                if '**' in line:
+                    continue
+                if line.startswith('*'):
+                    if line.startswith('*Part, name='):
+                        Part = line.strip().replace('*Part, name=', '')
+                    if 'Element,' in line and 'type=COH' in line:
+                        if n == 0:
+                            dst.write(Head)
+                        n = n + 1
+                        dst.write('*ELEMENT, TYPE=U1\n')
+                        continue
+                    if 'Cohesive Section,' in line:
+                        elset = [substr.strip() for substr in line.split(',') if 'elset=' in substr]
+                        dst.write('*UEL PROPERTY, '+elset[0]+'\n')
+                        if isinstance(MaterialProp, dict):
+                            dst.write(' '+MaterialProp[Part]+'\n')
+                        else:
+                            dst.write(' '+MaterialProp+'\n')
+                        skip = True
+                        continue
+                dst.write(line)
+    return n
+
+
+
+
+def ReDefCE(Model, CzMat=None):
     """
     :For use with: Abaqus cae environment     
     
     Edits the input file by redefining cohesive zone elements as user defined elements and supresses assigned abaqus section.
+    The file is rewritten with rewriteInp and replaces the original input file.
 
     :param Model: testModel instance
     :type Model: object
+
+    :param CzMat: user element properties or dictionary of user element properties by part name. Defaults to Model.matPropCz
+    :type CzMat: list or dict
     
 	:return Job: ASCII data file with keyword and data lines to run the simulation.
 	:type Job: .inp
     """
-    import numpy as np
+    # Importing Abaqus/CAE Release 2018 libraries for preprocessing
+    from abaqus import mdb
+    from abaqusConstants import DEFAULT
     import job
 
-    CzMat = Model.matPropCz
     SubRout = Model.matTypeCz
     Name = Model.name
-    CzMat = [str(x) for x in CzMat]
-    MaterialProp = ','.join(CzMat)
 	## Redefining cohesive elements
-    # Reading input file
-    file = open(Name+'.inp')
-    Input = file.read()
-    file.close()
-    # Spliting data lines
-    Input = Input.split('\n')
-    # Looking for key words
-    Key = [idx for idx in range(len(Input)-1) if '*' in Input[idx]]
-    # Looking for cohesive element defintions within the keyword lines
-    CohElem = [idx for idx in Key if 'Element,' in Input[idx] and 'type=COH' in Input[idx]]
-    # Looking for cohesive section defintion
-    CohSec = [idx for idx in Key if 'Cohesive Section,' in Input[idx]]
-    # Looking for parts
-    Parts = [idx for idx in Key if '*Part, name=' in Input[idx]]
-    # Finding section properties
-    SecElset = []
-    SecPart = []
-    for sec in CohSec:
-        strng = Input[sec].split(',')
-        SecElset.extend([substr for substr in strng if 'elset=' in substr])
-        ## Commenting the current section definition
-        Input[sec-1] = '**'
-        Input[sec] = '**'
-        Input[sec+1] = '**'
-        ## Finding the part to which the section is assigned to
-        PartIndex = np.array([idx for idx in Parts if idx < sec]).max()
-        SecPart.extend([Input[PartIndex].replace('*Part, name=', '')])
-    # Redefining elements as user elements
-    Output = []
-    TopStart = 0
-    for i in range(len(CohElem)):
-        CEBstart = CohElem[i]
-        CEelset = SecElset[i]
-        Top = Input[TopStart:CEBstart]
-        TopStart = CEBstart+1
-        Output.extend(Top)
-        Head = ['*USER ELEMENT, NODES=8, Type= U1, PROPERTIES='+str(len(CzMat))+', COORDINATES=3,']
-        Head.extend([' VARIABLES=21'])
-        Head.extend([' 1, 2, 3'])
-        Head.extend(['*UEL PROPERTY, '+CEelset])
-        Head.extend([' '+MaterialProp])
-        Head.extend(['*ELEMENT, TYPE=U1,'+CEelset])
-        Output.extend(Head)
-    Output.extend(Input[TopStart:])
-    
-    ## Writing the output
-    Input = Output
-    Output = [line for line in Input if '**' not in line]
-    Output = '\n'.join(Output)
-    file = open(Name+'.inp',"w")
-    file.write(Output)
-    file.close
+    if CzMat is None:
+        CzMat = Model.matPropCz
+    rewriteInp(Name+'.inp', Name+'.inp.tmp', CzMat)
+    os.remove(Name+'.inp')
+    os.rename(Name+'.inp.tmp', Name+'.inp')
 
     # Deleting old job defintion
     del mdb.jobs[Name]
@@ -93,4 +117,4 @@ def ReDefCE(Model):
     # Creating new defintion using the .inp file
     mdb.JobFromInputFile(name=Name, inputFileName=Name+'.inp',
         userSubroutine=SubRout, multiprocessingMode=DEFAULT,  
-        numCpus=4, numDomains=4, numGPUs=0)
\ No newline at end of file
+        numCpus=Model.nCpu, numDomains=Model.nCpu, numGPUs=Model.nGpu)
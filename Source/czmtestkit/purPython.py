@@ -8,4 +8,13 @@
 """
 from .postprocessors.compare import *
 from .postprocessors.plot import *
-from .analytical.__init__ import analyticalModel
\ No newline at end of file
+from .analytical.__init__ import analyticalModel, analyticalBatch
+from .sweep import sweep, abqSolver, standInSolver
+from .cache import resultCache
+from .preprocessors.inpDeck import withBulkInp
+from .analytical.TSL import tslHistory, singleElement
+from .postprocessors.odbStore import openOdb, syntheticOdb
+from .analytical.loading import crackWindow, planLoading, stopAtCrackGrowth
+from .monitor import jobMonitor
+from .postprocessors.solverLog import solverLog, writeLog, logReport
+from .preprocessors.meshPlan import zoneLength, planMesh
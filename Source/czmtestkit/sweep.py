@@ -0,0 +1,199 @@
+"""
+    czmtestkit.sweep
+    ================
+    :For use with: CZ environment
+
+    Parallel execution of parametric sweeps.
+    Each testModel runs its build, solve, extract and postprocess pipeline in a separate process and working directory.
+    Jobs are packed onto the available cores and gpus using testModel.nCpu and testModel.nGpu.
+
+"""
+import os
+import time
+
+
+
+
+class abqSolver:
+    """
+    Builds, solves and extracts a model with abaqus cae using abqFun. The model is expected in '<Model.name>_in.json' in the current working directory.
+
+    :param func: abqPython function generating and solving the model
+    :type func: str
+    """
+    def __init__(self, func='withBulk'):
+        self.func = func
+
+    def __call__(self, Model):
+        from . import abqFun
+        abqFun(Model.name+"_in.json", self.func)
+        abqFun(Model.name+"_in.json", 'hisOutLoadPoint')
+
+
+
+
+class standInSolver:
+    """
+    Stand-in solver for testing sweeps without abaqus. Sleeps for the given time and writes the canned history output from abqStandIn module.
+
+    :param delay: seconds to sleep in place of the solve
+    :type delay: float
+    """
+    def __init__(self, delay=1):
+        self.delay = delay
+
+    def __call__(self, Model):
+        from . import abqStandIn
+        abqStandIn.withBulk(Model)
+        time.sleep(self.delay)
+        abqStandIn.hisOutLoadPoint(Model)
+
+
+
+
+def postprocess(Model):
+    """
+    Default postprocessing step of the sweep pipeline. Calculates effective load and displacement using UvsRF and writes the solver log using solverLog.writeLog.
+
+    :param Model: testModel instance
+    :type Model: object
+    """
+    from .postprocessors.plot import UvsRF
+    from .postprocessors.solverLog import writeLog
+    UvsRF(Model)
+    writeLog(Model)
+
+
+
+
+def runPipeline(Model, solver, post, root):
+    """
+    Runs the pipeline of a single job in the directory '<root>/<Model.name>'.
+
+    :param Model: testModel instance
+    :type Model: object
+
+    :param solver: callable building, solving and extracting the model
+    :type solver: callable
+
+    :param post: callable postprocessing the extracted results or None
+    :type post: callable
+
+    :param root: directory in which the job directory is created
+    :type root: str
+
+    :return result: dictionary with 'name', 'status' ('done' or 'error'), 'error', 'start' and 'stop'
+    :type result: dict
+    """
+    import traceback
+    result = {'name': Model.name, 'status': 'done', 'error': '', 'start': time.time()}
+    cwd = os.getcwd()
+    try:
+        path = os.path.join(root, Model.name)
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        os.chdir(path)
+        Model.addToDatabase()
+        solver(Model)
+        if post is not None:
+            post(Model)
+    except Exception:
+        result['status'] = 'error'
+        result['error'] = traceback.format_exc()
+    finally:
+        os.chdir(cwd)
+    result['stop'] = time.time()
+    return result
+
+
+
+
+class sweep:
+    """
+    Scheduler for running many testModel instances concurrently.
+
+    Jobs are started largest first (by nCpu, then nGpu) whenever enough cores and gpus are free, so that small jobs fill the cores left over by large ones.
+    A job requesting more than the budget is limited to the budget and runs alone.
+
+    Usage::
+
+        s = ctk.sweep(cores=16)
+        for Interface in Interfaces:
+            t = ctk.testModel()
+            ...
+            s.add(t)
+        results = s.run()
+
+    :param cores: core budget. Defaults to the number of cores on the machine.
+    :type cores: int
+
+    :param gpus: gpu budget
+    :type gpus: int
+
+    :param solver: callable taking a testModel that builds, solves and extracts the model in the current working directory. Defaults to abqSolver().
+    :type solver: callable
+
+    :param post: callable taking a testModel that postprocesses the extracted results. Defaults to UvsRF, None to skip.
+    :type post: callable
+
+    :param root: directory in which the job directories are created
+    :type root: str
+
+    :param meshDir: directory in root for mesh include files shared by the models (testModel.meshInclude), so that models differing only in materials or cohesive zone formulation are meshed once. '' keeps the setting of the models.
+    :type meshDir: str
+    """
+    def __init__(self, cores=None, gpus=0, solver=None, post=postprocess, root='.', meshDir=''):
+        self.cores = cores if cores is not None else os.cpu_count()
+        self.gpus = gpus
+        self.solver = solver if solver is not None else abqSolver()
+        self.post = post
+        self.root = os.path.abspath(root)
+        self.meshDir = meshDir
+        self.jobs = []
+        self.results = []
+
+    def add(self, Model):
+        """
+        Adds a model to the sweep.
+
+        :param Model: testModel instance
+        :type Model: object
+        """
+        if self.meshDir:
+            # Relative to the job directory '<root>/<Model.name>' to keep the include lines short
+            Model.meshInclude = os.path.join(os.pardir, self.meshDir)
+        self.jobs.append(Model)
+
+    def _demand(self, Model):
+        return min(max(int(Model.nCpu), 1), self.cores), min(int(Model.nGpu), self.gpus)
+
+    def run(self):
+        """
+        Runs all the added models and waits for them to finish.
+
+        :return results: results from runPipeline in the order of completion
+        :type results: list
+        """
+        from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+        pending = sorted(self.jobs, key=self._demand, reverse=True)
+        freeCpu = self.cores
+        freeGpu = self.gpus
+        running = {}
+        self.results = []
+        with ProcessPoolExecutor(max_workers=self.cores) as executor:
+            while pending or running:
+                for Model in list(pending):
+                    nCpu, nGpu = self._demand(Model)
+                    if nCpu <= freeCpu and nGpu <= freeGpu:
+                        future = executor.submit(runPipeline, Model, self.solver, self.post, self.root)
+                        running[future] = (nCpu, nGpu)
+                        freeCpu = freeCpu - nCpu
+                        freeGpu = freeGpu - nGpu
+                        pending.remove(Model)
+                done, notDone = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    nCpu, nGpu = running.pop(future)
+                    freeCpu = freeCpu + nCpu
+                    freeGpu = freeGpu + nGpu
+                    self.results.append(future.result())
+        return self.results
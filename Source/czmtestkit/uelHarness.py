@@ -0,0 +1,273 @@
+"""
+    czmtestkit.uelHarness
+    =====================
+    :For use with: CZ environment
+
+    Calls the UEL user subroutines directly without abaqus.
+    The subroutine is compiled with gfortran into a shared library together with a stand-in 'ABA_PARAM.INC' and called through ctypes with the abaqus UEL interface.
+    Used to verify the element stiffness matrix against finite differences of the residual and to compare the cost of the user element formulations.
+
+"""
+import os
+import sys
+import time
+import tempfile
+import ctypes
+import subprocess
+import numpy as np
+
+
+
+
+# Stand-in for the include file shipped with abaqus (implicit double precision)
+ABA_PARAM = "      IMPLICIT REAL*8(A-H,O-Z)\n      PARAMETER (NPRECD=2)\n"
+
+# Default properties, solution dependent variables and integer properties of the 8-node user elements in the repository.
+# 'initialize' is True for subroutines that set their solution dependent variables when called at zero time.
+# 'onset' are the indices of the normal strength and the penalty stiffness in props.
+# IDF and FDF_Imp add the softening tangent whenever the separation does not decrease (JMPTEN.GE.SVARS(2) after SVARS(2) is updated), also below damage onset, so their tangent checks fail in the elastic range.
+variants = {
+    'IDF': {'props': [1000000, 18, 47.2, 0.42, 2.89, 2.35], 'nsvars': 21, 'jprops': [0], 'initialize': True, 'onset': (1, 0)},
+    'IDF_3D': {'props': [1000000, 18, 47.2, 0.42, 2.89, 2.35], 'nsvars': 21, 'jprops': [0], 'initialize': True, 'onset': (1, 0)},
+    'FDF': {'props': [1000000, 18, 47.2, 0.42, 2.89, 2.35], 'nsvars': 21, 'jprops': [0], 'initialize': True, 'onset': (1, 0)},
+    'FDF_3D': {'props': [1000000, 18, 47.2, 0.42, 2.89, 2.35], 'nsvars': 21, 'jprops': [0], 'initialize': True, 'onset': (1, 0)},
+    'FDF_Imp': {'props': [1000000, 18, 47.2, 0.42, 2.89, 2.35], 'nsvars': 21, 'jprops': [0], 'initialize': True, 'onset': (1, 0)},
+    'udgcoh-uek-17': {'props': [0.42, 2.89, 18, 47.2, 1000000, 2.35, 1], 'nsvars': 8, 'jprops': [0], 'initialize': False, 'onset': (2, 4)},
+    'ut-v4-r2': {'props': [0.42, 2.89, 18, 47.2, 1000000, 2.35, 1], 'nsvars': 8, 'jprops': [0], 'initialize': False, 'onset': (2, 4)},
+}
+
+# Build directory shared by all runs, so that libraries are only rebuilt when the source changes
+buildFolder = os.path.join(tempfile.gettempdir(), 'czmtestkit', 'UelBuild')
+
+
+
+
+def build(source, folder=buildFolder):
+    """
+    Compiles a user subroutine into a shared library.
+
+    :param source: fixed form fortran file ('.for')
+    :type source: str
+
+    :param folder: build directory for the stand-in include file and the library
+    :type folder: str
+
+    :return path: shared library
+    :type path: str
+    """
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+    with open(os.path.join(folder, 'ABA_PARAM.INC'), 'w') as file:
+        file.write(ABA_PARAM)
+    name = os.path.splitext(os.path.basename(source))[0]
+    path = os.path.abspath(os.path.join(folder, name+'.so'))
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(source):
+        command = ['gfortran', '-shared', '-fPIC', '-O2', '-ffixed-form', '-fallow-argument-mismatch',
+            '-I', os.path.abspath(folder), '-J', os.path.abspath(folder), '-o', path, os.path.abspath(source)]
+        subprocess.run(command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return path
+
+
+
+
+class _quiet:
+    """
+    Redirects the standard output of the fortran runtime (PRINT statements in the subroutines) to devnull.
+    """
+    def __enter__(self):
+        sys.stdout.flush()
+        self.saved = os.dup(1)
+        self.null = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(self.null, 1)
+        return self
+
+    def __exit__(self, *args):
+        os.dup2(self.saved, 1)
+        os.close(self.null)
+        os.close(self.saved)
+
+
+
+
+class uelLibrary:
+    """
+    Compiled user element with the abaqus UEL interface for an 8-node 3D cohesive element.
+
+    Usage::
+
+        from czmtestkit.uelHarness import uelLibrary
+        lib = uelLibrary('IDF.for')
+        RHS, AMATRX, SVARS = lib.call(U)
+        lib.tangentCheck()
+        lib.benchmark()
+
+    :param source: fixed form fortran file ('.for')
+    :type source: str
+
+    :param props: element properties. Defaults to the entry in variants for the file name.
+    :type props: list
+
+    :param nsvars: number of solution dependent variables
+    :type nsvars: int
+
+    :param jprops: integer element properties
+    :type jprops: list
+
+    :param coords: nodal coordinates with shape (3, 8), bottom face nodes first. Defaults to a unit square with thickness 0.01.
+    :type coords: numpy array
+
+    :param folder: build directory. Defaults to buildFolder in the temporary directory.
+    :type folder: str
+    """
+    def __init__(self, source, props=None, nsvars=None, jprops=None, coords=None, folder=buildFolder):
+        name = os.path.splitext(os.path.basename(source))[0]
+        default = variants.get(name, variants['IDF'])
+        self.name = name
+        self.props = np.asarray(props if props is not None else default['props'], dtype=float)
+        self.nsvars = nsvars if nsvars is not None else default['nsvars']
+        self.jprops = np.asarray(jprops if jprops is not None else default['jprops'], dtype=np.int32)
+        self.onset = default['onset']
+        if coords is None:
+            coords = np.array([[0, 1, 1, 0, 0, 1, 1, 0], [0, 0, 1, 1, 0, 0, 1, 1], [0, 0, 0, 0, 0.01, 0.01, 0.01, 0.01]], dtype=float)
+        self.coords = np.asfortranarray(coords, dtype=float)
+        self.nnode = self.coords.shape[1]
+        self.mcrd = self.coords.shape[0]
+        self.ndofel = self.nnode*self.mcrd
+        # Unbuffered fortran output so that PRINT statements are discarded while redirected
+        os.environ.setdefault('GFORTRAN_UNBUFFERED_PRECONNECTED', 'y')
+        self.library = ctypes.CDLL(build(source, folder))
+        self.uel = self.library.uel_
+        self.uel.restype = None
+        self.initial = np.zeros(self.nsvars)
+        if default['initialize']:
+            self.initial = self.initialState()
+
+    def call(self, U, svars=None, period=1.0):
+        """
+        Single call of the user element.
+
+        :param U: nodal displacements (ndofel,)
+        :type U: numpy array
+
+        :param svars: solution dependent variables at the start of the increment. Defaults to the initial state.
+        :type svars: numpy array
+
+        :param period: total time passed to the subroutine, 0 triggers the initialization of the state variables
+        :type period: float
+
+        :return RHS, AMATRX, SVARS: residual vector, stiffness matrix and updated solution dependent variables
+        :type RHS, AMATRX, SVARS: numpy array
+
+        :raises ValueError: if any of the outputs is not finite
+        """
+        n = self.ndofel
+        dbl = lambda x: np.ascontiguousarray(x, dtype=float)
+        RHS = np.zeros((n, 1), order='F')
+        AMATRX = np.zeros((n, n), order='F')
+        SVARS = dbl(svars if svars is not None else self.initial).copy()
+        U = dbl(U)
+        args = [RHS, AMATRX, SVARS, np.zeros(8), ctypes.c_int(n), ctypes.c_int(1), ctypes.c_int(self.nsvars),
+            self.props, ctypes.c_int(len(self.props)), self.coords, ctypes.c_int(self.mcrd), ctypes.c_int(self.nnode),
+            U, np.zeros((n, 1), order='F'), np.zeros(n), np.zeros(n), ctypes.c_int(1), dbl([period, period]),
+            ctypes.c_double(1.0), ctypes.c_int(1), ctypes.c_int(1), ctypes.c_int(1), np.zeros(3),
+            ctypes.c_int(0), np.zeros(1, dtype=np.int32), np.zeros(1), np.zeros((2, 1, self.nnode), order='F'),
+            ctypes.c_int(1), np.array([1, 1, 1, 0, 0], dtype=np.int32), ctypes.c_int(n), np.zeros(1),
+            ctypes.c_int(1), ctypes.c_double(1.0), self.jprops, ctypes.c_int(len(self.jprops)), ctypes.c_double(1.0)]
+        refs = [ctypes.byref(x) if not isinstance(x, np.ndarray) else x.ctypes.data_as(ctypes.c_void_p) for x in args]
+        self.uel(*refs)
+        for key, value in [('RHS', RHS), ('AMATRX', AMATRX), ('SVARS', SVARS)]:
+            if not np.all(np.isfinite(value)):
+                raise ValueError(self.name + ' returned non-finite ' + key)
+        return RHS[:, 0], AMATRX, SVARS
+
+    def initialState(self):
+        """
+        Solution dependent variables after the initialization by the subroutine at zero time.
+        """
+        with _quiet():
+            return self.call(np.zeros(self.ndofel), np.zeros(self.nsvars), period=0.0)[2]
+
+    def randomStates(self, n, scale=None, seed=0):
+        """
+        Random nodal displacements with the top face (nodes 5 to 8) separated from the bottom face.
+
+        :param n: number of states
+        :type n: int
+
+        :param scale: magnitude of the separations. Defaults to twice the normal onset separation, the normal strength over the penalty stiffness (props[1]/props[0] for the IDF/FDF variants, props[2]/props[4] for ut-v4-r2 and udgcoh-uek-17).
+        :type scale: float
+
+        :return U: nodal displacements with shape (n, ndofel)
+        :type U: numpy array
+        """
+        if scale is None:
+            scale = 2*self.props[self.onset[0]]/self.props[self.onset[1]]
+        rng = np.random.default_rng(seed)
+        U = np.zeros((n, self.nnode, self.mcrd))
+        U[:, self.nnode//2:, :] = scale*rng.uniform(-1, 1, (n, 1, self.mcrd)) + 0.1*scale*rng.uniform(-1, 1, (n, self.nnode//2, self.mcrd))
+        return U.reshape(n, self.ndofel)
+
+    def tangentCheck(self, n=20, step=1e-9, scale=None, seed=0):
+        """
+        Compares AMATRX with central finite differences of -RHS at random states, using the same state variables for every perturbation.
+
+        :param n: number of random states
+        :type n: int
+
+        :param step: finite difference step
+        :type step: float
+
+        :return errors: relative Frobenius norm of the difference for each state
+        :type errors: numpy array
+
+        :raises ValueError: if the subroutine returns non-finite outputs
+        """
+        errors = np.zeros(n)
+        with _quiet():
+            for k, U in enumerate(self.randomStates(n, scale, seed)):
+                RHS, AMATRX, SVARS = self.call(U)
+                K = np.zeros_like(AMATRX)
+                for j in range(self.ndofel):
+                    dU = np.zeros(self.ndofel)
+                    dU[j] = step
+                    K[:, j] = -(self.call(U+dU)[0] - self.call(U-dU)[0])/(2*step)
+                errors[k] = np.linalg.norm(AMATRX - K)/max(np.linalg.norm(K), 1e-300)
+        return errors
+
+    def separationHistory(self, separation):
+        """
+        Calls the user element along a history of uniform separations of the top face (nodes 5 to 8), passing the solution dependent variables from one call to the next as abaqus does between increments.
+
+        :param separation: separation of the top face from the bottom face [x, y, z] with shape (nSteps, mcrd)
+        :type separation: numpy array
+
+        :return force, SVARS: resultant force on the top face with shape (nSteps, mcrd) and solution dependent variables after each call with shape (nSteps, nsvars)
+        :type force, SVARS: numpy array
+
+        :raises ValueError: if the subroutine returns non-finite outputs
+        """
+        separation = np.asarray(separation, dtype=float)
+        force = np.zeros(separation.shape)
+        SVARS = np.zeros((len(separation), self.nsvars))
+        svars = self.initial
+        with _quiet():
+            for k, delta in enumerate(separation):
+                U = np.zeros((self.nnode, self.mcrd))
+                U[self.nnode//2:, :] = delta
+                RHS, AMATRX, svars = self.call(U.reshape(self.ndofel), svars)
+                force[k] = -RHS.reshape(self.nnode, self.mcrd)[self.nnode//2:, :].sum(axis=0)
+                SVARS[k] = svars
+        return force, SVARS
+
+    def benchmark(self, n=10000, scale=None, seed=0):
+        """
+        :return rate: user element calls per second over n random states
+        :type rate: float
+        """
+        states = self.randomStates(n, scale, seed)
+        with _quiet():
+            start = time.time()
+            for U in states:
+                self.call(U)
+            stop = time.time()
+        return n/(stop-start)
@@ -50,6 +50,8 @@ def RUN(Name, Interface):
 
 	pPy.UvsRF(t)
 
+	Log = pPy.writeLog(t)
+
 	pPy.cleanUp(saveExt=[])
 
 	a = pPy.analyticalModel(t)
@@ -62,15 +64,16 @@ def RUN(Name, Interface):
 	Ana = pd.read_csv(a.name+'.csv',delimiter=',')
 	out = ctk.testOutput()
 	out.name = t.name
+	out.solverLog = Log['summary']
 
 	fig, ax = plt.subplots()
-	pOpt_elas, pCov_elas, min_elas, max_elas, mse_elas, mean_elas, std_elas = pPy.fit(Ana, 0, 1, pPy.linear, 2, ax)
-	pOpt_frac, pCov_frac, min_frac, max_frac, mse_frac, mean_frac, std_frac = pPy.fit(Ana, 2, 3, pPy.exponent, 3, ax)
-	n1 = Ana.iloc[:,0].shape[0]
-	n2 = Ana.iloc[:,2].shape[0]
-	out.mseAnaPred = pPy.meanComb(mse_elas, mse_frac, n1, n2)
-	out.meanAnaPred = pPy.meanComb(mean_elas, mean_frac, n1, n2)
-	out.stdAnaPred = pPy.sdComb(mse_elas, mse_frac, std_elas, std_frac, n1, n2)
+	stats = pPy.runningStats()
+	pOpt_elas, pCov_elas, min_elas, max_elas, mse_elas, mean_elas, std_elas = pPy.fit(Ana, 0, 1, pPy.linear, 2, ax, stats)
+	pOpt_frac, pCov_frac, min_frac, max_frac, mse_frac, mean_frac, std_frac = pPy.fit(Ana, 2, 3, pPy.exponent, 3, ax, stats)
+	out.mseAnaPred = stats.mse
+	out.meanAnaPred = stats.mean
+	out.stdAnaPred = stats.std
+	out.statsAnaPred = stats.toDict()
 	ax.legend(['Analytical (elastic)','Prediction (elastic)','Analytical (fracture)','Prediction (fracture)'])
 	ax.set_xlabel('Displacement (mm)')
 	ax.set_ylabel('Force (N)')
@@ -82,13 +85,16 @@ def RUN(Name, Interface):
 	max_elas = Sim.iloc[:,0].max()
 	min_frac = Sim.iloc[:,2].min()
 	max_frac = Sim.iloc[:,2].max()
-	mse_elas, mean_elas, std_elas = pPy.test(Sim, 0, 1, min_elas, max_elas, pPy.linear, pOpt_elas, ax) 
-	mse_frac, mean_frac, std_frac = pPy.test(Sim, 2, 3, min_frac, max_frac, pPy.exponent, pOpt_frac, ax)
-	n1 = Sim.iloc[:,0].shape[0]
-	n2 = Sim.iloc[:,2].shape[0]
-	out.mseSimPred = pPy.meanComb(mse_elas, mse_frac, n1, n2)
-	out.meanSimPred = pPy.meanComb(mean_elas, mean_frac, n1, n2)
-	out.stdSimPred = pPy.sdComb(mse_elas, mse_frac, std_elas, std_frac, n1, n2)
+	stats = pPy.runningStats()
+	mse_elas, mean_elas, std_elas = pPy.test(Sim, 0, 1, min_elas, max_elas, pPy.linear, pOpt_elas, ax, stats) 
+	mse_frac, mean_frac, std_frac = pPy.test(Sim, 2, 3, min_frac, max_frac, pPy.exponent, pOpt_frac, ax, stats)
+	out.mseSimPred = stats.mse
+	out.meanSimPred = stats.mean
+	out.stdSimPred = stats.std
+	out.statsSimPred = stats.toDict()
+	xSim, ySim = pPy.joinSplit(Sim)
+	xAna, yAna = pPy.joinSplit(Ana)
+	pPy.metricsToOutputs([out], pPy.curveMetrics([xSim], [ySim], [xAna], [yAna]))
 	ax.legend(['FE simulation (elastic)','Prediction (elastic)','FE simulation (fracture)','Prediction (fracture)'])
 	ax.set_xlabel('Displacement (mm)')
 	ax.set_ylabel('Force (N)')
@@ -0,0 +1,58 @@
+"""
+Throughput of the analytical load-displacement curves.
+Compares the per specimen path (analyticalModel.generate with plot and csv file) with analyticalBatch.
+
+Usage: python Analytical.py [number of models]
+"""
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+import czmtestkit as ctk
+from czmtestkit.analytical import analyticalModel, analyticalBatch
+
+
+def models(n):
+	rng = np.random.default_rng(0)
+	out = []
+	for i in range(n):
+		t = ctk.testModel()
+		t.type = ['DCB', 'ADCB', 'ENF', 'SLB', 'ASLB'][i % 5]
+		t.name = t.type + '_' + str(i)
+		t.lenTop = 100
+		t.lenBot = 100
+		t.width = 25
+		t.thickTop = rng.uniform(2, 3)
+		t.thickBot = rng.uniform(2, 3)
+		t.crack = rng.uniform(40, 60)
+		t.loadE1 = 0 if t.type in ['DCB', 'ADCB'] else 10
+		t.loadE2 = 0 if t.type in ['DCB', 'ADCB'] else 10
+		t.peakLoad = 100
+		t.fTough = rng.uniform(0.3, 3)
+		t.matPropTop = [109000, 8819, 8819, 0.34, 0.34, 0.38, 4315, 4315, 3200]
+		out.append(t)
+	return out
+
+
+if __name__ == '__main__':
+	n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+	cwd = os.getcwd()
+	os.chdir(tempfile.mkdtemp())
+	single = models(min(n, 100))
+	start = time.time()
+	for t in single:
+		analyticalModel(t).generate()
+	perModel = (time.time()-start)/len(single)
+	start = time.time()
+	for t in single:
+		analyticalModel(t).generate(plot=False, save=False)
+	perModelNoFiles = (time.time()-start)/len(single)
+	batch = models(n)
+	start = time.time()
+	analyticalBatch(batch)
+	perBatch = (time.time()-start)/n
+	os.chdir(cwd)
+	print('%-32s %12.1f models/s' % ('generate (png + csv)', 1/perModel))
+	print('%-32s %12.1f models/s' % ('generate (in memory)', 1/perModelNoFiles))
+	print('%-32s %12.1f models/s' % ('analyticalBatch', 1/perBatch))
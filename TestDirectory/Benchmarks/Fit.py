@@ -0,0 +1,40 @@
+"""
+Fitting the analytical load-displacement curves of many models (linear elastic part, exponent fracture part).
+Compares scipy.optimize.curve_fit per curve (the previous compare.fit) with compare.fitBatch.
+
+Usage: python Fit.py [number of models]
+"""
+import sys
+import time
+import numpy as np
+from scipy.optimize import curve_fit
+from czmtestkit.analytical import analyticalBatch
+from czmtestkit.postprocessors.compare import linear, exponent, fitBatch
+from Analytical import models
+
+
+if __name__ == '__main__':
+	n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+	Curves = analyticalBatch(models(n))
+	Groups = [g for name, g in Curves.groupby('name', sort=False)]
+	for func, nPar, x, y in [(linear, 2, 'U_elastic', 'P_elastic'), (exponent, 3, 'U_fracture', 'P_fracture')]:
+		X = [g[x].to_numpy() for g in Groups]
+		Y = [g[y].to_numpy() for g in Groups]
+		start = time.time()
+		mse = []
+		for k in range(n):
+			try:
+				# Trial steps of curve_fit may overflow the exponent
+				with np.errstate(over='ignore', invalid='ignore'):
+					pOpt, pCov = curve_fit(func, X[k], Y[k], p0=np.ones(nPar))
+				mse.append(np.mean((func(X[k], *pOpt) - Y[k])**2))
+			except RuntimeError:
+				mse.append(np.nan)
+		loop = time.time() - start
+		start = time.time()
+		batch = fitBatch(X, Y, func, nPar)
+		vector = time.time() - start
+		mse = np.array(mse)
+		scale = np.array([np.mean(v**2) for v in Y])
+		print('%-9s curve_fit %6.3f s (%d failed)  fitBatch %6.3f s  mse difference (max, relative to mean y^2) %.1e' % (func.__name__, loop,
+			np.isnan(mse).sum(), vector, np.nanmax((batch[4] - mse)/scale)))
@@ -0,0 +1,42 @@
+"""
+Cold start time of the czmtestkit modules.
+Each module is imported in fresh interpreters and the median wall time is compared with the budget.
+Fails (exit code 1) if the budget is exceeded or if pandas, matplotlib or scipy are loaded by the import.
+
+Usage: python ImportTime.py [budget in seconds]
+"""
+import sys
+import time
+import subprocess
+
+
+modules = ['czmtestkit', 'czmtestkit.purPython']
+heavy = ['pandas', 'matplotlib', 'scipy']
+
+
+def coldStart(module, repeat=5):
+	code = 'import sys, ' + module + '; print(",".join([m for m in ' + repr(heavy) + ' if m in sys.modules]))'
+	times = []
+	for i in range(repeat):
+		start = time.time()
+		out = subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+		times.append(time.time()-start)
+	baseline = []
+	for i in range(repeat):
+		start = time.time()
+		subprocess.run([sys.executable, '-c', 'pass'], check=True)
+		baseline.append(time.time()-start)
+	return sorted(times)[repeat//2] - sorted(baseline)[repeat//2], out.strip()
+
+
+if __name__ == '__main__':
+	budget = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+	failed = False
+	for module in modules:
+		duration, loaded = coldStart(module)
+		status = 'ok'
+		if duration > budget or loaded:
+			status = 'FAILED'
+			failed = True
+		print('%-24s %8.3f s  heavy modules: %-24s %s' % (module, duration, loaded or '-', status))
+	sys.exit(1 if failed else 0)
@@ -0,0 +1,96 @@
+"""
+Benchmark of the cohesive element redefinition on synthetic input files.
+Compares the streaming rewriteInp with the previous in-memory implementation of ReDefCE.
+
+Usage: python ReDefCE.py [mesh size along the length]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import tracemalloc
+import numpy as np
+import czmtestkit as ctk
+from czmtestkit.preprocessors.inpDeck import withBulkInp
+from czmtestkit.preprocessors.uelAssign import rewriteInp
+
+
+def inMemory(inFile, outFile, CzMat):
+	# Previous implementation of ReDefCE without the abaqus job handling
+	CzMat = [str(x) for x in CzMat]
+	MaterialProp = ','.join(CzMat)
+	file = open(inFile)
+	Input = file.read()
+	file.close()
+	Input = Input.split('\n')
+	Key = [idx for idx in range(len(Input)-1) if '*' in Input[idx]]
+	CohElem = [idx for idx in Key if 'Element,' in Input[idx] and 'type=COH' in Input[idx]]
+	CohSec = [idx for idx in Key if 'Cohesive Section,' in Input[idx]]
+	Parts = [idx for idx in Key if '*Part, name=' in Input[idx]]
+	SecElset = []
+	for sec in CohSec:
+		strng = Input[sec].split(',')
+		SecElset.extend([substr for substr in strng if 'elset=' in substr])
+		Input[sec-1] = '**'
+		Input[sec] = '**'
+		Input[sec+1] = '**'
+		PartIndex = np.array([idx for idx in Parts if idx < sec]).max()
+	Output = []
+	TopStart = 0
+	for i in range(len(CohElem)):
+		CEBstart = CohElem[i]
+		CEelset = SecElset[i]
+		Output.extend(Input[TopStart:CEBstart])
+		TopStart = CEBstart+1
+		Head = ['*USER ELEMENT, NODES=8, Type= U1, PROPERTIES='+str(len(CzMat))+', COORDINATES=3,']
+		Head.extend([' VARIABLES=21'])
+		Head.extend([' 1, 2, 3'])
+		Head.extend(['*UEL PROPERTY, '+CEelset])
+		Head.extend([' '+MaterialProp])
+		Head.extend(['*ELEMENT, TYPE=U1,'+CEelset])
+		Output.extend(Head)
+	Output.extend(Input[TopStart:])
+	Output = [line for line in Output if '**' not in line]
+	file = open(outFile, "w")
+	file.write('\n'.join(Output))
+	file.close()
+
+
+def measure(func, *args):
+	tracemalloc.start()
+	start = time.time()
+	func(*args)
+	stop = time.time()
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	return stop-start, peak
+
+
+if __name__ == '__main__':
+	size = float(sys.argv[1]) if len(sys.argv) > 1 else 0.1
+	t = ctk.testModel()
+	t.type = 'DCB'
+	t.name = 'Benchmark'
+	t.lenTop = 100
+	t.lenBot = 100
+	t.width = 25
+	t.thickTop = 2.4
+	t.thickBot = 2.4
+	t.thickCz = 0.2
+	t.crack = 60
+	t.TabPosition = 0.5
+	t.meshSeed = [size, 5, 0.5]
+	t.crackSeed = size*5
+	t.matPropCz = [1000000, 18, 18*((2.89/0.42)**0.5), 0.42, 2.89, 2.35]
+	cwd = os.getcwd()
+	folder = tempfile.mkdtemp()
+	os.chdir(folder)
+	withBulkInp(t)
+	mb = os.path.getsize(t.name+'.inp')/2.0**20
+	print('Input file: %.1f MB' % mb)
+	for name, func in [('in memory', inMemory), ('streaming', rewriteInp)]:
+		duration, peak = measure(func, t.name+'.inp', t.name+'_'+func.__name__+'.inp', t.matPropCz)
+		print('%-10s %8.2f s %10.1f MB peak' % (name, duration, peak/2.0**20))
+	os.chdir(cwd)
+	shutil.rmtree(folder)
@@ -0,0 +1,70 @@
+"""
+Element counts of uniform and graded seeding (testModel.biasRatio, testModel.biasBand) for the DCB and ENF models of TestDirectory.
+The counts are those of the mesh written by withBulkInp (inpDeck.meshSize).
+When abaqus is on the path, both meshes are also solved with the AbqMatLib cohesive zone and the peak loads compared.
+
+Usage: python Seeding.py [biasRatio] [run]
+"""
+import os
+import sys
+import shutil
+import tempfile
+import czmtestkit as ctk
+import czmtestkit.purPython as pPy
+from czmtestkit.preprocessors.inpDeck import meshSize
+
+
+def models():
+	out = []
+	for Type, Len, Thick, Crack, BC, Band in [('DCB', 100, 2.4, 60, [0,0,5], 15), ('ENF', 200, 2.4, 70, [0,0,8], 30)]:
+		t = ctk.testModel()
+		t.type = Type
+		t.name = Type
+		t.lenTop = Len
+		t.lenBot = Len
+		t.width = 25
+		t.thickTop = Thick
+		t.thickBot = Thick
+		t.thickCz = 0.2
+		t.crack = Crack
+		t.BC = BC
+		t.matPropCz = [1000000, 18, 18*((2.89/0.42)**0.5), 0.42, 2.89, 2.35]
+		t.matTypeTop = "AnIso"
+		t.matPropTop = [109000, 8819, 8819, 0.34, 0.34, 0.38, 4315, 4315, 3200]
+		t.matTypeBot = "AnIso"
+		t.matPropBot = [109000, 8819, 8819, 0.34, 0.34, 0.38, 4315, 4315, 3200]
+		t.TabPosition = 1
+		t.meshSeed = [0.1, 5, 0.6]
+		t.crackSeed = 5
+		t.biasBand = Band
+		out.append(t)
+	return out
+
+
+def peakLoad(t):
+	cwd = os.getcwd()
+	os.chdir(tempfile.mkdtemp())
+	t.addToDatabase()
+	ctk.abqFun(t.name+"_in.json", 'withBulk')
+	ctk.abqFun(t.name+"_in.json", 'hisOutLoadPoint')
+	Data = pPy.UvsRF(t)
+	os.chdir(cwd)
+	return Data.xs('RF', axis=1, level='Output').xs('Effective', axis=1, level='Direction').max().max()
+
+
+if __name__ == '__main__':
+	ratio = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+	run = len(sys.argv) > 2 and shutil.which('abaqus') is not None
+	for t in models():
+		uniform = meshSize(t)
+		t.biasRatio = ratio
+		graded = meshSize(t)
+		print('%-4s uniform %8d elements %9d dofs   graded %8d elements %9d dofs   %.1fx fewer elements' % (t.type,
+			uniform['elements'], uniform['dofs'], graded['elements'], graded['dofs'], uniform['elements']/float(graded['elements'])))
+		if run:
+			pGraded = peakLoad(t)
+			t.biasRatio = 1
+			pUniform = peakLoad(t)
+			print('     peak load uniform %.2f graded %.2f (%.2f%%)' % (pUniform, pGraded, 100*(pGraded - pUniform)/pUniform))
+	if not run:
+		print('Peak loads not compared (pass a second argument with abaqus on the path to solve both meshes)')
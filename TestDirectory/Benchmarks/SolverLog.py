@@ -0,0 +1,31 @@
+"""
+Check of postprocessors.solverLog against the status, message and data files of a DCB job in SolverLog/.
+The job has 13 increments over a step time of 0.1, two of which are cut back, with severe discontinuity iterations and warnings.
+The increment tables read from the '.sta' and '.msg' files have to agree.
+
+Usage: python SolverLog.py
+"""
+import os
+from czmtestkit.postprocessors.solverLog import readSta, readMsg, solverLog
+
+
+expected = {'attempts': 15, 'cutbacks': 2, 'increments': 13, 'iterations': 48, 'severe': 4, 'warnings': 3,
+	'stepTime': 0.1, 'userTime': 18.4, 'systemTime': 0.9, 'cpuTime': 19.3, 'wallTime': 21,
+	'nElements': 3800, 'nNodes': 7310, 'nVariables': 21936, 'completed': True}
+
+
+if __name__ == '__main__':
+	name = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'SolverLog', 'DCB')
+	summary = solverLog(name)['summary']
+	failed = 0
+	for key in expected:
+		ok = abs(summary.get(key, -1) - expected[key]) < 1e-9
+		failed = failed + (not ok)
+		print('%-12s %12s %12s  %s' % (key, summary.get(key), expected[key], 'ok' if ok else 'FAILED'))
+	sta, completed = readSta(name+'.sta')
+	msg, _ = readMsg(name+'.msg')
+	for key in sta:
+		ok = all([abs(a - b) <= 1e-3*max(abs(b), 1e-6) for a, b in zip(sta[key], msg[key])]) and len(sta[key]) == len(msg[key])
+		failed = failed + (not ok)
+		print('%-12s %25s  %s' % (key, '.sta and .msg tables', 'ok' if ok else 'FAILED'))
+	print('All checks passed' if not failed else '%d checks FAILED' % failed)
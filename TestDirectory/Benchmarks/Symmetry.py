@@ -0,0 +1,55 @@
+"""
+Mesh size of full and half width models (testModel.symmetry) for the DCB and ENF models of TestDirectory.
+The width is seeded with an even number of elements. The sizes are those of the mesh written by withBulkInp (inpDeck.meshSize), together with the time to write the input file.
+When abaqus is on the path, both models are also solved and the wall clock times and the peak loads compared, the latter verifying the half width model and the force scaling of UvsRF against the full model.
+
+Usage: python Symmetry.py [run]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import czmtestkit as ctk
+import czmtestkit.purPython as pPy
+from czmtestkit.preprocessors.inpDeck import meshSize, withBulkInp
+from Seeding import models
+
+
+def peakLoad(Data):
+	return Data.xs('RF', axis=1, level='Output').xs('Effective', axis=1, level='Direction').abs().max().max()
+
+
+def solve(t, run):
+	cwd = os.getcwd()
+	os.chdir(tempfile.mkdtemp())
+	start = time.time()
+	withBulkInp(t)
+	writing = time.time() - start
+	wall, peak = 0, 0
+	if run:
+		t.addToDatabase()
+		ctk.abqFun(t.name+"_in.json", 'withBulk')
+		ctk.abqFun(t.name+"_in.json", 'hisOutLoadPoint')
+		wall = pPy.writeLog(t)['summary'].get('wallTime', 0)
+		peak = peakLoad(pPy.UvsRF(t))
+	os.chdir(cwd)
+	return writing, wall, peak
+
+
+if __name__ == '__main__':
+	run = len(sys.argv) > 1 and shutil.which('abaqus') is not None
+	for t in models():
+		t.meshSeed[1] = 2.5 # even number of elements across the width, so the half width model has half of them
+		full = meshSize(t)
+		wFull, tFull, pFull = solve(t, run)
+		t.symmetry = True
+		half = meshSize(t)
+		wHalf, tHalf, pHalf = solve(t, run)
+		print('%-4s full %8d elements %9d dofs %6.2f s   half %8d elements %9d dofs %6.2f s   %.1fx fewer dofs' % (t.type,
+			full['elements'], full['dofs'], wFull, half['elements'], half['dofs'], wHalf, full['dofs']/float(half['dofs'])))
+		if run:
+			print('     peak load full %.2f half %.2f (%.2f%%)' % (pFull, pHalf, 100*(pHalf - pFull)/pFull))
+			print('     wall clock time full %.1f s half %.1f s (%.1fx faster)' % (tFull, tHalf, tFull/max(tHalf, 1e-9)))
+	if not run:
+		print('Peak loads and wall clock times not compared (pass an argument with abaqus on the path to solve both models)')
@@ -0,0 +1,54 @@
+"""
+Check of the vectorized traction separation law (czmtestkit.analytical.TSL) against the compiled user elements of TestDirectory.
+IDF_3D and FDF are driven through czmtestkit.uelHarness along the same separation histories (mode 1, mode 2 and mixed mode, each with unloading and reloading to failure, through compression for mode 2 and mixed mode) and the traction, the damage (SVARS(1)) and the dissipated and stored energy are compared with tslHistory.
+The element spans the parent domain [-1, 1]x[-1, 1], where the integration weights of both formulations sum to the face area, so the traction is the top face force over the area.
+
+Usage: python TSL.py [number of steps per history] [tolerance]
+"""
+import os
+import sys
+import numpy as np
+from czmtestkit.uelHarness import uelLibrary, variants
+from czmtestkit.analytical.TSL import tslHistory
+
+
+def histories(props, n):
+	# Load to half the failure separation, unload through zero into compression and reload beyond failure.
+	# Pure normal compression has no mode mixity (nan in SVARS(4) of the user elements), so mode 1 is only unloaded to zero.
+	stif, tauN, tauT, gNc, gTc = props[:5]
+	path = np.concatenate([np.linspace(0, 0.5, n), np.linspace(0.5, -0.1, n)[1:], np.linspace(-0.1, 1.2, 2*n)[1:]])
+	out = {}
+	for name, direction, failure in [('mode 1', [0, 0, 1], 2*gNc/tauN), ('mode 2', [1, 0, 0], 2*gTc/tauT),
+			('mixed mode', [0.6, 0.3, 1], 2*gTc/tauT)]:
+		direction = np.asarray(direction, dtype=float)/np.linalg.norm(direction)
+		scale = np.maximum(path, 0) if name == 'mode 1' else path
+		out[name] = failure*scale[:, None]*direction[None, :]
+	return out
+
+
+def energy(traction, separation):
+	return np.concatenate([[0], np.cumsum((0.5*(traction[1:] + traction[:-1])*np.diff(separation, axis=0)).sum(axis=1))])
+
+
+if __name__ == '__main__':
+	n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+	tol = float(sys.argv[2]) if len(sys.argv) > 2 else 1e-6
+	folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+	coords = np.array([[-1, 1, 1, -1, -1, 1, 1, -1], [-1, -1, 1, 1, -1, -1, 1, 1], [0, 0, 0, 0, 0.01, 0.01, 0.01, 0.01]], dtype=float)
+	area = 4.0
+	failed = 0
+	print('%-8s %-11s %15s %15s %15s  %s' % ('UEL', 'history', 'traction error', 'damage error', 'energy error', 'status'))
+	for name in ['IDF_3D', 'FDF']:
+		lib = uelLibrary(os.path.join(folder, name+'.for'), coords=coords)
+		for history, separation in histories(variants[name]['props'], n).items():
+			reference = tslHistory(separation, lib.props)
+			force, SVARS = lib.separationHistory(separation)
+			traction = force/area
+			scale = np.abs(reference['traction']).max()
+			errors = [np.abs(traction - reference['traction'][0]).max()/scale,
+				np.abs(SVARS[:, 0] - reference['damage'][0]).max(),
+				np.abs(energy(traction, separation) - reference['energy'][0]).max()/np.abs(reference['energy'][0]).max()]
+			ok = max(errors) < tol
+			failed = failed + (not ok)
+			print('%-8s %-11s %15.2e %15.2e %15.2e  %s' % (name, history, errors[0], errors[1], errors[2], 'ok' if ok else 'FAILED'))
+	print('All checks passed' if not failed else '%d checks FAILED' % failed)
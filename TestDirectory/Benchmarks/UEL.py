@@ -0,0 +1,29 @@
+"""
+Microbenchmark and tangent verification of the user element subroutines in TestDirectory.
+Each subroutine is compiled with gfortran and called directly through czmtestkit.uelHarness.
+Subroutines returning non-finite outputs or with a tangent error above the tolerance are reported as failed.
+
+Usage: python UEL.py [number of calls] [tolerance]
+"""
+import os
+import sys
+import numpy as np
+from czmtestkit.uelHarness import uelLibrary, variants
+
+
+if __name__ == '__main__':
+	n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+	tol = float(sys.argv[2]) if len(sys.argv) > 2 else 1e-3
+	folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+	print('%-16s %14s %17s %17s  %s' % ('UEL', 'calls/s', 'tangent (elastic)', 'tangent (damage)', 'status'))
+	for name in variants:
+		lib = uelLibrary(os.path.join(folder, name+'.for'))
+		try:
+			elastic = np.median(lib.tangentCheck(10, scale=0.05*lib.props[lib.onset[0]]/lib.props[lib.onset[1]]))
+			damage = np.median(lib.tangentCheck(10))
+		except ValueError as e:
+			print('%-16s %14s %17s %17s  FAILED (%s)' % (name, '-', '-', '-', e))
+			continue
+		rate = lib.benchmark(n)
+		status = 'ok' if max(elastic, damage) < tol else 'FAILED (tangent error above %g)' % tol
+		print('%-16s %14.0f %17.2e %17.2e  %s' % (name, rate, elastic, damage, status))
@@ -0,0 +1,63 @@
+"""
+Benchmark of the history postprocessing for batched single element models with many history regions.
+Compares the vectorized UvsRF with the previous column by column implementation (without plotting).
+
+Usage: python UvsRF.py [number of elements] [number of history points]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import pandas as pd
+import czmtestkit as ctk
+from czmtestkit import abqStandIn
+from czmtestkit.postprocessors.plot import UvsRF
+
+
+def columnwise(Name, U_factor, n):
+	# Previous implementation of UvsRF reading the same file
+	data = pd.read_csv(Name+'_Raw.csv', header=None, low_memory=False)
+	Data = data.loc[3:]
+	Ind = data.loc[0:2].values.tolist()
+	Head = [[], [], []]
+	for i in range(3):
+		Head[i] = list(sorted(set(Ind[i]), key=Ind[i].index))
+	header = pd.MultiIndex.from_product(Head, names=['Node','Output','Direction'])
+	Data.columns = header
+	Data = Data.astype(float)
+	for i in Head[0]:
+		for j in Head[1]:
+			Data[i,j,'Effective'] = (Data.xs(i,level='Node',axis=1).xs(j,level='Output',axis=1)**2).sum(axis=1)**0.5
+		Data[i,'U','Effective'] = U_factor*Data[i,'U','Effective']
+	Results = Data.xs('Effective',level='Direction',axis=1)
+	Results.to_csv(Name+'.csv', index=False)
+	NodeSet = list(Data.columns.levels[0])
+	for k in range(n):
+		Nodes = [i for i in NodeSet if i.split(' ')[-1].split('.')[0].split('-')[-1] == str(k)]
+		Results[Nodes].to_csv(Name+'_'+str(k)+'.csv', index=False)
+
+
+if __name__ == '__main__':
+	n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+	nPoints = int(sys.argv[2]) if len(sys.argv) > 2 else 1001
+	t = ctk.testModel()
+	t.name = 'Benchmark'
+	t.UvsRFplot = False
+	t.setMixity([90.0*k/(n-1) for k in range(n)])
+	cwd = os.getcwd()
+	folder = tempfile.mkdtemp()
+	os.chdir(folder)
+	abqStandIn.hisOutLoadPoint(t, nPoints)
+	shutil.rmtree(t.name+'.odbx')
+	# Same history in the legacy csv layout for the previous implementation
+	Time, Region, Output, Direction, Data = abqStandIn.loadPointHistory(t, nPoints)
+	pd.DataFrame([Region, Output, Direction] + [list(x) for x in zip(*Data)]).to_csv(t.name+'_Raw.csv', header=False, index=False)
+	start = time.time()
+	columnwise(t.name, t.uFactor, n)
+	print('%-12s %8.2f s' % ('column wise', time.time()-start))
+	start = time.time()
+	UvsRF(t, keepRaw=True)
+	print('%-12s %8.2f s' % ('vectorized', time.time()-start))
+	os.chdir(cwd)
+	shutil.rmtree(folder)